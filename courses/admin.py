@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Course, Lesson, UserProgress, Quiz, CompletedQuiz, Enrollment
+from .models import Course, Lesson, UserProgress, Quiz, CompletedQuiz, Enrollment, CourseProgress, Certificate, QuizAttempt, QuizAnswer, CourseDailyStats, LessonDailyStats, LearningEvent
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
@@ -9,13 +9,14 @@ class CourseAdmin(admin.ModelAdmin):
 
 @admin.register(Lesson)
 class LessonAdmin(admin.ModelAdmin):
-    list_display = ('title', 'course')
+    list_display = ('title', 'course', 'quiz_sample_size')
     search_fields = ('title', 'content')
     list_filter = ('course',)
+    readonly_fields = ('position',)  # changed only through the course's move/reorder controls
 
 @admin.register(UserProgress)
 class UserProgressAdmin(admin.ModelAdmin):
-    list_display = ('user', 'lesson', 'completed')
+    list_display = ('user', 'lesson', 'completed', 'completed_on')
     list_filter = ('completed', 'lesson')
     search_fields = ('user__username', 'lesson__title')
 
@@ -36,3 +37,55 @@ class EnrollmentAdmin(admin.ModelAdmin):
     list_display = ('student', 'course', 'enrolled_on')
     list_filter = ('enrolled_on', 'course')
     search_fields = ('student__username', 'course__title')
+
+@admin.register(CourseProgress)
+class CourseProgressAdmin(admin.ModelAdmin):
+    list_display = ('student', 'course', 'completed_count', 'total_lessons', 'last_activity')
+    list_filter = ('course',)
+    search_fields = ('student__username', 'course__title')
+
+@admin.register(Certificate)
+class CertificateAdmin(admin.ModelAdmin):
+    list_display = ('student', 'course', 'issued_on')
+    list_filter = ('issued_on', 'course')
+    search_fields = ('student__username', 'course__title')
+
+class QuizAnswerInline(admin.TabularInline):
+    model = QuizAnswer
+    extra = 0
+    raw_id_fields = ('question',)
+
+@admin.register(QuizAttempt)
+class QuizAttemptAdmin(admin.ModelAdmin):
+    list_display = ('user', 'lesson', 'score', 'total', 'submitted_at')
+    list_filter = ('submitted_at', 'lesson')
+    search_fields = ('user__username', 'lesson__title')
+    inlines = [QuizAnswerInline]
+
+@admin.register(CourseDailyStats)
+class CourseDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ('course', 'day', 'enrollments', 'completions', 'attempts', 'passes')
+    list_filter = ('day',)
+    search_fields = ('course__title',)
+
+@admin.register(LessonDailyStats)
+class LessonDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ('lesson', 'course', 'day', 'completions', 'attempts', 'passes')
+    list_filter = ('day',)
+    search_fields = ('lesson__title', 'course__title')
+
+@admin.register(LearningEvent)
+class LearningEventAdmin(admin.ModelAdmin):
+    list_display = ('occurred_at', 'kind', 'user', 'course_id', 'lesson_id', 'data')
+    list_filter = ('kind', 'occurred_at')
+    search_fields = ('user__username',)
+
+    # The log is append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,228 @@
+# courses/analytics.py
+#
+# Faculty analytics served from daily rollup tables. refresh_rollups() reads
+# only the enrollments, lesson completions and quiz attempts recorded since
+# the last watermark, groups them by day in SQL and adds the totals onto
+# CourseDailyStats / LessonDailyStats. The dashboard then reads the rollups
+# alone, so its cost depends on days x courses, not on the size of the
+# Enrollment, UserProgress or QuizAttempt tables.
+#
+# Watermarks stop ROLLUP_LAG short of now so that rows committed a little
+# after their timestamp are still picked up by the next run.
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+
+from courses.models import (
+    CourseDailyStats, Enrollment, LessonDailyStats, QuizAttempt, RollupWatermark, UserProgress,
+)
+
+ROLLUP_LAG = timedelta(seconds=getattr(settings, 'ANALYTICS_ROLLUP_LAG', 60))
+ANALYTICS_DAYS = getattr(settings, 'ANALYTICS_DAYS', 30)
+QUIZ_PASS_PERCENT = getattr(settings, 'QUIZ_PASS_PERCENT', 60)
+
+SOURCES = ('enrollments', 'completions', 'attempts')
+COURSE_COUNTERS = ['enrollments', 'completions', 'attempts', 'passes', 'score_sum', 'question_sum']
+LESSON_COUNTERS = ['completions', 'attempts', 'passes', 'score_sum', 'question_sum']
+MERGE_CHUNK = 500
+
+
+# ------------------------
+# Refresh
+# ------------------------
+def _window(queryset, field, lower, upper):
+    queryset = queryset.filter(**{f'{field}__lt': upper})
+    if lower is not None:
+        queryset = queryset.filter(**{f'{field}__gte': lower})
+    return queryset.annotate(day=TruncDate(field))
+
+
+def _enrollment_rows(lower, upper):
+    return (
+        _window(Enrollment.objects.all(), 'enrolled_on', lower, upper)
+        .values('course_id', 'day')
+        .annotate(enrollments=Count('id'))
+        .order_by()
+    )
+
+
+def _completion_rows(lower, upper):
+    return (
+        _window(UserProgress.objects.filter(completed=True), 'completed_on', lower, upper)
+        .values('lesson_id', 'lesson__course_id', 'day')
+        .annotate(completions=Count('id'))
+        .order_by()
+    )
+
+
+def _attempt_rows(lower, upper):
+    passed = GreaterThanOrEqual(F('score') * 100, F('total') * QUIZ_PASS_PERCENT)
+    return (
+        _window(QuizAttempt.objects.all(), 'submitted_at', lower, upper)
+        .values('lesson_id', 'lesson__course_id', 'day')
+        .annotate(
+            attempts=Count('id'),
+            passes=Count('id', filter=passed),
+            score_sum=Sum('score'),
+            question_sum=Sum('total'),
+        )
+        .order_by()
+    )
+
+
+def _merge(model, key_field, deltas, counters, course_ids=None):
+    """Add ``{(key, day): Counter}`` onto the rollup rows, creating missing ones."""
+    by_day = defaultdict(dict)
+    for (key, day), delta in deltas.items():
+        by_day[day][key] = delta
+
+    changed, created = [], []
+    for day, day_deltas in by_day.items():
+        keys = list(day_deltas)
+        for start in range(0, len(keys), MERGE_CHUNK):
+            chunk = keys[start:start + MERGE_CHUNK]
+            existing = {
+                getattr(row, key_field): row
+                for row in model.objects.filter(day=day, **{f'{key_field}__in': chunk})
+            }
+            for key in chunk:
+                delta = day_deltas[key]
+                row = existing.get(key)
+                if row is None:
+                    extra = {'course_id': course_ids[key]} if course_ids is not None else {}
+                    created.append(model(day=day, **{key_field: key}, **extra, **{c: delta[c] for c in counters}))
+                else:
+                    for counter in counters:
+                        setattr(row, counter, getattr(row, counter) + delta[counter])
+                    changed.append(row)
+
+    model.objects.bulk_update(changed, counters, batch_size=MERGE_CHUNK)
+    model.objects.bulk_create(created, batch_size=MERGE_CHUNK)
+    return len(changed) + len(created)
+
+
+def refresh_rollups(now=None):
+    """
+    Fold every row recorded since the last run into the daily rollups and
+    move the watermarks forward. Returns a stats dict.
+    """
+    upper = (now or timezone.now()) - ROLLUP_LAG
+    stats = {'enrollments': 0, 'completions': 0, 'attempts': 0, 'course_rows': 0, 'lesson_rows': 0}
+
+    with transaction.atomic():
+        marks = {mark.source: mark.processed_until for mark in RollupWatermark.objects.select_for_update()}
+        lower = {source: marks.get(source) for source in SOURCES}
+        course_deltas = defaultdict(Counter)
+        lesson_deltas = defaultdict(Counter)
+        lesson_courses = {}
+
+        if lower['enrollments'] is None or lower['enrollments'] < upper:
+            for row in _enrollment_rows(lower['enrollments'], upper):
+                course_deltas[(row['course_id'], row['day'])]['enrollments'] += row['enrollments']
+                stats['enrollments'] += row['enrollments']
+
+        for source, rows in (('completions', _completion_rows), ('attempts', _attempt_rows)):
+            if lower[source] is not None and lower[source] >= upper:
+                continue
+            for row in rows(lower[source], upper):
+                lesson_id, course_id, day = row.pop('lesson_id'), row.pop('lesson__course_id'), row.pop('day')
+                lesson_courses[lesson_id] = course_id
+                lesson_deltas[(lesson_id, day)].update(row)
+                course_deltas[(course_id, day)].update(row)
+                stats[source] += row[source]
+
+        stats['course_rows'] = _merge(CourseDailyStats, 'course_id', course_deltas, COURSE_COUNTERS)
+        stats['lesson_rows'] = _merge(LessonDailyStats, 'lesson_id', lesson_deltas, LESSON_COUNTERS, lesson_courses)
+
+        for source in SOURCES:
+            if lower[source] is None or lower[source] < upper:
+                RollupWatermark.objects.update_or_create(source=source, defaults={'processed_until': upper})
+    stats['processed_until'] = upper
+    return stats
+
+
+def reset_rollups():
+    """Drop all rollups and watermarks so the next refresh rebuilds from scratch."""
+    with transaction.atomic():
+        CourseDailyStats.objects.all().delete()
+        LessonDailyStats.objects.all().delete()
+        RollupWatermark.objects.all().delete()
+
+
+# ------------------------
+# Dashboard
+# ------------------------
+def _percent(part, whole):
+    return round(part * 100 / whole) if whole else None
+
+
+async def afaculty_analytics(user, days=ANALYTICS_DAYS):
+    """
+    Chart data for a faculty member's courses, read from the rollups only:
+    a daily enrollment/completion series for the last ``days`` days, per-course
+    totals for the same period and an all-time completion funnel per course.
+    """
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    course_stats = CourseDailyStats.objects.filter(course__created_by=user)
+
+    daily = {
+        row['day']: row async for row in
+        course_stats.filter(day__gte=since).values('day')
+        .annotate(enrollments=Sum('enrollments'), completions=Sum('completions')).order_by()
+    }
+    courses = [
+        row async for row in
+        course_stats.filter(day__gte=since).values('course_id', 'course__title')
+        .annotate(**{counter: Sum(counter) for counter in COURSE_COUNTERS})
+        .order_by('course__title')
+    ]
+    lessons = [
+        row async for row in
+        LessonDailyStats.objects.filter(course__created_by=user)
+        .values('course_id', 'course__title', 'lesson_id', 'lesson__title', 'lesson__position')
+        .annotate(completions=Sum('completions'), attempts=Sum('attempts'), passes=Sum('passes'))
+        .order_by('course__title', 'course_id', 'lesson__position')
+    ]
+    updated = await RollupWatermark.objects.aaggregate(until=Min('processed_until'))
+
+    series = []
+    for offset in range(days):
+        day = since + timedelta(days=offset)
+        row = daily.get(day, {})
+        series.append({'day': day, 'enrollments': row.get('enrollments', 0), 'completions': row.get('completions', 0)})
+    peak = max([point['enrollments'] for point in series] + [1])
+    for point in series:
+        point['height'] = round(point['enrollments'] * 100 / peak)
+
+    for row in courses:
+        row['average_score'] = _percent(row['score_sum'], row['question_sum'])
+        row['pass_rate'] = _percent(row['passes'], row['attempts'])
+
+    funnels = []
+    for row in lessons:
+        if not funnels or funnels[-1]['course_id'] != row['course_id']:
+            funnels.append({'course_id': row['course_id'], 'title': row['course__title'], 'lessons': []})
+        row['pass_rate'] = _percent(row['passes'], row['attempts'])
+        funnels[-1]['lessons'].append(row)
+    for funnel in funnels:
+        top = max([lesson['completions'] for lesson in funnel['lessons']] + [1])
+        for lesson in funnel['lessons']:
+            lesson['width'] = round(lesson['completions'] * 100 / top)
+
+    return {
+        'days': days,
+        'series': series,
+        'period_enrollments': sum(point['enrollments'] for point in series),
+        'period_completions': sum(point['completions'] for point in series),
+        'courses': courses,
+        'funnels': funnels,
+        'updated_until': updated['until'],
+    }
@@ -0,0 +1,281 @@
+# courses/api.py
+#
+# Read-only JSON API (v1) for the mobile app. Every endpoint reads a
+# values() queryset restricted to the requested fields (?fields=id,title),
+# so no model instances are built and unrequested joins never run. Lists are
+# keyset-paginated with an opaque ?cursor= over the resource's ordering, and
+# every response carries a strong ETag (sha256 of the body): a client that
+# sends it back in If-None-Match gets an empty 304 when nothing changed.
+# The catalog endpoints are public, like the catalog pages; the rest need a
+# logged-in session, and question banks only list the caller's pinned draw.
+
+import base64
+import binascii
+import hashlib
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count, F, FloatField, IntegerField, Q, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from courses.grading import pinned_draw
+from courses.models import Course, CourseProgress, Enrollment, Lesson, Quiz
+from courses.utils import arequest_user
+
+API_PAGE_SIZE = getattr(settings, 'API_PAGE_SIZE', 50)
+API_MAX_PAGE_SIZE = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# ------------------------
+# Resources
+# ------------------------
+class Resource:
+    """
+    The public fields of one resource. ``fields`` maps each field name to
+    None (a model field of the same name) or the expression computing it;
+    ``ordering`` lists the model fields the cursor pages over.
+    """
+
+    def __init__(self, fields, default=None, ordering=('id',)):
+        self.fields = fields
+        self.default = list(default or fields)
+        self.ordering = list(ordering)
+
+    def selected(self, params):
+        raw = params.get('fields')
+        if not raw:
+            return self.default
+        names = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(400, f"Unknown field(s) {', '.join(unknown)}; available: {', '.join(self.fields)}.")
+        return list(dict.fromkeys(names))
+
+    def values(self, queryset, names):
+        """``queryset.values()`` for ``names`` plus the ordering keys the cursor needs."""
+        plain = [name for name in names if self.fields[name] is None]
+        plain += [key for key in self.ordering if key not in plain]
+        expressions = {name: self.fields[name] for name in names if self.fields[name] is not None}
+        return queryset.values(*plain, **expressions)
+
+
+def _percent():
+    ratio = Cast('completed_count', FloatField()) * 100 / NullIf('total_lessons', 0)
+    return Cast(Coalesce(Round(ratio), Value(0.0)), IntegerField())
+
+
+COURSE = Resource({
+    'id': None,
+    'title': None,
+    'description': None,
+    'teacher': F('created_by__username'),
+    'lesson_count': Count('lessons'),
+})
+LESSON = Resource(
+    {
+        'id': None,
+        'course_id': None,
+        'title': None,
+        'position': None,
+        'video_url': None,
+        'video_provider': None,
+        'video_id': None,
+        'video_embed_url': None,
+        'video_thumbnail_url': None,
+        'content': None,
+        'content_format': None,
+        'content_html': None,
+        'quiz_sample_size': None,
+    },
+    default=['id', 'course_id', 'title', 'position', 'video_url', 'video_thumbnail_url'],
+    ordering=('position', 'id'),
+)
+# correct_option is deliberately not exposed
+QUESTION = Resource({
+    'id': None,
+    'lesson_id': None,
+    'question': F('question_text'),
+    'option_a': None,
+    'option_b': None,
+    'option_c': None,
+    'option_d': None,
+})
+ENROLLMENT = Resource({
+    'id': None,
+    'course_id': None,
+    'course_title': F('course__title'),
+    'enrolled_on': None,
+})
+PROGRESS = Resource({
+    'course_id': None,
+    'course_title': F('course__title'),
+    'completed_count': None,
+    'total_lessons': None,
+    'percent': _percent(),
+    'last_activity': None,
+}, ordering=('course_id',))
+
+
+# ------------------------
+# Pagination and responses
+# ------------------------
+def _encode_cursor(row, ordering):
+    raw = json.dumps([row[key] for key in ordering], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor, ordering):
+    try:
+        keys = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise ApiError(400, "Invalid cursor.")
+    if not isinstance(keys, list) or len(keys) != len(ordering) or not all(isinstance(k, int) for k in keys):
+        raise ApiError(400, "Invalid cursor.")
+    return keys
+
+
+def _after(ordering, keys):
+    """Rows strictly after ``keys`` in ``ordering``: (a > x) OR (a = x AND b > y) ..."""
+    condition = Q()
+    for depth, key in enumerate(ordering):
+        term = Q(**{f'{key}__gt': keys[depth]})
+        for earlier, value in zip(ordering[:depth], keys[:depth]):
+            term &= Q(**{earlier: value})
+        condition |= term
+    return condition
+
+
+def _limit(params):
+    try:
+        limit = int(params.get('limit', API_PAGE_SIZE))
+    except ValueError:
+        raise ApiError(400, "limit must be an integer.")
+    return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+
+def _strip(row, names):
+    return {name: row[name] for name in names}
+
+
+async def paginate(resource, queryset, params):
+    """One page of ``queryset`` as ``{'data': [...], 'next': cursor-or-null}``."""
+    names = resource.selected(params)
+    limit = _limit(params)
+    if params.get('cursor'):
+        queryset = queryset.filter(_after(resource.ordering, _decode_cursor(params['cursor'], resource.ordering)))
+    query = resource.values(queryset, names).order_by(*resource.ordering)[:limit + 1]
+    rows = [row async for row in query]
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'data': [_strip(row, names) for row in rows],
+        'next': _encode_cursor(rows[-1], resource.ordering) if more else None,
+    }
+
+
+async def detail(resource, queryset, params):
+    names = resource.selected(params)
+    row = await resource.values(queryset, names).afirst()
+    if row is None:
+        raise ApiError(404, "Not found.")
+    return {'data': _strip(row, names)}
+
+
+def _error(status, message):
+    return JsonResponse({'error': message}, status=status)
+
+
+def api_view(view=None, *, public=False):
+    """
+    GET-only, session-authenticated JSON endpoint; ``public=True`` also
+    serves anonymous users, like the catalog pages of the site. The view is
+    called with the loaded user and returns the payload; errors become JSON
+    bodies and the response gets a strong ETag, answered with 304 when it
+    matches.
+    """
+    if view is None:
+        return lambda view: api_view(view, public=public)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            response = _error(405, "Method not allowed.")
+            response['Allow'] = 'GET, HEAD'
+            return response
+        user = await arequest_user(request)
+        if not public and not user.is_authenticated:
+            return _error(401, "Authentication required.")
+        try:
+            payload = await view(request, user, *args, **kwargs)
+        except ApiError as exc:
+            return _error(exc.status, exc.message)
+
+        response = JsonResponse(payload)
+        etag = f'"{hashlib.sha256(response.content).hexdigest()}"'
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ('Cookie',))
+        return response
+    return wrapper
+
+
+# ------------------------
+# Endpoints
+# ------------------------
+@api_view(public=True)
+async def courses(request, user):
+    return await paginate(COURSE, Course.objects.all(), request.GET)
+
+
+@api_view(public=True)
+async def course(request, user, course_id):
+    return await detail(COURSE, Course.objects.filter(id=course_id), request.GET)
+
+
+@api_view(public=True)
+async def course_lessons(request, user, course_id):
+    if not await Course.objects.filter(id=course_id).aexists():
+        raise ApiError(404, "Not found.")
+    return await paginate(LESSON, Lesson.objects.filter(course_id=course_id), request.GET)
+
+
+@api_view
+async def lesson(request, user, lesson_id):
+    return await detail(LESSON, Lesson.objects.filter(id=lesson_id), request.GET)
+
+
+@api_view
+async def lesson_questions(request, user, lesson_id):
+    lesson = await Lesson.objects.only('id', 'quiz_version', 'quiz_sample_size').filter(id=lesson_id).afirst()
+    if lesson is None:
+        raise ApiError(404, "Not found.")
+    questions = Quiz.objects.filter(lesson_id=lesson_id)
+    if lesson.quiz_sample_size:
+        # Question banks only reveal the draw pinned for this user's next attempt
+        drawn = await sync_to_async(pinned_draw)(request.session, lesson)
+        questions = questions.filter(id__in=drawn)
+    return await paginate(QUESTION, questions, request.GET)
+
+
+@api_view
+async def enrollments(request, user):
+    return await paginate(ENROLLMENT, Enrollment.objects.filter(student=user), request.GET)
+
+
+@api_view
+async def progress(request, user):
+    return await paginate(PROGRESS, CourseProgress.objects.filter(student=user), request.GET)
@@ -0,0 +1,17 @@
+from django.urls import path
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    # Catalog
+    path('courses/', api.courses, name='courses'),
+    path('courses/<int:course_id>/', api.course, name='course'),
+    path('courses/<int:course_id>/lessons/', api.course_lessons, name='course-lessons'),
+    path('lessons/<int:lesson_id>/', api.lesson, name='lesson'),
+    path('lessons/<int:lesson_id>/questions/', api.lesson_questions, name='lesson-questions'),
+
+    # The signed-in user
+    path('me/enrollments/', api.enrollments, name='enrollments'),
+    path('me/progress/', api.progress, name='progress'),
+]
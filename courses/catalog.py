@@ -0,0 +1,110 @@
+# courses/catalog.py
+#
+# Course listings built as one annotated query and paged by id (keyset
+# pagination), so a page costs the same no matter how large the catalog is.
+
+from django.conf import settings
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery, Value
+
+from courses.models import Course, CourseProgress, Enrollment
+
+CATALOG_PAGE_SIZE = getattr(settings, 'CATALOG_PAGE_SIZE', 24)
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset plus the cursors around it."""
+
+    def __init__(self, items, has_next, has_previous, prefix=''):
+        self.items = items
+        self.has_next = has_next and bool(items)
+        self.has_previous = has_previous and bool(items)
+        self.next_param = f'{prefix}after'
+        self.previous_param = f'{prefix}before'
+        self.next_cursor = items[-1].pk if self.has_next else None
+        self.previous_cursor = items[0].pk if self.has_previous else None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def _cursor(params, name):
+    try:
+        return int(params.get(name, ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def _keyset_slice(queryset, params, per_page, prefix):
+    """The query for one page, plus a function turning its rows into a KeysetPage."""
+    after = _cursor(params, f'{prefix}after')
+    before = _cursor(params, f'{prefix}before')
+
+    if before is not None:
+        def to_page(rows):
+            items = rows[:per_page][::-1]
+            return KeysetPage(items, has_next=True, has_previous=len(rows) > per_page, prefix=prefix)
+        return queryset.filter(pk__lt=before).order_by('-pk')[:per_page + 1], to_page
+
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+
+    def to_page(rows):
+        return KeysetPage(
+            rows[:per_page],
+            has_next=len(rows) > per_page,
+            has_previous=after is not None,
+            prefix=prefix,
+        )
+    return queryset.order_by('pk')[:per_page + 1], to_page
+
+
+def keyset_paginate(queryset, params, per_page=CATALOG_PAGE_SIZE, prefix=''):
+    """
+    Page ``queryset`` by primary key using ``<prefix>after`` / ``<prefix>before``
+    cursors from ``params``. Fetches one extra row to know if more pages exist.
+    """
+    query, to_page = _keyset_slice(queryset, params, per_page, prefix)
+    return to_page(list(query))
+
+
+async def akeyset_paginate(queryset, params, per_page=CATALOG_PAGE_SIZE, prefix=''):
+    """Async version of ``keyset_paginate``."""
+    query, to_page = _keyset_slice(queryset, params, per_page, prefix)
+    return to_page([row async for row in query])
+
+
+def catalog_queryset(user):
+    """Courses annotated with lesson count and the user's completed count."""
+    courses = Course.objects.select_related('created_by').annotate(total_lessons=Count('lessons'))
+    if user.is_authenticated:
+        completed = CourseProgress.objects.filter(
+            student=user, course=OuterRef('pk')
+        ).values('completed_count')[:1]
+        return courses.annotate(completed_count=Subquery(completed, output_field=IntegerField()))
+    return courses.annotate(completed_count=Value(0, output_field=IntegerField()))
+
+
+def enrolled_courses(user):
+    return catalog_queryset(user).filter(
+        Exists(Enrollment.objects.filter(student=user, course=OuterRef('pk')))
+    )
+
+
+def unenrolled_courses(user, exclude_own=False):
+    """Courses the user is not enrolled in, optionally also leaving out the ones they teach."""
+    courses = catalog_queryset(user)
+    if not user.is_authenticated:
+        return courses
+    courses = courses.exclude(Exists(Enrollment.objects.filter(student=user, course=OuterRef('pk'))))
+    return courses.exclude(created_by=user) if exclude_own else courses
+
+
+def progress_percent(course):
+    completed = course.completed_count or 0
+    return round((completed / course.total_lessons) * 100) if course.total_lessons else 0
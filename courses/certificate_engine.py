@@ -0,0 +1,201 @@
+# courses/certificate_engine.py
+#
+# Template-stamped certificate renderer. Everything that is the same on every
+# certificate of a template (document structure, fonts, background, border,
+# headings, signature line) is compiled once into ready-made PDF bytes. A
+# certificate is then that prefix plus one small content stream holding the
+# student name, course title and date, followed by the xref table.
+
+import zlib
+from functools import cached_property
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+
+# Standard Type 1 fonts need no embedding, so their objects never change.
+FONTS = {
+    'Helvetica': 'F1',
+    'Helvetica-Bold': 'F2',
+    'Helvetica-Oblique': 'F3',
+    'Helvetica-BoldOblique': 'F4',
+}
+FONT_OBJECTS = {name: 6 + index for index, name in enumerate(FONTS)}
+VARIABLE_STREAM = 5
+
+
+def _num(value):
+    return f'{value:.4f}'.rstrip('0').rstrip('.') or '0'
+
+
+def _rgb(color):
+    return ' '.join(_num(part) for part in color.rgb())
+
+
+def _pdf_string(text):
+    raw = text.encode('cp1252', 'replace')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _text_op(text, font, size, color, x, y, align):
+    if align == 'center':
+        x -= stringWidth(text, font, size) / 2
+    return (
+        f'BT /{FONTS[font]} {_num(size)} Tf {_rgb(color)} rg {_num(x)} {_num(y)} Td '.encode('ascii')
+        + _pdf_string(text)
+        + b' Tj ET\n'
+    )
+
+
+def _shape_op(element):
+    kind = element[0]
+    if kind == 'rect':
+        _, x, y, w, h, fill, stroke, width = element
+        paint = 'B' if fill else 'S'
+        fill_op = f'{_rgb(fill)} rg ' if fill else ''
+        return (
+            f'{fill_op}{_rgb(stroke)} RG {_num(width)} w '
+            f'{_num(x)} {_num(y)} {_num(w)} {_num(h)} re {paint}\n'
+        ).encode('ascii')
+    if kind == 'line':
+        _, x1, y1, x2, y2, stroke, width = element
+        return f'{_rgb(stroke)} RG {_num(width)} w {_num(x1)} {_num(y1)} m {_num(x2)} {_num(y2)} l S\n'.encode('ascii')
+    if kind == 'text':
+        return _text_op(*element[1:])
+    raise ValueError(f"Unknown certificate element {kind!r}")
+
+
+class CertificateTemplate:
+    """
+    ``static`` is a list of drawing elements rendered once; ``fields`` maps
+    ``student_name`` / ``course_name`` / ``issued_on`` to
+    ``(format, font, size, color, x, y, align)`` and is stamped per certificate.
+    Bump ``version`` whenever the layout changes so cached PDFs are replaced.
+    """
+
+    def __init__(self, key, label, version, static, fields):
+        self.key = key
+        self.label = label
+        self.version = version
+        self.static = static
+        self.fields = fields
+
+    @cached_property
+    def _prefix(self):
+        """All objects except the variable stream, plus their byte offsets."""
+        static_stream = zlib.compress(b''.join(_shape_op(element) for element in self.static))
+        font_refs = ' '.join(f'/{alias} {FONT_OBJECTS[name]} 0 R' for name, alias in FONTS.items())
+        objects = {
+            1: b'<< /Type /Catalog /Pages 2 0 R >>',
+            2: b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+            3: (
+                f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(PAGE_WIDTH)} {_num(PAGE_HEIGHT)}] '
+                f'/Resources << /Font << {font_refs} >> >> /Contents [4 0 R {VARIABLE_STREAM} 0 R] >>'
+            ).encode('ascii'),
+            4: (
+                f'<< /Length {len(static_stream)} /Filter /FlateDecode >>\nstream\n'.encode('ascii')
+                + static_stream + b'\nendstream'
+            ),
+        }
+        for name, number in FONT_OBJECTS.items():
+            objects[number] = (
+                f'<< /Type /Font /Subtype /Type1 /BaseFont /{name} /Encoding /WinAnsiEncoding >>'
+            ).encode('ascii')
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = {}
+        for number, body in sorted(objects.items()):
+            offsets[number] = len(out)
+            out += f'{number} 0 obj\n'.encode('ascii') + body + b'\nendobj\n'
+        return bytes(out), offsets
+
+    def render(self, student_name, course_name, issued_on):
+        prefix, offsets = self._prefix
+        values = {
+            'student_name': student_name,
+            'course_name': course_name,
+            'issued_on': issued_on.strftime("%B %d, %Y"),
+        }
+        content = b''.join(
+            _text_op(fmt.format(values[name]), *style)
+            for name, (fmt, *style) in self.fields.items()
+        )
+
+        out = bytearray(prefix)
+        offsets = dict(offsets)
+        offsets[VARIABLE_STREAM] = len(out)
+        out += (
+            f'{VARIABLE_STREAM} 0 obj\n<< /Length {len(content)} >>\nstream\n'.encode('ascii')
+            + content + b'\nendstream\nendobj\n'
+        )
+
+        xref_at = len(out)
+        size = max(offsets) + 1
+        out += f'xref\n0 {size}\n0000000000 65535 f \n'.encode('ascii')
+        for number in range(1, size):
+            out += f'{offsets[number]:010d} 00000 n \n'.encode('ascii')
+        out += f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n'.encode('ascii')
+        return bytes(out)
+
+
+# ------------------------
+# Templates
+# ------------------------
+_MARGIN = 40
+_CENTER = PAGE_WIDTH / 2
+_SIG_Y = _MARGIN + 80
+
+CLASSIC = CertificateTemplate(
+    key='classic',
+    label='Classic',
+    version=1,
+    static=[
+        ('rect', 0, 0, PAGE_WIDTH, PAGE_HEIGHT, colors.Color(1, 0.98, 0.9), colors.black, 1),
+        ('rect', _MARGIN, _MARGIN, PAGE_WIDTH - 2 * _MARGIN, PAGE_HEIGHT - 2 * _MARGIN, None, colors.darkblue, 5),
+        ('text', "Certificate of Completion", 'Helvetica-Bold', 30, colors.darkblue, _CENTER, PAGE_HEIGHT - 150, 'center'),
+        ('text', "This certifies that", 'Helvetica-Oblique', 18, colors.darkgreen, _CENTER, PAGE_HEIGHT - 200, 'center'),
+        ('text', "has successfully completed the course", 'Helvetica', 16, colors.black, _CENTER, PAGE_HEIGHT - 300, 'center'),
+        ('line', _CENTER - 100, _SIG_Y, _CENTER + 100, _SIG_Y, colors.black, 1.5),
+        ('text', "Instructor Signature", 'Helvetica', 14, colors.darkblue, _CENTER, _SIG_Y - 20, 'center'),
+    ],
+    fields={
+        'student_name': ('{}', 'Helvetica-Bold', 24, colors.darkred, _CENTER, PAGE_HEIGHT - 250, 'center'),
+        'course_name': ('"{}"', 'Helvetica-BoldOblique', 20, colors.darkblue, _CENTER, PAGE_HEIGHT - 350, 'center'),
+        'issued_on': ('Issued on {}', 'Helvetica-Oblique', 14, colors.gray, _MARGIN + 20, _MARGIN + 30, 'left'),
+    },
+)
+
+MODERN = CertificateTemplate(
+    key='modern',
+    label='Modern',
+    version=1,
+    static=[
+        ('rect', 0, 0, PAGE_WIDTH, PAGE_HEIGHT, colors.white, colors.white, 1),
+        ('rect', 0, PAGE_HEIGHT - 120, PAGE_WIDTH, 120, colors.teal, colors.teal, 1),
+        ('rect', _MARGIN, _MARGIN, PAGE_WIDTH - 2 * _MARGIN, PAGE_HEIGHT - 200, None, colors.goldenrod, 2),
+        ('text', "CERTIFICATE OF COMPLETION", 'Helvetica-Bold', 28, colors.white, _CENTER, PAGE_HEIGHT - 75, 'center'),
+        ('text', "Awarded to", 'Helvetica', 16, colors.darkslategray, _CENTER, PAGE_HEIGHT - 230, 'center'),
+        ('text', "for completing", 'Helvetica', 16, colors.darkslategray, _CENTER, PAGE_HEIGHT - 330, 'center'),
+        ('line', _CENTER - 100, _SIG_Y, _CENTER + 100, _SIG_Y, colors.darkslategray, 1),
+        ('text', "Instructor Signature", 'Helvetica', 12, colors.darkslategray, _CENTER, _SIG_Y - 18, 'center'),
+    ],
+    fields={
+        'student_name': ('{}', 'Helvetica-Bold', 26, colors.teal, _CENTER, PAGE_HEIGHT - 275, 'center'),
+        'course_name': ('{}', 'Helvetica-Bold', 20, colors.darkslategray, _CENTER, PAGE_HEIGHT - 370, 'center'),
+        'issued_on': ('{}', 'Helvetica-Oblique', 12, colors.gray, _CENTER, _MARGIN + 30, 'center'),
+    },
+)
+
+CERTIFICATE_TEMPLATES = {template.key: template for template in (CLASSIC, MODERN)}
+CERTIFICATE_TEMPLATE_CHOICES = [(template.key, template.label) for template in CERTIFICATE_TEMPLATES.values()]
+DEFAULT_CERTIFICATE_TEMPLATE = CLASSIC.key
+
+
+def get_certificate_template(key):
+    return CERTIFICATE_TEMPLATES.get(key) or CERTIFICATE_TEMPLATES[DEFAULT_CERTIFICATE_TEMPLATE]
+
+
+def render_certificate(student_name, course_name, issued_on, template=DEFAULT_CERTIFICATE_TEMPLATE):
+    return get_certificate_template(template).render(student_name, course_name, issued_on)
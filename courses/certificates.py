@@ -0,0 +1,218 @@
+# courses/certificates.py
+#
+# Issued certificates are rendered once and kept in a file cache. The file
+# name is the sha256 of everything that ends up on the page (plus the
+# template version), so a name change, course rename or template bump
+# produces a new key and the stale file is dropped.
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+
+from courses.certificate_engine import get_certificate_template, render_certificate
+from courses.models import Certificate
+from courses.summaries import course_completers
+
+CERTIFICATE_TEMPLATE_VERSION = getattr(settings, 'CERTIFICATE_TEMPLATE_VERSION', 1)
+
+logger = logging.getLogger(__name__)
+
+
+def certificate_cache_dir():
+    return Path(getattr(settings, 'CERTIFICATE_CACHE_DIR', settings.BASE_DIR / 'cache' / 'certificates'))
+
+
+def certificate_student_name(user):
+    return user.get_full_name() or user.username
+
+
+def certificate_cache_key(student_id, course_id, issued_on, student_name, course_name, template,
+                          version=CERTIFICATE_TEMPLATE_VERSION):
+    template = get_certificate_template(template)
+    parts = [
+        str(version), template.key, str(template.version),
+        str(student_id), str(course_id), issued_on.isoformat(), student_name, course_name,
+    ]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def certificate_path(cache_key):
+    # Fan out on the first two hex digits to keep directories small.
+    return certificate_cache_dir() / cache_key[:2] / f'{cache_key}.pdf'
+
+
+def issue_certificate(user, course):
+    """The student's certificate for the course, issued today if it is new."""
+    certificate, _ = Certificate.objects.get_or_create(
+        student=user, course=course, defaults={'issued_on': date.today()}
+    )
+    return certificate
+
+
+def _write_atomically(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def cached_certificate(certificate, student_name, course_name, template):
+    """
+    Return ``(file, cache_key)`` for a rendered certificate, rendering it only
+    when no file exists for the current inputs. The file is opened here, so a
+    concurrent request that re-keys the certificate and unlinks the old file
+    cannot remove it between the lookup and the read.
+    """
+    cache_key = certificate_cache_key(
+        certificate.student_id, certificate.course_id, certificate.issued_on, student_name, course_name, template
+    )
+    path = certificate_path(cache_key)
+    try:
+        certificate_file = open(path, 'rb')
+    except FileNotFoundError:
+        pdf = render_certificate(student_name, course_name, certificate.issued_on, template)
+        _write_atomically(path, pdf)
+        certificate_file = io.BytesIO(pdf)
+
+    if certificate.cache_key != cache_key:
+        if certificate.cache_key:
+            certificate_path(certificate.cache_key).unlink(missing_ok=True)
+        certificate.cache_key = cache_key
+        certificate.save(update_fields=['cache_key'])
+    return certificate_file, cache_key
+
+
+# ------------------------
+# Cohort (bulk) generation
+# ------------------------
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _render_job(student_name, course_name, issued_on, template):
+    return render_certificate(student_name, course_name, issued_on, template)
+
+
+def _render_ordered(jobs, workers):
+    """
+    Yield ``(job, pdf_bytes)`` in job order. At most ``workers * 4`` renders
+    are in flight so memory stays flat however large the cohort is.
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield job, _render_job(*job[1:])
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append((job, pool.submit(_render_job, *job[1:])))
+            if len(pending) >= workers * 4:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+class _ZipStream:
+    """Write-only file object; zipfile falls back to data descriptors for it."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_cohort_zip(course, workers=None, stats=None):
+    """
+    Yield a ZIP archive of every completer's certificate chunk by chunk.
+    Cached PDFs are reused; the rest are stamped across a process pool.
+    ``stats`` (a dict) receives ``count``, ``rendered``, ``seconds`` and ``per_second``.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = stats if stats is not None else {}
+    started = time.perf_counter()
+
+    students = list(course_completers(course))
+    Certificate.objects.bulk_create(
+        [Certificate(student=student, course=course, issued_on=date.today()) for student in students],
+        ignore_conflicts=True,
+    )
+    certificates = {
+        certificate.student_id: certificate
+        for certificate in Certificate.objects.filter(course=course, student__in=students)
+    }
+
+    out = _ZipStream()
+    archive = zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED)
+    to_render, changed, rendered = [], [], 0
+
+    for student in students:
+        certificate = certificates[student.id]
+        name = certificate_student_name(student)
+        cache_key = certificate_cache_key(
+            student.id, course.id, certificate.issued_on, name, course.title, course.certificate_template
+        )
+        if certificate.cache_key != cache_key:
+            if certificate.cache_key:
+                certificate_path(certificate.cache_key).unlink(missing_ok=True)
+            certificate.cache_key = cache_key
+            changed.append(certificate)
+        arcname = f'{student.username}_certificate.pdf'
+        path = certificate_path(cache_key)
+        if path.exists():
+            archive.writestr(arcname, path.read_bytes())
+            yield out.drain()
+        else:
+            to_render.append(((arcname, path), name, course.title, certificate.issued_on, course.certificate_template))
+
+    for job, pdf in _render_ordered(to_render, workers):
+        arcname, path = job[0]
+        _write_atomically(path, pdf)
+        archive.writestr(arcname, pdf)
+        rendered += 1
+        yield out.drain()
+
+    archive.close()
+    yield out.drain()
+
+    Certificate.objects.bulk_update(changed, ['cache_key'], batch_size=500)
+    seconds = time.perf_counter() - started
+    stats.update(
+        count=len(students),
+        rendered=rendered,
+        seconds=seconds,
+        per_second=len(students) / seconds if seconds else 0.0,
+    )
+    logger.info(
+        "Generated %d certificates for course %s (%d rendered) in %.2fs (%.1f/s)",
+        stats['count'], course.id, rendered, seconds, stats['per_second'],
+    )
@@ -0,0 +1,115 @@
+# courses/enrollment_import.py
+#
+# Bulk enrollment from a registrar CSV (``username,course_id`` per row). The
+# file is read row by row and handled in fixed-size chunks, so memory use
+# does not depend on the file size: each chunk resolves its usernames and
+# courses with one query each and inserts its enrollments in one
+# transaction.
+
+import csv
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from courses.models import Course, Enrollment
+
+IMPORT_CHUNK_SIZE = 2000
+
+
+def _new_stats():
+    return {
+        'rows': 0,
+        'enrolled': 0,
+        'duplicates': 0,
+        'unknown_students': 0,
+        'unknown_courses': 0,
+        'invalid': 0,
+        'seconds': 0.0,
+        'rows_per_second': 0.0,
+    }
+
+
+def _import_chunk(chunk, stats, allowed_course_ids):
+    usernames = {username for username, _ in chunk}
+    student_ids = dict(
+        get_user_model().objects.filter(username__in=usernames, role='student').values_list('username', 'id')
+    )
+    courses = Course.objects.filter(id__in={course_id for _, course_id in chunk})
+    if allowed_course_ids is not None:
+        courses = courses.filter(id__in=allowed_course_ids)
+    course_ids = set(courses.values_list('id', flat=True))
+
+    pairs = set()
+    for username, course_id in chunk:
+        student_id = student_ids.get(username)
+        if student_id is None:
+            stats['unknown_students'] += 1
+        elif course_id not in course_ids:
+            stats['unknown_courses'] += 1
+        elif (student_id, course_id) in pairs:
+            stats['duplicates'] += 1
+        else:
+            pairs.add((student_id, course_id))
+
+    with transaction.atomic():
+        existing = set(
+            Enrollment.objects.filter(
+                student_id__in={s for s, _ in pairs}, course_id__in={c for _, c in pairs}
+            ).values_list('student_id', 'course_id')
+        )
+        new_pairs = pairs - existing
+        stats['duplicates'] += len(pairs) - len(new_pairs)
+        # ignore_conflicts still covers rows enrolled concurrently since the check above
+        Enrollment.objects.bulk_create(
+            [Enrollment(student_id=s, course_id=c) for s, c in new_pairs],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+    stats['enrolled'] += len(new_pairs)
+
+
+def import_enrollments(lines, allowed_course_ids=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Enroll students from CSV ``lines`` (any iterable of text lines). A header
+    row is skipped when its second column is not a number. Only courses in
+    ``allowed_course_ids`` are accepted when given. Returns a stats dict.
+    """
+    stats = _new_stats()
+    started = time.perf_counter()
+    chunk = []
+
+    for line_number, row in enumerate(csv.reader(lines), start=1):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        if len(row) < 2:
+            stats['rows'] += 1
+            stats['invalid'] += 1
+            continue
+        username, course_id = row[0].strip(), row[1].strip()
+        if not course_id.isdigit():
+            if line_number > 1:  # anything but the header
+                stats['rows'] += 1
+                stats['invalid'] += 1
+            continue
+        stats['rows'] += 1
+        chunk.append((username, int(course_id)))
+        if len(chunk) >= chunk_size:
+            _import_chunk(chunk, stats, allowed_course_ids)
+            chunk = []
+
+    if chunk:
+        _import_chunk(chunk, stats, allowed_course_ids)
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+def format_import_stats(stats):
+    return (
+        f"{stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/s): "
+        f"{stats['enrolled']} enrolled, {stats['duplicates']} duplicates skipped, "
+        f"{stats['unknown_students']} unknown students, {stats['unknown_courses']} unknown courses, "
+        f"{stats['invalid']} invalid rows."
+    )
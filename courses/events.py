@@ -0,0 +1,287 @@
+# courses/events.py
+#
+# Buffered, append-only learning event log. record_event() only puts a tuple
+# on a bounded in-process queue, so the hot views never wait on SQLite's write
+# lock; a background thread drains the queue with one bulk INSERT per batch
+# whenever EVENT_LOG_BATCH_SIZE events are waiting or EVENT_LOG_FLUSH_INTERVAL
+# seconds have passed, and once more at interpreter exit. When the queue is
+# full the event is dropped (EVENT_LOG_FULL_POLICY = 'drop') or the producer
+# waits up to EVENT_LOG_BLOCK_TIMEOUT for room first ('block'); either way
+# the counters below say how often it happened.
+#
+# Only server processes run the thread: the WSGI and ASGI entry points call
+# use_flush_thread(). Management commands, the shell and tests flush inline
+# instead, each time a batch fills up and at exit.
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, close_old_connections
+from django.db.models import Count
+from django.utils import timezone
+
+from courses.db import retry_on_lock
+from courses.models import LearningEvent
+
+logger = logging.getLogger('courses.events')
+
+EVENT_LOG_ENABLED = getattr(settings, 'EVENT_LOG_ENABLED', True)
+EVENT_LOG_QUEUE_SIZE = getattr(settings, 'EVENT_LOG_QUEUE_SIZE', 10000)
+EVENT_LOG_BATCH_SIZE = getattr(settings, 'EVENT_LOG_BATCH_SIZE', 500)
+EVENT_LOG_FLUSH_INTERVAL = getattr(settings, 'EVENT_LOG_FLUSH_INTERVAL', 2.0)
+EVENT_LOG_FULL_POLICY = getattr(settings, 'EVENT_LOG_FULL_POLICY', 'drop')
+EVENT_LOG_BLOCK_TIMEOUT = getattr(settings, 'EVENT_LOG_BLOCK_TIMEOUT', 0.05)
+
+METRICS = ('recorded', 'dropped', 'blocked', 'flushed', 'batches', 'failed')
+
+
+class EventLog:
+    def __init__(self, maxsize=EVENT_LOG_QUEUE_SIZE, batch_size=EVENT_LOG_BATCH_SIZE,
+                 interval=EVENT_LOG_FLUSH_INTERVAL, policy=EVENT_LOG_FULL_POLICY,
+                 block_timeout=EVENT_LOG_BLOCK_TIMEOUT):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.enabled = EVENT_LOG_ENABLED
+        self.threaded = False
+        self._metrics = dict.fromkeys(METRICS, 0)
+        self._published = dict.fromkeys(METRICS, 0)
+        self._max_depth = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    # ------------------------
+    # Producer side
+    # ------------------------
+    def record(self, kind, user=None, course=None, lesson=None, block=None, **data):
+        """
+        Queue one event. Never touches the database; ``block=False`` forces
+        the drop policy, for callers on an event loop.
+        """
+        if not self.enabled:
+            return False
+        if self.threaded:
+            self._ensure_thread()
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        event = (kind, user_id, getattr(course, 'id', course), getattr(lesson, 'id', lesson), data, timezone.now())
+
+        wait = self.policy == 'block' if block is None else block
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            if not wait:
+                self._bump('dropped')
+                return False
+            self._bump('blocked')
+            try:
+                self.queue.put(event, timeout=self.block_timeout)
+            except queue.Full:
+                self._bump('dropped')
+                return False
+
+        self._bump('recorded')
+        depth = self.queue.qsize()
+        if depth > self._max_depth:
+            self._max_depth = depth
+        if depth >= self.batch_size:
+            if self.threaded:
+                self._wake.set()
+            elif block is not False:  # block=False callers are on an event loop
+                self.flush()
+        return True
+
+    def _bump(self, metric, amount=1):
+        with self._lock:
+            self._metrics[metric] += amount
+
+    def stats(self):
+        """This process's counters plus the current and peak queue depth."""
+        with self._lock:
+            stats = dict(self._metrics)
+        stats['depth'] = self.queue.qsize()
+        stats['max_depth'] = self._max_depth
+        return stats
+
+    # ------------------------
+    # Flushing
+    # ------------------------
+    def use_flush_thread(self):
+        """Flush from a background thread instead of inline; for server processes."""
+        self.threaded = True
+
+    def _ensure_thread(self):
+        # Started lazily, and again in a forked worker, which inherits the
+        # queue but not the thread.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='learning-event-log', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+        self.flush()
+        close_old_connections()
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """Write everything queued so far, one INSERT per batch. Returns the number written."""
+        written = 0
+        while True:
+            batch = self._drain()
+            if not batch:
+                break
+            try:
+                try:
+                    _write(batch)
+                    failed = []
+                except IntegrityError:
+                    failed = _write_rows(batch)
+            except Exception:
+                logger.exception("Dropped %d learning events that could not be written", len(batch))
+                self._bump('failed', len(batch))
+                continue
+            if failed:
+                logger.warning("Dropped %d learning events that could not be written", len(failed))
+                self._bump('failed', len(failed))
+            written += len(batch) - len(failed)
+            self._bump('flushed', len(batch) - len(failed))
+            self._bump('batches')
+        self._publish()
+        return written
+
+    def _publish(self):
+        """Add the counters accumulated since the last flush onto the shared cache totals."""
+        with self._lock:
+            deltas = {metric: self._metrics[metric] - self._published[metric] for metric in METRICS}
+            self._published = dict(self._metrics)
+        for metric, delta in deltas.items():
+            if delta:
+                key = f'event-log:{metric}'
+                cache.add(key, 0, None)
+                try:
+                    cache.incr(key, delta)
+                except ValueError:
+                    pass
+
+    def shutdown(self, timeout=10):
+        """Stop the flush thread after a final flush, or just flush when there is no thread."""
+        if not self.threaded:
+            self.flush()
+            return
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+        self._thread = None
+
+    @contextmanager
+    def disabled(self):
+        """Record nothing inside the block, e.g. while benchmarks run in a rolled-back transaction."""
+        enabled, self.enabled = self.enabled, False
+        try:
+            yield
+        finally:
+            self.enabled = enabled
+
+
+@retry_on_lock
+def _write(batch):
+    LearningEvent.objects.bulk_create([
+        LearningEvent(kind=kind, user_id=user_id, course_id=course_id, lesson_id=lesson_id, data=data, occurred_at=at)
+        for kind, user_id, course_id, lesson_id, data, at in batch
+    ])
+
+
+def _write_rows(batch):
+    """
+    Write a batch whose bulk INSERT failed an integrity check one event at a
+    time. An event whose user was deleted after it was queued is kept
+    without the user, as SET_NULL would have left it. Returns the events
+    that still could not be written.
+    """
+    failed = []
+    for event in batch:
+        try:
+            _write([event])
+        except IntegrityError:
+            try:
+                _write([(event[0], None, *event[2:])])
+            except IntegrityError:
+                failed.append(event)
+    return failed
+
+
+event_log = EventLog()
+atexit.register(event_log.shutdown)
+
+
+def record_event(kind, user=None, course=None, lesson=None, **data):
+    return event_log.record(kind, user=user, course=course, lesson=lesson, **data)
+
+
+def record_event_nowait(kind, user=None, course=None, lesson=None, **data):
+    """For async views: never blocks the event loop, drops instead when the queue is full."""
+    return event_log.record(kind, user=user, course=course, lesson=lesson, block=False, **data)
+
+
+def shared_event_stats():
+    """Counters published to the cache by every process's flush thread."""
+    values = cache.get_many([f'event-log:{metric}' for metric in METRICS])
+    return {metric: values.get(f'event-log:{metric}', 0) for metric in METRICS}
+
+
+# ------------------------
+# Queries
+# ------------------------
+def events(kind=None, user=None, course=None, lesson=None, since=None, until=None):
+    """The logged events matching every given filter, newest first."""
+    queryset = LearningEvent.objects.all()
+    if kind:
+        queryset = queryset.filter(kind=kind)
+    if user is not None:
+        queryset = queryset.filter(user_id=getattr(user, 'pk', user))
+    if course is not None:
+        queryset = queryset.filter(course_id=getattr(course, 'id', course))
+    if lesson is not None:
+        queryset = queryset.filter(lesson_id=getattr(lesson, 'id', lesson))
+    if since is not None:
+        queryset = queryset.filter(occurred_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(occurred_at__lt=until)
+    return queryset.order_by('-occurred_at', '-id')
+
+
+def event_counts(**filters):
+    """``{kind: count}`` over the events matching ``filters`` (see ``events``)."""
+    rows = events(**filters).order_by().values_list('kind').annotate(total=Count('id'))
+    return dict(rows)
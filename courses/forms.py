@@ -6,17 +6,19 @@ from .models import Course, Lesson, Quiz
 class CourseForm(forms.ModelForm):
     class Meta:
         model = Course
-        fields = ['title', 'description']  # 'created_by' will be set in the view
+        fields = ['title', 'description', 'certificate_template']  # 'created_by' will be set in the view
 
 
 class LessonUploadForm(forms.ModelForm):
     class Meta:
         model = Lesson
-        fields = ['course', 'title', 'video_url']
+        fields = ['course', 'title', 'video_url', 'content_format', 'content', 'quiz_sample_size']
 
     def __init__(self, *args, **kwargs):
         user = kwargs.pop('user', None)  # get the logged-in user
         super().__init__(*args, **kwargs)
+        self.fields['content'].required = False
+        self.fields['quiz_sample_size'].help_text = "Questions drawn at random per attempt; 0 asks every question."
         if user:
             # Limit course list to only those created by this faculty
             self.fields['course'].queryset = Course.objects.filter(created_by=user)
@@ -41,3 +43,7 @@ class QuizForm(forms.ModelForm):
         if user:
             # Limit lessons to those belonging to courses created by this faculty
             self.fields['lesson'].queryset = Lesson.objects.filter(course__created_by=user)
+
+
+class EnrollmentImportForm(forms.Form):
+    csv_file = forms.FileField(help_text="CSV with username,course_id on each row")
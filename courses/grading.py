@@ -0,0 +1,154 @@
+# courses/grading.py
+#
+# Quiz grading against a cached answer key. The key for a lesson is stored
+# under the lesson's quiz_version, which Quiz save/delete signals bump, so a
+# stale key is never read and grading needs no Quiz query.
+#
+# Lessons with quiz_sample_size set work as a question bank: each attempt
+# draws that many questions with random.sample() from the lesson's id array
+# (cached under the same version), so the draw costs the same for a bank of
+# ten questions or ten thousand and never needs ORDER BY RANDOM(). The draw
+# is pinned in the session until the quiz is submitted, and exactly those
+# questions are graded and stored as the attempt's answers.
+
+import random
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from courses.models import Lesson, Quiz, QuizAnswer, QuizAttempt
+
+ANSWER_KEY_TIMEOUT = 60 * 60 * 24
+
+
+def _cache_key(lesson):
+    return f"answer-key:{lesson.id}:{lesson.quiz_version}"
+
+
+def _ids_cache_key(lesson):
+    return f"question-ids:{lesson.id}:{lesson.quiz_version}"
+
+
+def _draw_session_key(lesson):
+    return f"quiz-draw:{lesson.id}"
+
+
+def answer_key(lesson):
+    """
+    ``(question_ids, correct_options, question_texts)`` for the lesson, where
+    ``correct_options`` is one letter per question, e.g. ``"ACBD"``.
+    """
+    key = cache.get(_cache_key(lesson))
+    if key is None:
+        rows = list(
+            Quiz.objects.filter(lesson=lesson).order_by('id')
+            .values_list('id', 'correct_option', 'question_text')
+        )
+        key = (
+            tuple(row[0] for row in rows),
+            ''.join(row[1] for row in rows),
+            tuple(row[2] for row in rows),
+        )
+        cache.set(_cache_key(lesson), key, ANSWER_KEY_TIMEOUT)
+    return key
+
+
+def question_ids(lesson):
+    """The lesson's question ids in id order, without the rest of the answer key."""
+    ids = cache.get(_ids_cache_key(lesson))
+    if ids is None:
+        ids = tuple(Quiz.objects.filter(lesson=lesson).order_by('id').values_list('id', flat=True))
+        cache.set(_ids_cache_key(lesson), ids, ANSWER_KEY_TIMEOUT)
+    return ids
+
+
+def draw_questions(lesson, count):
+    """``count`` question ids picked at random from the lesson's bank, in the order drawn."""
+    ids = question_ids(lesson)
+    return random.sample(ids, min(count, len(ids)))
+
+
+def pinned_draw(session, lesson):
+    """
+    The question ids of the user's next attempt at a question-bank lesson.
+    Drawn on first use and kept until the attempt is submitted, so reloading
+    the quiz does not deal a new set; redrawn if the questions changed.
+    """
+    draw = session.get(_draw_session_key(lesson))
+    if draw is None or draw["version"] != lesson.quiz_version:
+        draw = {"version": lesson.quiz_version, "ids": draw_questions(lesson, lesson.quiz_sample_size)}
+        session[_draw_session_key(lesson)] = draw
+    return draw["ids"]
+
+
+def submitted_draw(session, lesson):
+    """The pinned draw being answered, or None if the session has none."""
+    draw = session.get(_draw_session_key(lesson))
+    return draw["ids"] if draw else None
+
+
+def clear_draw(session, lesson):
+    session.pop(_draw_session_key(lesson), None)
+
+
+def grade_submission(lesson, answers, drawn=None):
+    """
+    Grade ``answers`` (e.g. ``request.POST``) in memory; returns ``(score,
+    total, results)``. ``drawn`` limits grading to those question ids;
+    questions deleted since the draw are left out.
+    """
+    question_ids, correct_options, question_texts = answer_key(lesson)
+    if drawn is None:
+        indexes = range(len(question_ids))
+    else:
+        indexes = []
+        for question_id in drawn:
+            index = bisect_left(question_ids, question_id)
+            if index < len(question_ids) and question_ids[index] == question_id:
+                indexes.append(index)
+    score = 0
+    results = []
+    for index in indexes:
+        question_id, correct, text = question_ids[index], correct_options[index], question_texts[index]
+        selected = answers.get(f"q{question_id}")
+        is_correct = (selected == correct)
+        if is_correct:
+            score += 1
+        results.append({
+            "question_id": question_id,
+            "question": text,
+            "selected": selected,
+            "correct": correct,
+            "is_correct": is_correct,
+        })
+    return score, len(results), results
+
+
+def record_attempt(user, lesson, score, total, results):
+    """Store the attempt and all its answers: one insert plus one bulk insert."""
+    with transaction.atomic():
+        attempt = QuizAttempt.objects.create(user=user, lesson=lesson, score=score, total=total)
+        QuizAnswer.objects.bulk_create([
+            QuizAnswer(
+                attempt=attempt,
+                question_id=result["question_id"],
+                selected=result["selected"] or "",
+                is_correct=result["is_correct"],
+            )
+            for result in results
+        ])
+    return attempt
+
+
+def latest_attempt(user, lesson):
+    return QuizAttempt.objects.filter(user=user, lesson=lesson).order_by('-submitted_at').first()
+
+
+def lesson_attempts(lesson):
+    return QuizAttempt.objects.filter(lesson=lesson).order_by('-submitted_at')
+
+
+def bump_quiz_version(lesson_id):
+    Lesson.objects.filter(id=lesson_id).update(quiz_version=F('quiz_version') + 1)
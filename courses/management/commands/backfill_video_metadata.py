@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from courses.models import Lesson
+
+
+class Command(BaseCommand):
+    help = "Parse every lesson's video_url into the stored provider / video id / embed and thumbnail fields."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        fields = ['id', 'video_url'] + Lesson.VIDEO_FIELDS
+        checked, changed = 0, []
+        for lesson in Lesson.objects.only(*fields).order_by('id').iterator(chunk_size=options['batch_size']):
+            checked += 1
+            before = [getattr(lesson, field) for field in Lesson.VIDEO_FIELDS]
+            lesson.refresh_video_metadata()
+            if [getattr(lesson, field) for field in Lesson.VIDEO_FIELDS] != before:
+                changed.append(lesson)
+        # bulk_update skips Lesson.save(), so positions and quiz versions are left alone
+        Lesson.objects.bulk_update(changed, Lesson.VIDEO_FIELDS, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} lessons, updated {len(changed)} in {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,196 @@
+import asyncio
+import io
+import statistics
+import sys
+import threading
+import time
+from itertools import cycle
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from courses.db import scratch_database
+from courses.events import event_log
+from courses.models import Course, Enrollment, Lesson
+from courses.summaries import record_lesson_completion
+
+HOST = 'localhost'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/second and latency of the read-heavy pages served through "
+        "the WSGI handler (thread per request) and the ASGI handler (async views), "
+        "in process, against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per handler.")
+        parser.add_argument('--concurrency', type=int, default=16, help="Concurrent clients.")
+        parser.add_argument('--courses', type=int, default=100, help="Courses to seed.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("This benchmark only applies to SQLite.")
+
+        event_log.use_flush_thread()  # as in the servers being compared
+        with scratch_database():
+            requests = self._seed(options['courses'])
+            total, concurrency = options['requests'], options['concurrency']
+            results = {
+                'wsgi': self._run_wsgi(requests, total, concurrency),
+                'asgi': asyncio.run(self._run_asgi(requests, total, concurrency)),
+            }
+            event_log.flush()  # write the lesson views before the scratch database goes away
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label}  {result['count']:>6} requests  {result['errors']:>4} errors  "
+                f"{result['per_second']:8.1f} req/s  p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms"
+            )
+
+    def _seed(self, course_count):
+        """Create the data and return ``(path, cookie)`` pairs covering the async views."""
+        User = get_user_model()
+        faculty = User.objects.create_user('bench-faculty', password='x', role='faculty')
+        student = User.objects.create_user('bench-student', password='x', role='student')
+        courses = Course.objects.bulk_create(
+            [Course(title=f'Course {i}', description='Benchmark course', created_by=faculty) for i in range(course_count)]
+        )
+        lessons = [
+            Lesson(course=course, title=f'Lesson {n}', content='Lesson body', video_url='https://youtu.be/benchmark', position=n)
+            for course in courses for n in range(1, 11)
+        ]
+        for lesson in lessons:
+            lesson.refresh_derived_fields()
+        Lesson.objects.bulk_create(lessons)
+        enrolled = courses[:course_count // 2]
+        Enrollment.objects.bulk_create([Enrollment(student=student, course=course) for course in enrolled])
+        for lesson in Lesson.objects.filter(course__in=enrolled[:10], position__lte=5):
+            record_lesson_completion(student, lesson)
+
+        cookies = {}
+        for user in (student, faculty):
+            client = Client()
+            client.force_login(user)
+            cookies[user.role] = f"sessionid={client.cookies['sessionid'].value}"
+
+        course, lesson = enrolled[0], Lesson.objects.filter(course=enrolled[0]).order_by('position')[1]
+        return [
+            (reverse('courses:course_list'), cookies['student']),
+            (reverse('courses:course-detail', args=[course.id]), cookies['student']),
+            (reverse('courses:lesson-detail', args=[lesson.id]), cookies['student']),
+            (reverse('courses:progress'), cookies['student']),
+            (reverse('users:student_dashboard'), cookies['student']),
+            (reverse('users:faculty_dashboard'), cookies['faculty']),
+        ]
+
+    # ------------------------
+    # WSGI: a thread per in-flight request, like a threaded WSGI server
+    # ------------------------
+    def _run_wsgi(self, requests, total, concurrency):
+        app = get_wsgi_application()
+        plan = cycle(requests)
+        plan_lock = threading.Lock()
+        latencies, statuses = [], []
+
+        def call(path, cookie):
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+                'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'HTTP_HOST': HOST, 'HTTP_COOKIE': cookie,
+                'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+                'wsgi.url_scheme': 'http', 'wsgi.version': (1, 0), 'wsgi.multithread': True,
+                'wsgi.multiprocess': False, 'wsgi.run_once': False,
+            }
+            status = []
+            body = app(environ, lambda s, headers, exc_info=None: status.append(int(s.split()[0])))
+            try:
+                b''.join(body)
+            finally:
+                body.close()  # fires request_finished, as a server would
+            return status[0]
+
+        def worker(count):
+            for _ in range(count):
+                with plan_lock:
+                    path, cookie = next(plan)
+                started = time.perf_counter()
+                status = call(path, cookie)
+                elapsed = time.perf_counter() - started
+                with plan_lock:
+                    latencies.append(elapsed)
+                    statuses.append(status)
+
+        call(*requests[0])  # warm up URL resolver, templates and connections
+        threads = [threading.Thread(target=worker, args=(count,)) for count in _split(total, concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return _summary(latencies, statuses, time.perf_counter() - started)
+
+    # ------------------------
+    # ASGI: concurrent tasks on one event loop
+    # ------------------------
+    async def _run_asgi(self, requests, total, concurrency):
+        app = get_asgi_application()
+        plan = cycle(requests)
+        latencies, statuses = [], []
+
+        async def call(path, cookie):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+                'root_path': '', 'headers': [(b'host', HOST.encode()), (b'cookie', cookie.encode())],
+                'client': ('127.0.0.1', 50000), 'server': (HOST, 80),
+            }
+            status = []
+            messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            done = asyncio.Event()
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await done.wait()  # the client stays connected until the response is sent
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            await app(scope, receive, send)
+            done.set()
+            return status[0]
+
+        async def worker(count):
+            for _ in range(count):
+                path, cookie = next(plan)
+                started = time.perf_counter()
+                status = await call(path, cookie)
+                latencies.append(time.perf_counter() - started)
+                statuses.append(status)
+
+        await call(*requests[0])
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(count) for count in _split(total, concurrency)))
+        return _summary(latencies, statuses, time.perf_counter() - started)
+
+
+def _split(total, parts):
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def _summary(latencies, statuses, seconds):
+    latencies = sorted(latencies)
+    return {
+        'count': len(latencies),
+        'errors': sum(1 for status in statuses if status != 200),
+        'per_second': len(latencies) / seconds if seconds else 0.0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0.0,
+    }
@@ -0,0 +1,51 @@
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from courses.certificate_engine import CERTIFICATE_TEMPLATES, render_certificate
+from courses.utils import generate_certificate
+
+
+class Command(BaseCommand):
+    help = "Compare per-certificate render time and memory of generate_certificate and the stamped templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=500, help="Certificates to render per renderer.")
+
+    def _measure(self, label, render, count):
+        render(0)  # warm up (imports, font metrics, compiled template prefix)
+
+        started = time.perf_counter()
+        for i in range(count):
+            render(i)
+        seconds = time.perf_counter() - started
+
+        tracemalloc.start()
+        size = len(render(count))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f"{label:<28} {seconds / count * 1000:8.3f} ms/cert  {count / seconds:9.1f} cert/s  "
+            f"peak {peak / 1024:8.1f} KiB  pdf {size / 1024:6.1f} KiB"
+        )
+        return seconds
+
+    def handle(self, *args, **options):
+        count = options['count']
+        today = date.today()
+
+        baseline = self._measure(
+            'generate_certificate',
+            lambda i: generate_certificate(f"Student {i}", "Benchmark Course", issued_on=today).getvalue(),
+            count,
+        )
+        for key in CERTIFICATE_TEMPLATES:
+            seconds = self._measure(
+                f'stamped:{key}',
+                lambda i, key=key: render_certificate(f"Student {i}", "Benchmark Course", today, key),
+                count,
+            )
+            self.stdout.write(f"{'':<28} {baseline / seconds:8.1f}x faster than generate_certificate")
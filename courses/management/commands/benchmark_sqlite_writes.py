@@ -0,0 +1,130 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections, transaction
+
+from courses.db import is_lock_error, retry_on_lock, scratch_database
+from courses.grading import record_attempt
+from courses.models import Course, CourseProgress, Enrollment, Lesson, QuizAttempt, UserProgress
+from courses.summaries import record_lesson_completion
+
+PROFILE_KEYS = ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS')
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent enroll + quiz-submit write throughput on a scratch SQLite "
+        "database with the default settings and with the production profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent writers.")
+        parser.add_argument('--ops', type=int, default=100, help="Enroll + quiz submissions per writer.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("This benchmark only applies to SQLite.")
+
+        with scratch_database() as settings_dict:
+            original = {key: settings_dict.get(key) for key in PROFILE_KEYS}
+            try:
+                students, lessons = self._seed(options['threads'], options['ops'])
+                profiles = [
+                    ('default', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'OPTIONS': {}}, False),
+                    ('production', settings.SQLITE_PRODUCTION_PROFILE, True),
+                ]
+                results = {}
+                for label, profile, retry in profiles:
+                    self._reset(settings_dict, profile)
+                    results[label] = self._run(students, lessons, retry)
+                    self._report(label, results[label])
+            finally:
+                connections.close_all()
+                settings_dict.update(original)
+        if results['default']['ops_per_second']:
+            speedup = results['production']['ops_per_second'] / results['default']['ops_per_second']
+            self.stdout.write(f"production profile: {speedup:.1f}x the successful write throughput")
+
+    def _seed(self, threads, ops):
+        User = get_user_model()
+        faculty = User.objects.create(username='bench-faculty', role='faculty')
+        User.objects.bulk_create(
+            [User(username=f'bench-student-{i}', role='student') for i in range(threads)]
+        )
+        courses = Course.objects.bulk_create(
+            [Course(title=f'Course {i}', description='', created_by=faculty) for i in range(ops)]
+        )
+        Lesson.objects.bulk_create(
+            [Lesson(course=course, title='Lesson', content='', position=1) for course in courses]
+        )
+        students = list(User.objects.filter(role='student').order_by('id'))
+        lessons = list(Lesson.objects.select_related('course').order_by('id'))
+        return students, lessons
+
+    def _reset(self, settings_dict, profile):
+        connections.close_all()
+        for model in (QuizAttempt, UserProgress, CourseProgress, Enrollment):
+            model.objects.all().delete()
+        with connection.cursor() as cursor:
+            # WAL persists in the file, so switch back before the default run
+            cursor.execute("PRAGMA journal_mode=DELETE")
+        connections.close_all()
+        settings_dict.update({key: profile[key] for key in PROFILE_KEYS})
+
+    def _run(self, students, lessons, retry):
+        latencies, failures = [], []
+        lock = threading.Lock()
+
+        def submit(student, lesson):
+            Enrollment.objects.get_or_create(student=student, course=lesson.course)
+            with transaction.atomic():
+                record_attempt(student, lesson, 1, 1, [])
+                record_lesson_completion(student, lesson)
+
+        if retry:
+            submit = retry_on_lock(submit)
+
+        def writer(student):
+            for lesson in lessons:
+                started = time.perf_counter()
+                try:
+                    submit(student, lesson)
+                except Exception as exc:
+                    with lock:
+                        failures.append('locked' if is_lock_error(exc) else type(exc).__name__)
+                else:
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+                # What the request_finished signal does after each request
+                close_old_connections()
+            connections.close_all()
+
+        threads = [threading.Thread(target=writer, args=(student,)) for student in students]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'ok': len(latencies),
+            'failed': len(failures),
+            'locked': failures.count('locked'),
+            'seconds': seconds,
+            'ops_per_second': len(latencies) / seconds if seconds else 0.0,
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+            'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+        }
+
+    def _report(self, label, result):
+        self.stdout.write(
+            f"{label:<11} {result['ok']:>6} ok  {result['failed']:>5} failed ({result['locked']} locked)  "
+            f"{result['seconds']:7.2f}s  {result['ops_per_second']:8.1f} writes/s  "
+            f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms"
+        )
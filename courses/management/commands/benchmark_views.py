@@ -0,0 +1,223 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+import courses.urls
+import users.urls
+from courses.db import scratch_database
+from courses.events import event_log
+from courses.models import Course, CourseProgress, Enrollment, Lesson, Quiz
+from courses.seeding import seed_dataset
+
+HOST = 'localhost'
+URL_MODULES = [('courses', courses.urls), ('users', users.urls)]
+
+FACULTY_VIEWS = {
+    'courses:edit_course', 'courses:delete_course', 'courses:delete_lesson', 'courses:move_lesson',
+    'courses:reorder_lessons', 'courses:upload_lesson', 'courses:add_quiz', 'courses:delete_quiz',
+    'courses:create_course', 'courses:import_enrollments', 'courses:course_certificates',
+    'users:faculty_dashboard',
+}
+ANONYMOUS_VIEWS = {'users:user-home', 'users:register'}
+# Views that only do their work on POST. Everything runs inside a transaction
+# that is rolled back, so these writes never persist.
+POST_VIEWS = {'courses:quiz-submit', 'courses:move_lesson', 'courses:reorder_lessons', 'users:logout'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every URL in courses/urls.py and users/urls.py through the test client and "
+        "report latency percentiles and query counts per view, saved as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help="Timed requests per view.")
+        parser.add_argument('--only', default='', help="Only views whose name contains this text.")
+        parser.add_argument('--output', help="JSON file to write (default: benchmarks/views-<timestamp>.json).")
+        parser.add_argument('--compare', help="Earlier JSON result to print the differences against.")
+        parser.add_argument(
+            '--scratch', action='store_true',
+            help="Run against a scratch database seeded with --courses/--students instead of the configured one.",
+        )
+        parser.add_argument('--courses', type=int, default=50)
+        parser.add_argument('--students', type=int, default=300)
+
+    def handle(self, *args, **options):
+        if options['scratch']:
+            with scratch_database():
+                seed_dataset(courses=options['courses'], students=options['students'])
+                result = self._benchmark(options)
+        else:
+            result = self._benchmark(options)
+
+        output = Path(options['output'] or settings.BASE_DIR / 'benchmarks' / f"views-{timezone.now():%Y%m%d-%H%M%S}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, indent=2))
+        self.stdout.write(f"Saved {output}")
+
+        if options['compare']:
+            self._compare(json.loads(Path(options['compare']).read_text()), result)
+
+    # ------------------------
+    # Running
+    # ------------------------
+    def _benchmark(self, options):
+        fixtures = self._fixtures()
+        cases = [case for case in self._cases(fixtures) if options['only'] in case['name']]
+        clients = {}
+        for role in ('student', 'faculty'):
+            clients[role] = Client(HTTP_HOST=HOST)
+            clients[role].force_login(fixtures[role])
+        clients['anonymous'] = Client(HTTP_HOST=HOST)
+
+        views = {}
+        self.stdout.write(f"{'view':<34} {'method':<6} {'status':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'queries':>8}")
+        # The event log writes from its own thread and connection, which would
+        # wait on the write lock held by this transaction.
+        with event_log.disabled(), transaction.atomic():
+            for case in cases:
+                views[case['name']] = stats = self._measure(case, clients, fixtures, options['iterations'])
+                self.stdout.write(
+                    f"{case['name']:<34} {case['method']:<6} {stats['status']:>6} {stats['p50_ms']:8.2f} "
+                    f"{stats['p90_ms']:8.2f} {stats['p99_ms']:8.2f} {stats['queries']:>8}"
+                )
+            transaction.set_rollback(True)
+
+        return {
+            'created': timezone.now().isoformat(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'dataset': {
+                'courses': Course.objects.count(),
+                'lessons': Lesson.objects.count(),
+                'quizzes': Quiz.objects.count(),
+                'enrollments': Enrollment.objects.count(),
+                'progress_summaries': CourseProgress.objects.count(),
+            },
+            'views': views,
+        }
+
+    def _measure(self, case, clients, fixtures, iterations):
+        latencies, queries, status, size = [], [], None, 0
+        for i in range(iterations + 1):  # the first request warms up and is not counted
+            client = clients[case['role']]
+            if case['name'] == 'users:logout':
+                client = Client(HTTP_HOST=HOST)
+                client.force_login(fixtures['student'])
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(client, case['method'].lower())(case['path'], case.get('data', {}))
+                # The test client closes the response itself (streaming ones once consumed)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = time.perf_counter() - started
+            if i:
+                latencies.append(elapsed)
+                queries.append(len(captured))
+            status, size = response.status_code, len(body)
+
+        latencies.sort()
+        return {
+            'path': case['path'],
+            'method': case['method'],
+            'role': case['role'],
+            'status': status,
+            'bytes': size,
+            'queries': max(queries) if queries else 0,
+            'min_queries': min(queries) if queries else 0,
+            'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            'p50_ms': _percentile(latencies, 50),
+            'p90_ms': _percentile(latencies, 90),
+            'p99_ms': _percentile(latencies, 99),
+            'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+    # ------------------------
+    # Cases
+    # ------------------------
+    def _fixtures(self):
+        course = (
+            Course.objects.filter(lessons__quizzes__isnull=False, enrollments__student__role='student')
+            .select_related('created_by').annotate(enrolled=Count('enrollments', distinct=True))
+            .order_by('-enrolled', 'id').first()
+        )
+        if course is None:
+            raise CommandError("No course with lessons, quizzes and students; run `manage.py seed_data` first.")
+        lessons = list(course.lessons.order_by('position'))
+        lesson = next((l for l in lessons if l.quizzes.exists()), lessons[0])
+        return {
+            'course': course,
+            'lessons': lessons,
+            'lesson': lesson,
+            'quizzes': list(lesson.quizzes.all()),
+            'faculty': course.created_by,
+            'student': self._student(course),
+        }
+
+    def _student(self, course):
+        """A student of ``course``, preferably one who completed it (so certificates render)."""
+        summary = (
+            CourseProgress.objects.filter(course=course, student__role='student')
+            .select_related('student').order_by(F('completed_count').desc(), 'id').first()
+        )
+        if summary is not None:
+            return summary.student
+        return Enrollment.objects.filter(course=course, student__role='student').select_related('student').first().student
+
+    def _cases(self, fixtures):
+        sample_kwargs = {
+            'course_id': fixtures['course'].id,
+            'lesson_id': fixtures['lesson'].id,
+            'quiz_id': fixtures['quizzes'][0].id if fixtures['quizzes'] else 0,
+            'direction': 'down',
+        }
+        request_data = {
+            'courses:search': {'q': fixtures['course'].title.split()[0]},
+            'courses:quiz-submit': {f'q{quiz.id}': quiz.correct_option for quiz in fixtures['quizzes']},
+            'courses:reorder_lessons': {'order': ','.join(str(l.id) for l in fixtures['lessons'])},
+        }
+        for namespace, module in URL_MODULES:
+            for pattern in module.urlpatterns:
+                name = f'{namespace}:{pattern.name}'
+                kwargs = {key: sample_kwargs[key] for key in pattern.pattern.converters}
+                yield {
+                    'name': name,
+                    'path': reverse(name, kwargs=kwargs),
+                    'method': 'POST' if name in POST_VIEWS else 'GET',
+                    'role': 'faculty' if name in FACULTY_VIEWS else 'anonymous' if name in ANONYMOUS_VIEWS else 'student',
+                    'data': request_data.get(name, {}),
+                }
+
+    # ------------------------
+    # Comparison
+    # ------------------------
+    def _compare(self, before, after):
+        self.stdout.write(f"\nCompared with the run of {before.get('created', '?')}:")
+        for name, now in after['views'].items():
+            then = before.get('views', {}).get(name)
+            if then is None:
+                self.stdout.write(f"{name:<34} new")
+                continue
+            change = (now['p50_ms'] - then['p50_ms']) / then['p50_ms'] * 100 if then['p50_ms'] else 0.0
+            self.stdout.write(
+                f"{name:<34} p50 {then['p50_ms']:8.2f} -> {now['p50_ms']:8.2f} ms ({change:+6.1f}%)  "
+                f"queries {then['queries']} -> {now['queries']}"
+            )
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index] * 1000
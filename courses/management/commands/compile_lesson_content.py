@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from courses.models import Lesson
+
+
+class Command(BaseCommand):
+    help = "Compile every lesson's content into the stored, sanitized content_html (run once after migrating)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        now = timezone.now()
+        checked, changed = 0, []
+        lessons = Lesson.objects.only('id', 'content', 'content_format', 'content_html').order_by('id')
+        for lesson in lessons.iterator(chunk_size=options['batch_size']):
+            checked += 1
+            before = lesson.content_html
+            lesson.compile_content()
+            if lesson.content_html != before:
+                lesson.updated_at = now  # keys the cached lesson body
+                changed.append(lesson)
+        # bulk_update skips Lesson.save(), so positions and quiz versions are left alone
+        Lesson.objects.bulk_update(changed, ['content_html', 'updated_at'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} lessons, recompiled {len(changed)} in {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,29 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from courses.packages import PACKAGE_CHUNK_SIZE, export_package, open_package
+
+
+class Command(BaseCommand):
+    help = "Export courses, lessons and quizzes as a JSON Lines course package (gzip for .gz paths)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Package file to write ('-' for standard output).")
+        parser.add_argument('--course', type=int, action='append', dest='courses',
+                            help="Only export this course id (repeatable).")
+        parser.add_argument('--chunk-size', type=int, default=PACKAGE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['output'] == '-':
+            counts = export_package(sys.stdout, options['courses'], options['chunk_size'])
+        else:
+            with open_package(options['output'], 'w') as out:
+                counts = export_package(out, options['courses'], options['chunk_size'])
+
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {counts['course']} courses, {counts['lesson']} lessons and "
+            f"{counts['quiz']} quizzes in {time.perf_counter() - started:.2f}s."
+        ))
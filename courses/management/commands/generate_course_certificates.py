@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.certificates import stream_cohort_zip
+from courses.models import Course
+
+
+class Command(BaseCommand):
+    help = "Render certificates for every student who completed a course into one ZIP archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int)
+        parser.add_argument('--output', '-o', help="ZIP file to write (default: course_<id>_certificates.zip).")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Rendering processes (default: number of CPUs).")
+
+    def handle(self, *args, **options):
+        try:
+            course = Course.objects.get(id=options['course_id'])
+        except Course.DoesNotExist:
+            raise CommandError(f"Course {options['course_id']} does not exist.")
+
+        output = options['output'] or f"course_{course.id}_certificates.zip"
+        stats = {}
+        with open(output, 'wb') as archive:
+            for chunk in stream_cohort_zip(course, workers=options['workers'], stats=stats):
+                archive.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {stats['count']} certificates ({stats['rendered']} rendered) to {output} "
+            f"in {stats['seconds']:.2f}s — {stats['per_second']:.1f} certificates/second."
+        ))
@@ -0,0 +1,35 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.packages import PACKAGE_CHUNK_SIZE, PackageError, import_package, open_package
+
+
+class Command(BaseCommand):
+    help = "Import a JSON Lines course package (plain or gzip) created by export_courses."
+
+    def add_arguments(self, parser):
+        parser.add_argument('package', help="Package file to read.")
+        parser.add_argument('--owner', help="Username that owns courses whose creator does not exist here.")
+        parser.add_argument('--batch-size', type=int, default=PACKAGE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        owner = None
+        if options['owner']:
+            try:
+                owner = get_user_model().objects.get(username=options['owner'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['owner']!r} does not exist.")
+
+        started = time.perf_counter()
+        try:
+            with open_package(options['package'], 'r') as lines:
+                counts = import_package(lines, owner=owner, batch_size=options['batch_size'])
+        except (OSError, UnicodeDecodeError, PackageError) as exc:
+            raise CommandError(f"Import failed: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {counts['course']} courses, {counts['lesson']} lessons and {counts['quiz']} quizzes "
+            f"({counts['skipped']} rows skipped) in {time.perf_counter() - started:.2f}s."
+        ))
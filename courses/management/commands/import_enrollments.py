@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.enrollment_import import IMPORT_CHUNK_SIZE, format_import_stats, import_enrollments
+
+
+class Command(BaseCommand):
+    help = "Enroll students in bulk from a CSV file with username,course_id rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help="Path to the CSV file ('-' for standard input).")
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE,
+                            help="Rows resolved and inserted per transaction.")
+
+    def handle(self, *args, **options):
+        path = options['csv_file']
+        try:
+            if path == '-':
+                stats = import_enrollments(sys.stdin, chunk_size=options['chunk_size'])
+            else:
+                with open(path, newline='', encoding='utf-8-sig') as lines:
+                    stats = import_enrollments(lines, chunk_size=options['chunk_size'])
+        except (OSError, UnicodeDecodeError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(format_import_stats(stats)))
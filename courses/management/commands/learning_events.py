@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from courses.events import event_counts, events, shared_event_stats
+from courses.models import LearningEvent
+
+
+class Command(BaseCommand):
+    help = "List or count logged learning events, or show the event buffer's counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=[kind for kind, _ in LearningEvent.KIND_CHOICES])
+        parser.add_argument('--user', help="Username.")
+        parser.add_argument('--course', type=int, help="Course id.")
+        parser.add_argument('--lesson', type=int, help="Lesson id.")
+        parser.add_argument('--days', type=float, help="Only events from the last N days.")
+        parser.add_argument('--limit', type=int, default=50, help="Events to list (newest first).")
+        parser.add_argument('--counts', action='store_true', help="Print counts per kind instead of events.")
+        parser.add_argument('--stats', action='store_true', help="Print the buffer's recorded/dropped/flushed counters.")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            for metric, value in shared_event_stats().items():
+                self.stdout.write(f"{metric:<10} {value:>10}")
+            return
+
+        filters = {'kind': options['kind'], 'course': options['course'], 'lesson': options['lesson']}
+        if options['user']:
+            user = get_user_model().objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"No user named {options['user']!r}.")
+            filters['user'] = user
+        if options['days']:
+            filters['since'] = timezone.now() - timedelta(days=options['days'])
+
+        if options['counts']:
+            for kind, total in sorted(event_counts(**filters).items()):
+                self.stdout.write(f"{kind:<24} {total:>10}")
+            return
+
+        for event in events(**filters).select_related('user')[:options['limit']]:
+            who = event.user.username if event.user else '-'
+            details = ' '.join(f"{key}={value}" for key, value in event.data.items())
+            self.stdout.write(
+                f"{event.occurred_at:%Y-%m-%d %H:%M:%S}  {event.kind:<22} {who:<20} "
+                f"course={event.course_id or '-'} lesson={event.lesson_id or '-'} {details}".rstrip()
+            )
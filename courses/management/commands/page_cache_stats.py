@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from courses.page_cache import catalog_version, page_cache_stats
+
+CACHED_VIEWS = ['course_list', 'available_courses']
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the anonymous catalog page cache."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Catalog version: {catalog_version()}")
+        for name, counts in page_cache_stats(CACHED_VIEWS).items():
+            total = counts['hits'] + counts['misses']
+            ratio = counts['hits'] / total * 100 if total else 0
+            self.stdout.write(f"{name:<20} hits {counts['hits']:>8}  misses {counts['misses']:>8}  ({ratio:.1f}% hit)")
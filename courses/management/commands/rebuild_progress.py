@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from courses.summaries import rebuild_course_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-student CourseProgress summaries from Enrollment and UserProgress."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', dest='courses',
+                            help="Only rebuild this course id (repeatable).")
+
+    def handle(self, *args, **options):
+        written = rebuild_course_progress(options['courses'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} progress summaries."))
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from courses.search import rebuild_search_index, search_enabled
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index over course and lesson text."
+
+    def handle(self, *args, **options):
+        if not search_enabled():
+            self.stdout.write(self.style.WARNING("Full-text search needs SQLite FTS5; nothing to rebuild."))
+            return
+        started = time.perf_counter()
+        written = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {written} courses and lessons in {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from courses.seeding import SEED_PASSWORD, clear_seeded_data, seed_dataset
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic dataset (users, courses, lessons, quizzes, enrollments, progress) with bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--faculty', type=int, default=5)
+        parser.add_argument('--courses', type=int, default=50)
+        parser.add_argument('--lessons', type=int, default=10, help="Lessons per course.")
+        parser.add_argument('--quizzes', type=int, default=3, help="Quiz questions per lesson.")
+        parser.add_argument('--students', type=int, default=500)
+        parser.add_argument('--enrollments', type=float, default=4, help="Mean courses per student.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for repeatable datasets.")
+        parser.add_argument('--clear', action='store_true', help="Delete previously seeded data first.")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write(f"Cleared {clear_seeded_data()} seeded rows.")
+
+        started = time.perf_counter()
+        counts = seed_dataset(
+            faculty=options['faculty'],
+            courses=options['courses'],
+            lessons=options['lessons'],
+            quizzes=options['quizzes'],
+            students=options['students'],
+            enrollments=options['enrollments'],
+            seed=options['seed'],
+        )
+        seconds = time.perf_counter() - started
+        summary = ', '.join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary} in {seconds:.1f}s."))
+        self.stdout.write(f"Seeded users log in with the password {SEED_PASSWORD!r}.")
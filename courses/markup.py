@@ -0,0 +1,248 @@
+# courses/markup.py
+#
+# Lesson bodies are compiled to HTML once, when the lesson is saved, and the
+# result is stored in Lesson.content_html. Sources are either Markdown (the
+# common subset: headings, paragraphs, emphasis, code, lists, quotes, links,
+# images, rules) or HTML; either way the output goes through an allowlist
+# sanitizer built on html.parser, so only the tags and attributes below,
+# and only http(s)/mailto/relative URLs, ever reach a page. Both are
+# standard-library only.
+
+import html
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+MARKDOWN = 'markdown'
+HTML = 'html'
+FORMAT_CHOICES = [(MARKDOWN, 'Markdown'), (HTML, 'HTML')]
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'hr', 'i', 'img', 'kbd', 'li', 'ol', 'p', 'pre', 's', 'span', 'strong', 'sub', 'sup',
+    'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'code': {'class'},  # language-xyz on fenced code blocks
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'ol': {'start'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+# Dropped together with everything inside them
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'textarea', 'select'}
+
+
+# ------------------------
+# Sanitizing
+# ------------------------
+def _safe_url(url):
+    url = url.strip()
+    # Browsers ignore control characters and whitespace inside the scheme
+    scheme = urlsplit(re.sub(r'[\x00-\x20]+', '', url)).scheme.lower()
+    return url if scheme in ALLOWED_SCHEMES else None
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        kept = []
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _safe_url(value)
+                if value is None:
+                    continue
+            kept.append(f' {name}="{html.escape(value, quote=True)}"')
+        if tag == 'a':
+            kept.append(' rel="nofollow noopener"')
+        self.out.append(f"<{tag}{''.join(kept)}>")
+        if tag not in VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in self.open and tag not in VOID_TAGS and self.open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open:
+            return
+        # Close anything left open inside this element first
+        while self.open:
+            name = self.open.pop()
+            self.out.append(f'</{name}>')
+            if name == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return ''.join(self.out) + ''.join(f'</{tag}>' for tag in reversed(self.open))
+
+
+def sanitize_html(source):
+    """``source`` reduced to the allowed tags, attributes and URL schemes."""
+    parser = _Sanitizer()
+    parser.feed(source)
+    return parser.result()
+
+
+# ------------------------
+# Markdown
+# ------------------------
+_CODE_SPAN = re.compile(r'(`+)(.+?)\1', re.S)
+_URL = r'((?:[^\s()]|\([^\s()]*\))+)'  # balanced parentheses, as in Wikipedia links
+_IMAGE = re.compile(r'!\[([^\]]*)\]\(\s*' + _URL + r'(?:\s+"([^"]*)")?\s*\)')
+_LINK = re.compile(r'\[([^\]]+)\]\(\s*' + _URL + r'(?:\s+"([^"]*)")?\s*\)')
+_AUTOLINK = re.compile(r'<(https?://[^\s>]+)>')
+_STRONG = re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1', re.S)
+_EMPHASIS = re.compile(r'(?<![\w*])([*_])(?=\S)(.+?)(?<=\S)\1(?![\w*])', re.S)
+_STRIKE = re.compile(r'~~(?=\S)(.+?)(?<=\S)~~', re.S)
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_RULE = re.compile(r'^\s{0,3}([-*_])(\s*\1){2,}\s*$')
+_BULLET = re.compile(r'^\s{0,3}[-*+]\s+(.*)$')
+_ORDERED = re.compile(r'^\s{0,3}(\d{1,9})[.)]\s+(.*)$')
+_FENCE = re.compile(r'^\s{0,3}(```|~~~)\s*([\w+-]*)\s*$')
+_QUOTE = re.compile(r'^\s{0,3}>\s?(.*)$')
+
+
+def _inline(text):
+    """Inline Markdown. Code spans are set aside first so their contents stay literal."""
+    stash = []
+
+    def keep(fragment):
+        stash.append(fragment)
+        return f'\x00{len(stash) - 1}\x00'
+
+    text = _CODE_SPAN.sub(lambda m: keep(f'<code>{html.escape(m.group(2).strip())}</code>'), text)
+
+    def image(m):
+        title = f' title="{html.escape(m.group(3))}"' if m.group(3) else ''
+        return keep(f'<img src="{html.escape(m.group(2))}" alt="{html.escape(m.group(1))}"{title}>')
+
+    def link(m):
+        title = f' title="{html.escape(m.group(3))}"' if m.group(3) else ''
+        return f'<a href="{html.escape(m.group(2))}"{title}>{m.group(1)}</a>'
+
+    text = _IMAGE.sub(image, text)
+    text = _LINK.sub(link, text)
+    text = _AUTOLINK.sub(lambda m: f'<a href="{html.escape(m.group(1))}">{html.escape(m.group(1))}</a>', text)
+    text = _STRONG.sub(r'<strong>\2</strong>', text)
+    text = _EMPHASIS.sub(r'<em>\2</em>', text)
+    text = _STRIKE.sub(r'<del>\1</del>', text)
+    text = re.sub(r' {2,}\n|\\\n', '<br>\n', text)
+    return re.sub(r'\x00(\d+)\x00', lambda m: stash[int(m.group(1))], text)
+
+
+def _list(lines, start):
+    """The list starting at ``lines[start]``; returns (html, next index)."""
+    ordered = bool(_ORDERED.match(lines[start]))
+    marker = _ORDERED if ordered else _BULLET
+    items, index = [], start
+    while index < len(lines):
+        match = marker.match(lines[index])
+        if match:
+            items.append([match.group(match.lastindex)])
+        elif lines[index].strip() and items and lines[index].startswith((' ', '\t')):
+            items[-1].append(lines[index].strip())  # continuation of the previous item
+        else:
+            break
+        index += 1
+    tag = 'ol' if ordered else 'ul'
+    first = _ORDERED.match(lines[start]).group(1) if ordered else '1'
+    start_attr = f' start="{int(first)}"' if ordered and first != '1' else ''
+    body = ''.join(f'<li>{_inline(" ".join(item))}</li>' for item in items)
+    return f'<{tag}{start_attr}>{body}</{tag}>', index
+
+
+def _blocks(lines):
+    out, paragraph, index = [], [], 0
+
+    def end_paragraph():
+        if paragraph:
+            out.append(f'<p>{_inline(chr(10).join(paragraph))}</p>')
+            paragraph.clear()
+
+    while index < len(lines):
+        line = lines[index]
+        fence = _FENCE.match(line)
+        if fence:
+            end_paragraph()
+            code, index = [], index + 1
+            while index < len(lines) and not lines[index].strip().startswith(fence.group(1)):
+                code.append(lines[index])
+                index += 1
+            language = f' class="language-{fence.group(2)}"' if fence.group(2) else ''
+            out.append(f'<pre><code{language}>{html.escape(chr(10).join(code))}</code></pre>')
+            index += 1
+            continue
+        if not line.strip():
+            end_paragraph()
+        elif _HEADING.match(line):
+            end_paragraph()
+            hashes, text = _HEADING.match(line).groups()
+            out.append(f'<h{len(hashes)}>{_inline(text)}</h{len(hashes)}>')
+        elif _RULE.match(line):
+            end_paragraph()
+            out.append('<hr>')
+        elif _BULLET.match(line) or _ORDERED.match(line):
+            end_paragraph()
+            block, index = _list(lines, index)
+            out.append(block)
+            continue
+        elif _QUOTE.match(line):
+            end_paragraph()
+            quoted = []
+            while index < len(lines) and _QUOTE.match(lines[index]):
+                quoted.append(_QUOTE.match(lines[index]).group(1))
+                index += 1
+            out.append(f'<blockquote>{_blocks(quoted)}</blockquote>')
+            continue
+        elif line.startswith(('    ', '\t')) and not paragraph:
+            code = []
+            while index < len(lines) and (lines[index].startswith(('    ', '\t')) or not lines[index].strip()):
+                code.append(lines[index][4:] if lines[index].startswith('    ') else lines[index].lstrip('\t'))
+                index += 1
+            out.append(f'<pre><code>{html.escape(chr(10).join(code).rstrip())}</code></pre>')
+            continue
+        else:
+            paragraph.append(line)
+        index += 1
+    end_paragraph()
+    return '\n'.join(out)
+
+
+def render_markdown(source):
+    return _blocks(source.replace('\r\n', '\n').replace('\r', '\n').expandtabs(4).split('\n'))
+
+
+def render_content(source, content_format=MARKDOWN):
+    """Sanitized HTML for a lesson body in ``content_format``."""
+    if not source:
+        return ''
+    rendered = render_markdown(source) if content_format == MARKDOWN else source
+    return sanitize_html(rendered)
@@ -0,0 +1,142 @@
+# courses/middleware.py
+#
+# Opt-in per-request SQL instrumentation. A single execute wrapper is added
+# to every database connection and records into the recorder of the current
+# request, found through a context variable, so it also follows queries that
+# async views run on the sync thread pool. The middleware removes itself at
+# startup (MiddlewareNotUsed) unless SQL_INSTRUMENTATION is on, so a disabled
+# deployment pays nothing per request or per query.
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('courses.sql')
+
+_recorder = ContextVar('sql_recorder', default=None)
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """The statement shape: literals and IN lists of any length collapse to placeholders."""
+    sql = _LITERALS.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def add(self, sql, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[fingerprint(sql)] += 1
+
+    def repeated(self, limit):
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > limit]
+
+
+def _record_query(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.add(sql, time.perf_counter() - started)
+
+
+def _install(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _install_on_new_connection(sender, connection, **kwargs):
+    _install(connection)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Adds ``Server-Timing: sql;dur=..;desc="N queries", app;dur=..`` to every
+    response and logs a JSON warning when a request runs more than
+    ``SQL_QUERY_BUDGET`` queries or one statement shape more than
+    ``SQL_REPEATED_QUERY_LIMIT`` times (the usual sign of an N+1 loop).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budget = getattr(settings, 'SQL_QUERY_BUDGET', 25)
+        self.repeat_limit = getattr(settings, 'SQL_REPEATED_QUERY_LIMIT', 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(_install_on_new_connection, dispatch_uid='courses.sql_instrumentation')
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self._report(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self._report(request, response, recorder, time.perf_counter() - started)
+
+    def _report(self, request, response, recorder, seconds):
+        timing = (
+            f'sql;dur={recorder.seconds * 1000:.2f};desc="{recorder.count} queries", '
+            f'app;dur={seconds * 1000:.2f}'
+        )
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+        repeated = recorder.repeated(self.repeat_limit)
+        if recorder.count > self.budget or repeated:
+            match = getattr(request, 'resolver_match', None)
+            logger.warning(json.dumps({
+                'event': 'sql.query_budget' if recorder.count > self.budget else 'sql.repeated_queries',
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'queries': recorder.count,
+                'budget': self.budget,
+                'sql_ms': round(recorder.seconds * 1000, 2),
+                'repeated': [{'count': count, 'sql': shape[:300]} for shape, count in repeated[:5]],
+            }))
+        return response
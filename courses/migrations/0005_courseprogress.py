@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:27
+
+import django.db.models.deletion
+from django.conf import settings
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def populate_course_progress(apps, schema_editor):
+    Lesson = apps.get_model('courses', 'Lesson')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    UserProgress = apps.get_model('courses', 'UserProgress')
+    CourseProgress = apps.get_model('courses', 'CourseProgress')
+
+    slots, totals = {}, defaultdict(int)
+    for lesson_id, course_id in Lesson.objects.order_by('course_id', 'id').values_list('id', 'course_id'):
+        slots[lesson_id] = (course_id, totals[course_id])
+        totals[course_id] += 1
+
+    bits = defaultdict(int)
+    for student_id, course_id in Enrollment.objects.values_list('student_id', 'course_id'):
+        bits.setdefault((student_id, course_id), 0)
+    for user_id, lesson_id in UserProgress.objects.filter(completed=True).values_list('user_id', 'lesson_id'):
+        course_id, index = slots[lesson_id]
+        bits[(user_id, course_id)] |= 1 << index
+
+    CourseProgress.objects.bulk_create([
+        CourseProgress(
+            student_id=student_id,
+            course_id=course_id,
+            completed_count=bin(value).count('1'),
+            total_lessons=totals[course_id],
+            completed_lessons=value.to_bytes((value.bit_length() + 7) // 8, 'little'),
+        )
+        for (student_id, course_id), value in bits.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_enrollment_course_enrolled_students'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='completedquiz',
+            name='lesson',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completed_quizzes', to='courses.lesson'),
+        ),
+        migrations.AlterField(
+            model_name='completedquiz',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completed_quizzes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='created_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='created_courses', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='lesson',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lessons', to='courses.course'),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='lesson',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quizzes', to='courses.lesson'),
+        ),
+        migrations.AlterField(
+            model_name='userprogress',
+            name='lesson',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progresses', to='courses.lesson'),
+        ),
+        migrations.AlterField(
+            model_name='userprogress',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progresses', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='CourseProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('total_lessons', models.PositiveIntegerField(default=0)),
+                ('completed_lessons', models.BinaryField(default=b'')),
+                ('last_activity', models.DateTimeField(blank=True, null=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_summaries', to='courses.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_progresses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('student', 'course')},
+            },
+        ),
+        migrations.RunPython(populate_course_progress, migrations.RunPython.noop),
+    ]
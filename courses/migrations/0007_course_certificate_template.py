@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_certificate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='certificate_template',
+            field=models.CharField(choices=[('classic', 'Classic'), ('modern', 'Modern')], default='classic', max_length=30),
+        ),
+    ]
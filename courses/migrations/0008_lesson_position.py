@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+def number_lessons(apps, schema_editor):
+    Lesson = apps.get_model('courses', 'Lesson')
+    lessons, positions = [], {}
+    for lesson in Lesson.objects.order_by('course_id', 'id').only('id', 'course_id'):
+        positions[lesson.course_id] = positions.get(lesson.course_id, 0) + 1
+        lesson.position = positions[lesson.course_id]
+        lessons.append(lesson)
+    Lesson.objects.bulk_update(lessons, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_certificate_template'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='lesson',
+            options={'ordering': ['position', 'id']},
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['course', 'position'], name='courses_les_course__1e4253_idx'),
+        ),
+        migrations.RunPython(number_lessons, migrations.RunPython.noop),
+    ]
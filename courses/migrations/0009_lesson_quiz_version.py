@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_lesson_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='quiz_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
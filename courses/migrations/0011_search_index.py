@@ -0,0 +1,46 @@
+# Full-text search index for courses and lessons (SQLite FTS5 only)
+
+from django.db import migrations
+
+SEARCH_TABLE = 'courses_search_index'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Course = apps.get_model('courses', 'Course')
+    Lesson = apps.get_model('courses', 'Lesson')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "kind UNINDEXED, object_id UNINDEXED, course_id UNINDEXED, title, body, "
+            "tokenize = 'porter unicode61')"
+        )
+        insert = (
+            f"INSERT INTO {SEARCH_TABLE} (rowid, kind, object_id, course_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s, %s)"
+        )
+        cursor.executemany(insert, [
+            (c.id * 2 + 1, 'course', c.id, c.id, c.title, c.description) for c in Course.objects.all()
+        ])
+        cursor.executemany(insert, [
+            (l.id * 2, 'lesson', l.id, l.course_id, l.title, l.content) for l in Lesson.objects.all()
+        ])
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_quizattempt_quizanswer'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_completed_on(apps, schema_editor):
+    # The real completion time was never stored. Use the course's last
+    # activity when known, else the enrollment date, as the closest estimate.
+    UserProgress = apps.get_model('courses', 'UserProgress')
+    CourseProgress = apps.get_model('courses', 'CourseProgress')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    Lesson = apps.get_model('courses', 'Lesson')
+    course_id = Subquery(Lesson.objects.filter(id=OuterRef(OuterRef('lesson_id'))).values('course_id')[:1])
+    last_activity = CourseProgress.objects.filter(
+        student_id=OuterRef('user_id'), course_id=course_id
+    ).values('last_activity')[:1]
+    enrolled_on = Enrollment.objects.filter(
+        student_id=OuterRef('user_id'), course_id=course_id
+    ).values('enrolled_on')[:1]
+    UserProgress.objects.filter(completed=True, completed_on__isnull=True).update(
+        completed_on=Coalesce(Subquery(last_activity), Subquery(enrolled_on))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0011_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('enrollments', models.PositiveIntegerField(default=0)),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('passes', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveIntegerField(default=0)),
+                ('question_sum', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LessonDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('passes', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveIntegerField(default=0)),
+                ('question_sum', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True)),
+                ('processed_until', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='userprogress',
+            name='completed_on',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['enrolled_on'], name='courses_enr_enrolle_7d959e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['submitted_at'], name='courses_qui_submitt_fef754_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['completed_on'], name='courses_use_complet_d1e684_idx'),
+        ),
+        migrations.AddField(
+            model_name='coursedailystats',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='courses.course'),
+        ),
+        migrations.AddField(
+            model_name='lessondailystats',
+            name='course',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lesson_daily_stats', to='courses.course'),
+        ),
+        migrations.AddField(
+            model_name='lessondailystats',
+            name='lesson',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='courses.lesson'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='coursedailystats',
+            unique_together={('course', 'day')},
+        ),
+        migrations.AddIndex(
+            model_name='lessondailystats',
+            index=models.Index(fields=['course', 'day'], name='courses_les_course__acf005_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='lessondailystats',
+            unique_together={('lesson', 'day')},
+        ),
+        migrations.RunPython(backfill_completed_on, migrations.RunPython.noop),
+    ]
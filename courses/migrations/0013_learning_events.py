@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0012_analytics_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LearningEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('enrolled', 'Enrolled'), ('lesson_viewed', 'Lesson viewed'), ('quiz_submitted', 'Quiz submitted'), ('certificate_downloaded', 'Certificate downloaded')], max_length=30)),
+                ('course_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('lesson_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('occurred_at', models.DateTimeField()),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='learning_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'occurred_at'], name='courses_lea_user_id_1916a6_idx'), models.Index(fields=['course_id', 'occurred_at'], name='courses_lea_course__b345e1_idx'), models.Index(fields=['kind', 'occurred_at'], name='courses_lea_kind_7942cf_idx')],
+            },
+        ),
+    ]
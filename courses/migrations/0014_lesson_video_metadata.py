@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0013_learning_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='video_embed_url',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_id',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_provider',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_thumbnail_url',
+            field=models.URLField(blank=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0015_lesson_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='quiz_sample_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
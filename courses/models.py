@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings  # For referencing the custom user model
 
+from .certificate_engine import CERTIFICATE_TEMPLATE_CHOICES, DEFAULT_CERTIFICATE_TEMPLATE
+from .markup import FORMAT_CHOICES, MARKDOWN, render_content
+from .video import parse_video_url
+
 
 # ------------------------------
 # Course & Lesson Models
@@ -19,6 +23,22 @@ class Course(models.Model):
         related_name='enrolled_courses',
         blank=True
     )
+    certificate_template = models.CharField(
+        max_length=30,
+        choices=CERTIFICATE_TEMPLATE_CHOICES,
+        default=DEFAULT_CERTIFICATE_TEMPLATE
+    )
+    # Bumped when a lesson is added, renamed, removed or moved; keys the cached outline
+    outline_version = models.PositiveIntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # outline_version only moves through F() updates; a stale instance must not roll it back
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'outline_version'
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -32,7 +52,93 @@ class Lesson(models.Model):
     )
     title = models.CharField(max_length=100)
     content = models.TextField()
+    content_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default=MARKDOWN)
+    # Sanitized HTML compiled from content on save; see courses.markup
+    content_html = models.TextField(blank=True, editable=False)
     video_url = models.URLField(blank=True, null=True)
+    # Derived from video_url on save; see courses.video
+    video_provider = models.CharField(max_length=20, blank=True)
+    video_id = models.CharField(max_length=64, blank=True)
+    video_embed_url = models.URLField(blank=True)
+    video_thumbnail_url = models.URLField(blank=True)
+    # 1-based and contiguous within a course; see courses.navigation
+    position = models.PositiveIntegerField(default=0)
+    # Bumped whenever one of the lesson's quiz questions changes; see courses.grading
+    quiz_version = models.PositiveIntegerField(default=0)
+    # Question-bank mode: each attempt draws this many questions at random; 0 asks them all
+    quiz_sample_size = models.PositiveIntegerField(default=0)
+    # Keys the cached lesson-body fragment
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['position', 'id']
+        indexes = [
+            models.Index(fields=['course', 'position']),
+        ]
+
+    VIDEO_FIELDS = ['video_provider', 'video_id', 'video_embed_url', 'video_thumbnail_url']
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        lesson = super().from_db(db, field_names, values)
+        # Lets the post_save signals notice a lesson that moved to another course
+        lesson._loaded_course_id = lesson.__dict__.get('course_id')
+        return lesson
+
+    def refresh_video_metadata(self):
+        info = parse_video_url(self.video_url)
+        self.video_provider, self.video_id, self.video_embed_url, self.video_thumbnail_url = info or ('', '', '', '')
+
+    def compile_content(self):
+        self.content_html = render_content(self.content, self.content_format)
+
+    def refresh_derived_fields(self):
+        """Everything save() derives from the source fields; bulk_create callers must call this themselves."""
+        self.refresh_video_metadata()
+        self.compile_content()
+
+    def save(self, *args, **kwargs):
+        kwargs['update_fields'] = self._fields_to_save(kwargs.get('update_fields'))
+        if self._state.adding and not self.position:
+            self._insert_at_end(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+
+    def _fields_to_save(self, update_fields):
+        """Refresh the derived fields and return the update_fields to save them with."""
+        if update_fields is None:
+            self.refresh_derived_fields()
+            return None if self._state.adding else self._full_save_fields()
+        derived = self._refresh_derived_from(update_fields)
+        return list(update_fields) + [field for field in derived if field not in update_fields]
+
+    def _refresh_derived_from(self, update_fields):
+        """Refresh only what depends on ``update_fields``; returns the fields that changed with them."""
+        derived = ['updated_at']
+        if 'video_url' in update_fields:
+            self.refresh_video_metadata()
+            derived += self.VIDEO_FIELDS
+        if 'content' in update_fields or 'content_format' in update_fields:
+            self.compile_content()
+            derived.append('content_html')
+        return derived
+
+    def _full_save_fields(self):
+        # position and quiz_version only move through courses.navigation and F()
+        # updates; a full save of a stale instance must not roll them back
+        return [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key and field.name not in ('position', 'quiz_version')
+        ]
+
+    def _insert_at_end(self, *args, **kwargs):
+        with transaction.atomic():
+            # Lock the course row so two concurrent creates cannot both take the next
+            # slot (on SQLite the production profile's BEGIN IMMEDIATE serializes them)
+            Course.objects.select_for_update().filter(id=self.course_id).values_list('id').first()
+            last = Lesson.objects.filter(course_id=self.course_id).aggregate(last=models.Max('position'))['last']
+            self.position = (last or 0) + 1
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} ({self.course.title})"
@@ -53,9 +159,13 @@ class UserProgress(models.Model):
         related_name='progresses'
     )
     completed = models.BooleanField(default=False)
+    completed_on = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         unique_together = ('user', 'lesson')
+        indexes = [
+            models.Index(fields=['completed_on']),  # incremental analytics refresh
+        ]
 
     def __str__(self):
         status = "Completed" if self.completed else "Not Completed"
@@ -99,6 +209,59 @@ class CompletedQuiz(models.Model):
         return f"{self.user.username} - {self.lesson.title}"
 
 
+class QuizAttempt(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='quiz_attempts'
+    )
+    lesson = models.ForeignKey(
+        Lesson,
+        on_delete=models.CASCADE,
+        related_name='quiz_attempts'
+    )
+    score = models.PositiveIntegerField()
+    total = models.PositiveIntegerField()
+    submitted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # latest attempt per student per lesson
+            models.Index(fields=['user', 'lesson', '-submitted_at']),
+            # all attempts for a lesson (faculty reports)
+            models.Index(fields=['lesson', '-submitted_at']),
+            # incremental analytics refresh
+            models.Index(fields=['submitted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.lesson.title} ({self.score}/{self.total})"
+
+
+class QuizAnswer(models.Model):
+    attempt = models.ForeignKey(
+        QuizAttempt,
+        on_delete=models.CASCADE,
+        related_name='answers'
+    )
+    question = models.ForeignKey(
+        Quiz,
+        on_delete=models.SET_NULL,  # keep the history when a question is removed
+        related_name='answers',
+        null=True
+    )
+    selected = models.CharField(max_length=1, blank=True)
+    is_correct = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['question', 'is_correct']),
+        ]
+
+    def __str__(self):
+        return f"Attempt {self.attempt_id} - Q{self.question_id}: {self.selected or '-'}"
+
+
 # ------------------------------
 # Enrollment Model
 # ------------------------------
@@ -118,6 +281,189 @@ class Enrollment(models.Model):
     class Meta:
         unique_together = ('student', 'course')
         ordering = ['-enrolled_on']
+        indexes = [
+            models.Index(fields=['enrolled_on']),  # incremental analytics refresh
+        ]
 
     def __str__(self):
         return f"{self.student.username} → {self.course.title}"
+
+
+# ------------------------------
+# Denormalized Progress Summary
+# ------------------------------
+class CourseProgress(models.Model):
+    """
+    One row per (student, course) so progress reads are a single lookup.
+    Bit ``i`` of ``completed_lessons`` marks the i-th lesson of the course
+    ordered by id; rows are kept in sync by ``courses.summaries``.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='course_progresses'
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='progress_summaries'
+    )
+    completed_count = models.PositiveIntegerField(default=0)
+    total_lessons = models.PositiveIntegerField(default=0)
+    completed_lessons = models.BinaryField(default=b'')  # little-endian bitmap
+    last_activity = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('student', 'course')
+
+    @property
+    def progress_percent(self):
+        if not self.total_lessons:
+            return 0
+        return int((self.completed_count / self.total_lessons) * 100)
+
+    @property
+    def is_complete(self):
+        return self.total_lessons > 0 and self.completed_count >= self.total_lessons
+
+    def completed_lesson_ids(self, lesson_ids):
+        """Map the bitmap back onto the course's lesson ids (ordered by id)."""
+        bits = int.from_bytes(bytes(self.completed_lessons or b''), 'little')
+        return [lesson_id for index, lesson_id in enumerate(sorted(lesson_ids)) if bits >> index & 1]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.course.title} ({self.completed_count}/{self.total_lessons})"
+
+
+# ------------------------------
+# Certificates
+# ------------------------------
+class Certificate(models.Model):
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='certificates'
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='certificates'
+    )
+    issued_on = models.DateField()
+    cache_key = models.CharField(max_length=64, blank=True)  # sha256 of the rendered inputs
+
+    class Meta:
+        unique_together = ('student', 'course')
+
+    def __str__(self):
+        return f"{self.student.username} - {self.course.title} ({self.issued_on})"
+
+
+# ------------------------------
+# Analytics Rollups
+# ------------------------------
+class CourseDailyStats(models.Model):
+    """
+    Per-course daily totals maintained by ``courses.analytics.refresh_rollups``.
+    Scores are stored as sums so rows can be added to incrementally; the
+    average is ``score_sum / question_sum``.
+    """
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    day = models.DateField()
+    enrollments = models.PositiveIntegerField(default=0)
+    completions = models.PositiveIntegerField(default=0)  # lesson completions
+    attempts = models.PositiveIntegerField(default=0)
+    passes = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveIntegerField(default=0)
+    question_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('course', 'day')
+
+    def __str__(self):
+        return f"{self.course.title} {self.day}"
+
+
+class LessonDailyStats(models.Model):
+    lesson = models.ForeignKey(
+        Lesson,
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='lesson_daily_stats'
+    )
+    day = models.DateField()
+    completions = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    passes = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveIntegerField(default=0)
+    question_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('lesson', 'day')
+        indexes = [
+            models.Index(fields=['course', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.lesson.title} {self.day}"
+
+
+class RollupWatermark(models.Model):
+    """Rows of ``source`` with a timestamp before ``processed_until`` are in the rollups."""
+    source = models.CharField(max_length=50, unique=True)
+    processed_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.source} < {self.processed_until}"
+
+
+# ------------------------------
+# Learning Events
+# ------------------------------
+class LearningEvent(models.Model):
+    """
+    Append-only audit trail written in batches by ``courses.events``.
+    Course and lesson are kept as plain ids so history survives deletes;
+    ``occurred_at`` is when the event happened, not when it was flushed.
+    """
+    ENROLLED = 'enrolled'
+    LESSON_VIEWED = 'lesson_viewed'
+    QUIZ_SUBMITTED = 'quiz_submitted'
+    CERTIFICATE_DOWNLOADED = 'certificate_downloaded'
+    KIND_CHOICES = [
+        (ENROLLED, 'Enrolled'),
+        (LESSON_VIEWED, 'Lesson viewed'),
+        (QUIZ_SUBMITTED, 'Quiz submitted'),
+        (CERTIFICATE_DOWNLOADED, 'Certificate downloaded'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='learning_events'
+    )
+    course_id = models.PositiveIntegerField(blank=True, null=True)
+    lesson_id = models.PositiveIntegerField(blank=True, null=True)
+    data = models.JSONField(default=dict, blank=True)  # e.g. score / total for quiz submissions
+    occurred_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'occurred_at']),
+            models.Index(fields=['course_id', 'occurred_at']),
+            models.Index(fields=['kind', 'occurred_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} by {self.user_id} at {self.occurred_at}"
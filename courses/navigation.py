@@ -0,0 +1,94 @@
+# courses/navigation.py
+#
+# Lesson order within a course is the ``Lesson.position`` column, kept
+# 1-based and without gaps. That makes previous/next a lookup of
+# ``position ± 1`` on the (course, position) index instead of a scan.
+# Anything that changes the order bumps ``Course.outline_version``, which
+# keys the cached course outline.
+
+from django.db import transaction
+from django.db.models import F, Max
+
+from courses.models import Course, Lesson
+
+
+def lesson_neighbours(lesson):
+    """Return ``(previous_lesson, next_lesson)`` with a single indexed query."""
+    return _split_neighbours(lesson, _neighbours(lesson))
+
+
+async def alesson_neighbours(lesson):
+    return _split_neighbours(lesson, [neighbour async for neighbour in _neighbours(lesson)])
+
+
+def _neighbours(lesson):
+    return Lesson.objects.filter(
+        course_id=lesson.course_id, position__in=[lesson.position - 1, lesson.position + 1]
+    )
+
+
+def _split_neighbours(lesson, neighbours):
+    previous_lesson = next_lesson = None
+    for neighbour in neighbours:
+        if neighbour.position < lesson.position:
+            previous_lesson = neighbour
+        else:
+            next_lesson = neighbour
+    return previous_lesson, next_lesson
+
+
+def bump_outline_version(course_id):
+    Course.objects.filter(id=course_id).update(outline_version=F('outline_version') + 1)
+
+
+def close_gap(lesson):
+    """Shift the lessons after a deleted one up by one place."""
+    Lesson.objects.filter(course_id=lesson.course_id, position__gt=lesson.position).update(
+        position=F('position') - 1
+    )
+
+
+def lesson_changed_course(lesson, previous_course_id):
+    """Put a lesson moved to another course at the end of it and close the gap it left behind."""
+    with transaction.atomic():
+        old_position = Lesson.objects.filter(id=lesson.id).values_list('position', flat=True).first()
+        last = (
+            Lesson.objects.filter(course_id=lesson.course_id).exclude(id=lesson.id)
+            .aggregate(last=Max('position'))['last']
+        )
+        lesson.position = (last or 0) + 1
+        Lesson.objects.filter(id=lesson.id).update(position=lesson.position)
+        Lesson.objects.filter(course_id=previous_course_id, position__gt=old_position).update(
+            position=F('position') - 1
+        )
+        bump_outline_version(previous_course_id)
+        bump_outline_version(lesson.course_id)
+
+
+def move_lesson(lesson, offset):
+    """Swap the lesson with the one ``offset`` places away (-1 = up, 1 = down)."""
+    with transaction.atomic():
+        other = Lesson.objects.select_for_update().filter(
+            course_id=lesson.course_id, position=lesson.position + offset
+        ).first()
+        if other is None:
+            return False
+        other.position, lesson.position = lesson.position, other.position
+        Lesson.objects.bulk_update([lesson, other], ['position'])
+        bump_outline_version(lesson.course_id)
+    return True
+
+
+def reorder_lessons(course, lesson_ids):
+    """
+    Apply a full ordering for the course. ``lesson_ids`` must list every
+    lesson of the course exactly once; raises ValueError otherwise.
+    """
+    with transaction.atomic():
+        lessons = {lesson.id: lesson for lesson in Lesson.objects.select_for_update().filter(course=course)}
+        if sorted(lesson_ids) != sorted(lessons):
+            raise ValueError("The new order must contain every lesson of the course exactly once.")
+        for position, lesson_id in enumerate(lesson_ids, start=1):
+            lessons[lesson_id].position = position
+        Lesson.objects.bulk_update(lessons.values(), ['position'], batch_size=500)
+        bump_outline_version(course.id)
@@ -0,0 +1,206 @@
+# courses/packages.py
+#
+# Course packages: a JSON Lines stream (optionally gzip-compressed) used to
+# move courses, lessons and quizzes between environments. A package holds
+# one header line, then every course, then their lessons, then the quizzes.
+# Export streams rows with values().iterator(); import inserts them in
+# batches with bulk_create and maps the exported ids to the new ones, then
+# bumps the catalog version since bulk_create sends no save signals.
+
+import gzip
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from courses.markup import MARKDOWN
+from courses.models import Course, Lesson, Quiz
+from courses.page_cache import bump_catalog_version
+from courses.search import index_objects
+
+PACKAGE_VERSION = 1
+PACKAGE_CHUNK_SIZE = 2000
+
+COURSE_FIELDS = ['id', 'title', 'description', 'certificate_template', 'created_by__username']
+LESSON_FIELDS = ['id', 'course_id', 'title', 'content', 'content_format', 'video_url', 'position', 'quiz_sample_size']
+QUIZ_FIELDS = [
+    'id', 'lesson_id', 'question_text',
+    'option_a', 'option_b', 'option_c', 'option_d', 'correct_option',
+]
+# Fields an imported row cannot do without, per row type
+REQUIRED_FIELDS = {
+    'course': ['id', 'title', 'description'],
+    'lesson': ['id', 'course_id', 'title', 'content'],
+    'quiz': [field for field in QUIZ_FIELDS if field != 'id'],
+}
+
+
+class PackageError(Exception):
+    pass
+
+
+def open_package(path, mode):
+    """Open a package for text reading/writing; gzip is used for ``.gz`` paths or gzip content."""
+    if 'r' in mode:
+        with open(path, 'rb') as probe:
+            compressed = probe.read(2) == b'\x1f\x8b'
+    else:
+        compressed = str(path).endswith('.gz')
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return io.open(path, mode, encoding='utf-8')
+
+
+# ------------------------
+# Export
+# ------------------------
+def export_package(out, course_ids=None, chunk_size=PACKAGE_CHUNK_SIZE):
+    """Write a package for the given courses (all when None) to the text stream ``out``."""
+    courses = Course.objects.order_by('id')
+    lessons = Lesson.objects.order_by('id')
+    quizzes = Quiz.objects.order_by('id')
+    if course_ids is not None:
+        courses = courses.filter(id__in=course_ids)
+        lessons = lessons.filter(course_id__in=course_ids)
+        quizzes = quizzes.filter(lesson__course_id__in=course_ids)
+
+    counts = {'course': 0, 'lesson': 0, 'quiz': 0}
+    out.write(json.dumps({'type': 'package', 'version': PACKAGE_VERSION}) + '\n')
+    for kind, queryset, fields in (
+        ('course', courses, COURSE_FIELDS),
+        ('lesson', lessons, LESSON_FIELDS),
+        ('quiz', quizzes, QUIZ_FIELDS),
+    ):
+        for row in queryset.values(*fields).iterator(chunk_size=chunk_size):
+            if kind == 'course':
+                row['created_by'] = row.pop('created_by__username')
+            out.write(json.dumps({'type': kind, **row}, ensure_ascii=False) + '\n')
+            counts[kind] += 1
+    return counts
+
+
+# ------------------------
+# Import
+# ------------------------
+class _Importer:
+    def __init__(self, owner, batch_size):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.course_ids = {}
+        self.lesson_ids = {}
+        self.owner_ids = {}
+        self.pending = []
+        self.pending_kind = None
+        self.counts = {'course': 0, 'lesson': 0, 'quiz': 0, 'skipped': 0}
+
+    def add(self, row, line_number):
+        if not isinstance(row, dict):
+            raise PackageError(f"Line {line_number}: expected a JSON object.")
+        kind = row.pop('type', None)
+        if kind not in REQUIRED_FIELDS:
+            raise PackageError(f"Line {line_number}: unknown row type {kind!r}.")
+        missing = [field for field in REQUIRED_FIELDS[kind] if row.get(field) is None]
+        if missing:
+            raise PackageError(f"Line {line_number}: {kind} row is missing {', '.join(missing)}.")
+        if kind != self.pending_kind:
+            self.flush()
+            self.pending_kind = kind
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        rows, self.pending = self.pending, []
+        if rows:
+            getattr(self, f'_flush_{self.pending_kind}')(rows)
+
+    def _flush_course(self, rows):
+        usernames = {row.get('created_by') for row in rows} - set(self.owner_ids)
+        self.owner_ids.update(
+            get_user_model().objects.filter(username__in=usernames).values_list('username', 'id')
+        )
+        keep, objects = [], []
+        for row in rows:
+            owner_id = self.owner_ids.get(row.get('created_by')) or (self.owner.id if self.owner else None)
+            if owner_id is None:
+                self.counts['skipped'] += 1
+                continue
+            keep.append(row)
+            objects.append(Course(
+                title=row['title'],
+                description=row['description'],
+                certificate_template=row.get('certificate_template') or Course._meta.get_field('certificate_template').default,
+                created_by_id=owner_id,
+            ))
+        Course.objects.bulk_create(objects)
+        for row, course in zip(keep, objects):
+            self.course_ids[row['id']] = course.id
+        index_objects('course', objects)
+        self.counts['course'] += len(objects)
+
+    def _flush_lesson(self, rows):
+        keep, objects = [], []
+        for row in rows:
+            course_id = self.course_ids.get(row['course_id'])
+            if course_id is None:
+                self.counts['skipped'] += 1
+                continue
+            keep.append(row)
+            objects.append(Lesson(
+                course_id=course_id,
+                title=row['title'],
+                content=row['content'],
+                content_format=row.get('content_format', MARKDOWN),
+                video_url=row.get('video_url'),
+                position=row.get('position') or 0,
+                quiz_sample_size=row.get('quiz_sample_size') or 0,
+            ))
+            objects[-1].refresh_derived_fields()
+        Lesson.objects.bulk_create(objects)
+        for row, lesson in zip(keep, objects):
+            self.lesson_ids[row['id']] = lesson.id
+        index_objects('lesson', objects)
+        self.counts['lesson'] += len(objects)
+
+    def _flush_quiz(self, rows):
+        objects = []
+        for row in rows:
+            lesson_id = self.lesson_ids.get(row['lesson_id'])
+            if lesson_id is None:
+                self.counts['skipped'] += 1
+                continue
+            objects.append(Quiz(lesson_id=lesson_id, **{
+                field: row[field] for field in QUIZ_FIELDS if field not in ('id', 'lesson_id')
+            }))
+        Quiz.objects.bulk_create(objects)
+        self.counts['quiz'] += len(objects)
+
+
+def import_package(lines, owner=None, batch_size=PACKAGE_CHUNK_SIZE):
+    """
+    Import a package from an iterable of JSON lines inside one transaction.
+    Courses keep their creator when a user with that username exists, else
+    they are assigned to ``owner`` (rows without either are skipped).
+    Returns per-type counts.
+    """
+    importer = _Importer(owner, batch_size)
+    with transaction.atomic():
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise PackageError(f"Line {line_number}: invalid JSON ({exc})")
+            if line_number == 1:
+                if not isinstance(row, dict) or row.get('type') != 'package':
+                    raise PackageError("Missing package header line.")
+                if row.get('version') != PACKAGE_VERSION:
+                    raise PackageError(f"Unsupported package version {row.get('version')!r}.")
+                continue
+            importer.add(row, line_number)
+        importer.flush()
+    # bulk_create sends no save signals, so drop the cached catalog pages here
+    bump_catalog_version()
+    return importer.counts
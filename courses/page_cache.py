@@ -0,0 +1,153 @@
+# courses/page_cache.py
+#
+# Whole-page cache for anonymous visitors of the public catalog pages. Cache
+# keys include the catalog version, which Course/Lesson save and delete
+# signals bump, so an edit makes every cached page unreachable at once
+# instead of deleting keys one by one. Smaller template fragments (lesson
+# bodies, course outlines) are cached the same way under the version of the
+# object they show, for every visitor.
+
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.http import HttpResponse
+from django.utils.safestring import mark_safe
+
+CATALOG_VERSION_KEY = 'catalog:version'
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 300)
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600)
+
+
+def catalog_version():
+    # Seeded from the clock so a version lost to eviction never reuses old keys.
+    return cache.get_or_set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+async def acatalog_version():
+    return await cache.aget_or_set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def _count(name, outcome):
+    key = f'page-cache:{outcome}:{name}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+async def _acount(name, outcome):
+    key = f'page-cache:{outcome}:{name}'
+    await cache.aadd(key, 0, None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        pass
+
+
+def page_cache_stats(names):
+    """``{name: {'hits': n, 'misses': n}}`` for the given cached views."""
+    keys = [f'page-cache:{outcome}:{name}' for name in names for outcome in ('hits', 'misses')]
+    values = cache.get_many(keys)
+    return {
+        name: {
+            'hits': values.get(f'page-cache:hits:{name}', 0),
+            'misses': values.get(f'page-cache:misses:{name}', 0),
+        }
+        for name in names
+    }
+
+
+def _page_key(name, request, version):
+    path_hash = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+    return f'page:{name}:{version}:{path_hash}'
+
+
+def _cached_response(entry):
+    content, content_type = entry
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = 'HIT'
+    return response
+
+
+def _cache_entry(response):
+    """What to store for ``response``, or None when it must not be cached."""
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        return (response.content, response['Content-Type'])
+    return None
+
+
+def cache_anonymous_page(name):
+    """
+    Serve GET requests from anonymous users out of the cache. Only plain 200
+    responses that set no cookies are stored. Works for sync and async views.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                user = await request.auser()
+                if request.method != 'GET' or user.is_authenticated:
+                    return await view(request, *args, **kwargs)
+
+                key = _page_key(name, request, await acatalog_version())
+                cached = await cache.aget(key)
+                if cached is not None:
+                    await _acount(name, 'hits')
+                    return _cached_response(cached)
+
+                await _acount(name, 'misses')
+                response = await view(request, *args, **kwargs)
+                entry = _cache_entry(response)
+                if entry is not None:
+                    await cache.aset(key, entry, PAGE_CACHE_TIMEOUT)
+                response['X-Page-Cache'] = 'MISS'
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            key = _page_key(name, request, catalog_version())
+            cached = cache.get(key)
+            if cached is not None:
+                _count(name, 'hits')
+                return _cached_response(cached)
+
+            _count(name, 'misses')
+            response = view(request, *args, **kwargs)
+            entry = _cache_entry(response)
+            if entry is not None:
+                cache.set(key, entry, PAGE_CACHE_TIMEOUT)
+            response['X-Page-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+async def acached_fragment(name, vary_on, render):
+    """
+    The HTML fragment cached under ``name`` and ``vary_on`` (the same keys as
+    ``{% cache %}``), calling the async ``render()`` to build it on a miss.
+    Lets async views keep the queries behind a fragment out of the hit path.
+    """
+    key = make_template_fragment_key(name, vary_on)
+    fragment = await cache.aget(key)
+    if fragment is None:
+        fragment = await render()
+        await cache.aset(key, fragment, FRAGMENT_CACHE_TIMEOUT)
+    return mark_safe(fragment)
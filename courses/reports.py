@@ -0,0 +1,81 @@
+# courses/reports.py
+#
+# Student progress report built in a constant number of queries: one for the
+# enrollments (with their courses), one for the lessons of those courses and
+# one for the progress summaries. Everything else is assembled in memory.
+
+from collections import defaultdict
+
+from courses.models import Enrollment, Lesson
+from courses.summaries import aprogress_by_course, progress_by_course
+
+
+def build_progress_report(user):
+    enrollments = list(Enrollment.objects.filter(student=user).select_related('course'))
+    course_ids = [enrollment.course_id for enrollment in enrollments]
+    lessons = Lesson.objects.filter(course_id__in=course_ids).order_by('position', 'id')
+    return _assemble_report(enrollments, lessons, progress_by_course(user, course_ids))
+
+
+async def abuild_progress_report(user):
+    """Async version of ``build_progress_report``, with the same three queries."""
+    enrollments = [e async for e in Enrollment.objects.filter(student=user).select_related('course')]
+    course_ids = [enrollment.course_id for enrollment in enrollments]
+    lessons = [l async for l in Lesson.objects.filter(course_id__in=course_ids).order_by('position', 'id')]
+    return _assemble_report(enrollments, lessons, await aprogress_by_course(user, course_ids))
+
+
+def _assemble_report(enrollments, lessons, summaries):
+    lessons_by_course = defaultdict(list)
+    for lesson in lessons:
+        lessons_by_course[lesson.course_id].append(lesson)
+
+    report = []
+    for enrollment in enrollments:
+        course = enrollment.course
+        course_lessons = lessons_by_course[course.id]
+        summary = summaries.get(course.id)
+        completed_ids = set(summary.completed_lesson_ids([l.id for l in course_lessons])) if summary else set()
+
+        lesson_progress_list = []
+        for lesson in course_lessons:
+            completed = lesson.id in completed_ids
+            # Map 'completed' to both watched and completed in template
+            lesson_progress_list.append({
+                'lesson': lesson,
+                'watched': completed,    # we don’t have a separate watched field
+                'completed': completed,
+            })
+
+        report.append({
+            'course': course,
+            'total_lessons': len(course_lessons),
+            'completed_lessons': len(completed_ids),
+            'progress_percent': summary.progress_percent if summary else 0,
+            'course_completed': bool(summary and summary.is_complete),
+            'lesson_progress_list': lesson_progress_list,
+        })
+    return report
+
+
+def serialize_progress_report(report):
+    """Plain JSON-ready version of ``build_progress_report``."""
+    return [
+        {
+            'course': {'id': row['course'].id, 'title': row['course'].title},
+            'total_lessons': row['total_lessons'],
+            'completed_lessons': row['completed_lessons'],
+            'progress_percent': row['progress_percent'],
+            'course_completed': row['course_completed'],
+            'lessons': [
+                {
+                    'id': item['lesson'].id,
+                    'title': item['lesson'].title,
+                    'watched': item['watched'],
+                    'completed': item['completed'],
+                }
+                for item in row['lesson_progress_list']
+            ],
+        }
+        for row in report
+    ]
@@ -0,0 +1,165 @@
+# courses/search.py
+#
+# Learner-facing search over course titles/descriptions and lesson
+# titles/content, backed by an SQLite FTS5 table. Rows use a fixed rowid
+# (lessons even, courses odd) so signal-driven updates touch one row by key.
+# Other database backends fall back to a plain icontains lookup.
+
+from django.db import connection, transaction
+from django.utils.html import escape
+
+from courses.models import Course, Lesson
+
+SEARCH_TABLE = 'courses_search_index'
+
+CREATE_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "kind UNINDEXED, object_id UNINDEXED, course_id UNINDEXED, title, body, "
+    "tokenize = 'porter unicode61')"
+)
+
+# bm25 weights follow the column order: kind, object_id, course_id, title, body
+_BM25 = f"bm25({SEARCH_TABLE}, 0.0, 0.0, 0.0, 10.0, 1.0)"
+
+# Control characters mark the matches so the text can be escaped before
+# they are turned into <mark> tags.
+_OPEN, _CLOSE = '\x02', '\x03'
+
+
+def search_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def _rowid(kind, object_id):
+    return object_id * 2 + (1 if kind == 'course' else 0)
+
+
+def _highlight(text):
+    return escape(text).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+
+def fts_query(text):
+    """Turn free text into a safe FTS5 query: every word quoted, the last one as a prefix."""
+    terms = ['"{}"'.format(term.replace('"', '""')) for term in text.split()]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+# ------------------------
+# Index maintenance
+# ------------------------
+def _rows_for(kind, objects):
+    for obj in objects:
+        if kind == 'course':
+            yield (_rowid(kind, obj.id), kind, obj.id, obj.id, obj.title, obj.description)
+        else:
+            yield (_rowid(kind, obj.id), kind, obj.id, obj.course_id, obj.title, obj.content)
+
+
+def _write(rows):
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, kind, object_id, course_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            list(rows),
+        )
+
+
+def index_object(kind, obj):
+    index_objects(kind, [obj])
+
+
+def index_objects(kind, objects):
+    """Index objects created without signals, e.g. by bulk_create."""
+    if search_enabled() and objects:
+        _write(_rows_for(kind, objects))
+
+
+def unindex_object(kind, object_id):
+    if search_enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [_rowid(kind, object_id)])
+
+
+def rebuild_search_index(chunk_size=2000):
+    """Recreate the whole index from the Course and Lesson tables. Returns the row count."""
+    if not search_enabled():
+        return 0
+    written = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_SEARCH_TABLE)
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        for kind, queryset in (
+            ('course', Course.objects.only('id', 'title', 'description')),
+            ('lesson', Lesson.objects.only('id', 'course_id', 'title', 'content')),
+        ):
+            batch = []
+            for obj in queryset.order_by('id').iterator(chunk_size=chunk_size):
+                batch.append(obj)
+                if len(batch) >= chunk_size:
+                    _write(_rows_for(kind, batch))
+                    written += len(batch)
+                    batch = []
+            _write(_rows_for(kind, batch))
+            written += len(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    return written
+
+
+# ------------------------
+# Queries
+# ------------------------
+def search(text, limit=20):
+    """
+    Ranked matches for ``text`` as dicts with ``kind``, ``object_id``,
+    ``course_id``, ``course_title``, ``title`` and ``snippet`` (HTML with
+    <mark> around matched terms).
+    """
+    text = (text or '').strip()
+    if not text:
+        return []
+    if not search_enabled():
+        return _fallback_search(text, limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT kind, object_id, course_id, "
+            f"highlight({SEARCH_TABLE}, 3, %s, %s), "
+            f"snippet({SEARCH_TABLE}, 4, %s, %s, '…', 16) "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+            f"ORDER BY {_BM25} LIMIT %s",
+            [_OPEN, _CLOSE, _OPEN, _CLOSE, fts_query(text), limit],
+        )
+        rows = cursor.fetchall()
+
+    course_titles = dict(
+        Course.objects.filter(id__in={row[2] for row in rows}).values_list('id', 'title')
+    )
+    return [
+        {
+            'kind': kind,
+            'object_id': object_id,
+            'course_id': course_id,
+            'course_title': course_titles.get(course_id, ''),
+            'title': _highlight(title),
+            'snippet': _highlight(snippet),
+        }
+        for kind, object_id, course_id, title, snippet in rows
+    ]
+
+
+def _fallback_search(text, limit):
+    results = [
+        {'kind': 'course', 'object_id': c.id, 'course_id': c.id, 'course_title': c.title,
+         'title': escape(c.title), 'snippet': escape(c.description[:200])}
+        for c in Course.objects.filter(title__icontains=text)[:limit]
+    ]
+    results += [
+        {'kind': 'lesson', 'object_id': l.id, 'course_id': l.course_id, 'course_title': l.course.title,
+         'title': escape(l.title), 'snippet': escape(l.content[:200])}
+        for l in Lesson.objects.filter(title__icontains=text).select_related('course')[:limit - len(results)]
+    ]
+    return results
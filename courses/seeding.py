@@ -0,0 +1,215 @@
+# courses/seeding.py
+#
+# Synthetic dataset for benchmarks and local profiling. Everything is written
+# with bulk_create in fixed-size batches, so seeding 100k lessons costs a few
+# hundred INSERTs rather than one per row. Course popularity follows a Zipf
+# curve, the number of courses per student is log-normal, and progress is a
+# mix of students who never started, finished, or stopped part-way through.
+# Enrollments, completions and quiz attempts are spread over the last
+# SEED_HISTORY_DAYS days so the analytics rollups have a history to show.
+# Seeded users all have the ``seed-`` username prefix so they can be cleared.
+
+import math
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from courses.models import Course, CourseProgress, Enrollment, Lesson, Quiz, QuizAttempt, UserProgress
+from courses.page_cache import bump_catalog_version
+from courses.search import index_objects
+from courses.summaries import bitmap_from_indexes
+
+SEED_PREFIX = 'seed-'
+SEED_PASSWORD = 'seed-password'
+SEED_BATCH_SIZE = 2000
+SEED_HISTORY_DAYS = 90
+
+WORDS = (
+    'data', 'python', 'design', 'systems', 'networks', 'algebra', 'history', 'writing',
+    'biology', 'finance', 'statistics', 'web', 'security', 'cloud', 'music', 'ethics',
+)
+
+
+def _title(rng, words=3):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).title()
+
+
+def _bulk(model, objects, batch_size):
+    """bulk_create an iterable in batches; returns the created objects."""
+    created, batch = [], []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            created += model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        created += model.objects.bulk_create(batch)
+    return created
+
+
+def _completed_lessons(rng, lesson_count):
+    """How many lessons (a prefix in course order) an enrolled student has completed."""
+    roll = rng.random()
+    if roll < 0.25:
+        return 0
+    if roll < 0.45:
+        return lesson_count
+    return int(rng.betavariate(1.2, 2.0) * lesson_count)
+
+
+def seed_dataset(faculty=5, courses=50, lessons=10, quizzes=3, students=500,
+                 enrollments=4, seed=0, batch_size=SEED_BATCH_SIZE):
+    """
+    Create the synthetic dataset in one transaction. ``enrollments`` is the
+    mean number of courses per student. Returns counts per model.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    password = make_password(SEED_PASSWORD)  # hashed once, shared by every seeded user
+    start = User.objects.filter(username__startswith=SEED_PREFIX).count()
+
+    with transaction.atomic():
+        teachers = _bulk(User, (
+            User(username=f'{SEED_PREFIX}faculty-{start + i}', password=password, role='faculty')
+            for i in range(faculty)
+        ), batch_size)
+        learners = _bulk(User, (
+            User(username=f'{SEED_PREFIX}student-{start + faculty + i}', password=password, role='student')
+            for i in range(students)
+        ), batch_size)
+
+        course_objects = _bulk(Course, (
+            Course(title=f'{_title(rng)} {i}', description=_title(rng, 12), created_by=teachers[i % len(teachers)])
+            for i in range(courses)
+        ), batch_size) if teachers else []
+        index_objects('course', course_objects)
+
+        lesson_ids = {}
+        lesson_count = 0
+        per_chunk = max(1, batch_size // max(lessons, 1))  # courses whose lessons fit one batch
+        for chunk_start in range(0, len(course_objects), per_chunk):
+            chunk = course_objects[chunk_start:chunk_start + per_chunk]
+            batch = [
+                Lesson(course=course, title=f'Lesson {n}: {_title(rng, 2)}', content=_title(rng, 40),
+                       video_url=f'https://youtu.be/seed{course.id:05d}{n:03d}', position=n)
+                for course in chunk for n in range(1, lessons + 1)
+            ]
+            for lesson in batch:
+                lesson.refresh_derived_fields()
+            created = Lesson.objects.bulk_create(batch)
+            index_objects('lesson', created)
+            lesson_count += len(created)
+            for lesson in created:
+                lesson_ids.setdefault(lesson.course_id, []).append(lesson.id)
+
+            _bulk(Quiz, (
+                Quiz(
+                    lesson=lesson,
+                    question_text=f'Question {q} on {lesson.title}'[:255],
+                    option_a='Option A', option_b='Option B', option_c='Option C', option_d='Option D',
+                    correct_option=rng.choice('ABCD'),
+                )
+                for lesson in created for q in range(1, quizzes + 1)
+            ), batch_size)
+
+        counts = {
+            'faculty': len(teachers), 'students': len(learners), 'courses': len(course_objects),
+            'lessons': lesson_count, 'quizzes': lesson_count * quizzes,
+            'enrollments': 0, 'completions': 0, 'attempts': 0,
+        }
+        if course_objects and learners:
+            _seed_enrollments(rng, learners, course_objects, lesson_ids, quizzes, enrollments, batch_size, counts)
+
+    bump_catalog_version()
+    return counts
+
+
+def _seed_enrollments(rng, learners, course_objects, lesson_ids, quizzes, mean, batch_size, counts):
+    # Zipf popularity over a shuffled course order
+    ranked = list(course_objects)
+    rng.shuffle(ranked)
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(len(ranked))]
+    sigma = 0.75
+    mu = math.log(max(mean, 1)) - sigma ** 2 / 2
+    now = timezone.now()
+    history = SEED_HISTORY_DAYS * 86400
+
+    enrollments, completions, summaries, attempts = [], [], [], []
+
+    def backdated(model, rows, field):
+        # auto_now_add fields are overwritten on insert, so the historical
+        # timestamps are put back with a second, batched UPDATE.
+        when = [getattr(row, field) for row in rows]
+        created = model.objects.bulk_create(rows)
+        for row, value in zip(created, when):
+            setattr(row, field, value)
+        model.objects.bulk_update(created, [field], batch_size=500)
+
+    def flush():
+        backdated(Enrollment, enrollments, 'enrolled_on')
+        UserProgress.objects.bulk_create(completions)
+        CourseProgress.objects.bulk_create(summaries)
+        backdated(QuizAttempt, attempts, 'submitted_at')
+        counts['enrollments'] += len(enrollments)
+        counts['completions'] += len(completions)
+        counts['attempts'] += len(attempts)
+        for rows in (enrollments, completions, summaries, attempts):
+            rows.clear()
+
+    for student in learners:
+        wanted = min(len(ranked), max(1, round(rng.lognormvariate(mu, sigma))))
+        chosen = {}
+        for _ in range(wanted * 4):
+            course = rng.choices(ranked, weights)[0]
+            chosen[course.id] = course
+            if len(chosen) >= wanted:
+                break
+        skill = rng.betavariate(5, 2)  # chance of answering a question correctly
+
+        for course in chosen.values():
+            enrolled_on = now - timedelta(seconds=rng.uniform(0, history))
+            enrollment = Enrollment(student=student, course=course)
+            enrollment.enrolled_on = enrolled_on
+            enrollments.append(enrollment)
+
+            course_lessons = lesson_ids.get(course.id, [])
+            done = _completed_lessons(rng, len(course_lessons))
+            span = now - enrolled_on
+            for step, lesson_id in enumerate(course_lessons[:done], start=1):
+                completed_on = enrolled_on + span * (step / (done + 1))
+                completions.append(UserProgress(user=student, lesson_id=lesson_id, completed=True, completed_on=completed_on))
+                if quizzes:
+                    attempt = QuizAttempt(
+                        user=student, lesson_id=lesson_id, total=quizzes,
+                        score=sum(rng.random() < skill for _ in range(quizzes)),
+                    )
+                    attempt.submitted_at = completed_on
+                    attempts.append(attempt)
+            summaries.append(CourseProgress(
+                student=student,
+                course=course,
+                completed_count=done,
+                total_lessons=len(course_lessons),
+                completed_lessons=bitmap_from_indexes(range(done)),
+                last_activity=now if done else None,
+            ))
+        if len(completions) + len(enrollments) >= batch_size:
+            flush()
+    flush()
+
+
+def clear_seeded_data():
+    """Delete every seeded user together with their courses, enrollments and progress."""
+    User = get_user_model()
+    seeded = User.objects.filter(username__startswith=SEED_PREFIX)
+    courses = Course.objects.filter(created_by__in=seeded)
+    with transaction.atomic():
+        # Drop the summaries first so lesson deletes do not rebuild them one by one
+        CourseProgress.objects.filter(course__in=courses).delete()
+        deleted, _ = seeded.delete()
+    bump_catalog_version()
+    return deleted
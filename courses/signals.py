@@ -0,0 +1,108 @@
+# courses/signals.py
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from courses.grading import bump_quiz_version
+from courses.models import Course, CourseProgress, Lesson, Quiz, UserProgress
+from courses.navigation import bump_outline_version, close_gap, lesson_changed_course
+from courses.page_cache import bump_catalog_version
+from courses.search import index_object, unindex_object
+from courses.summaries import completion_removed, lesson_added, lesson_moved, lesson_removed
+
+
+# ------------------------
+# Progress summaries
+# ------------------------
+@receiver(post_save, sender=Lesson)
+def lesson_saved(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    if created:
+        lesson_added(instance)
+        return
+    previous_course_id = getattr(instance, '_loaded_course_id', None)
+    if previous_course_id is not None and previous_course_id != instance.course_id:
+        lesson_changed_course(instance, previous_course_id)
+        lesson_moved(instance, previous_course_id)
+    instance._loaded_course_id = instance.course_id
+
+
+@receiver(post_delete, sender=Lesson)
+def lesson_deleted(sender, instance, **kwargs):
+    lesson_removed(instance)
+    close_gap(instance)
+
+
+@receiver(post_save, sender=UserProgress)
+def progress_saved(sender, instance, created, **kwargs):
+    if not created and not instance.completed and not kwargs.get('raw'):
+        completion_removed(instance.user_id, instance.lesson_id)
+
+
+@receiver(post_delete, sender=UserProgress)
+def progress_deleted(sender, instance, origin=None, **kwargs):
+    # Cascades from lesson, course or user deletes are handled by their own receivers
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is UserProgress:
+        completion_removed(instance.user_id, instance.lesson_id)
+
+
+@receiver(pre_delete, sender=Course)
+def course_deleting(sender, instance, **kwargs):
+    # Drop the summaries up front so the cascading lesson deletes have nothing to re-derive.
+    CourseProgress.objects.filter(course=instance).delete()
+
+
+# ------------------------
+# Answer keys
+# ------------------------
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def quiz_changed(sender, instance, **kwargs):
+    bump_quiz_version(instance.lesson_id)
+
+
+# ------------------------
+# Search index
+# ------------------------
+@receiver(post_save, sender=Course)
+def course_indexed(sender, instance, **kwargs):
+    index_object('course', instance)
+
+
+@receiver(post_save, sender=Lesson)
+def lesson_indexed(sender, instance, **kwargs):
+    index_object('lesson', instance)
+
+
+@receiver(post_delete, sender=Course)
+def course_unindexed(sender, instance, **kwargs):
+    unindex_object('course', instance.id)
+
+
+@receiver(post_delete, sender=Lesson)
+def lesson_unindexed(sender, instance, **kwargs):
+    unindex_object('lesson', instance.id)
+
+
+# ------------------------
+# Course outline fragment
+# ------------------------
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def outline_changed(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        bump_outline_version(instance.course_id)
+
+
+# ------------------------
+# Catalog page cache
+# ------------------------
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def catalog_changed(sender, **kwargs):
+    bump_catalog_version()
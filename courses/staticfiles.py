@@ -0,0 +1,181 @@
+# courses/staticfiles.py
+#
+# Static files served by the app itself, so a plain WSGI server is enough in
+# production. collectstatic writes content-hashed copies plus a manifest
+# (ManifestStaticFilesStorage) and, next to every compressible file, .gz and
+# (when the optional brotli package is installed) .br variants compressed
+# once at the highest level. StaticFilesMiddleware indexes STATIC_ROOT at
+# startup and answers /static/ requests before any other middleware runs:
+# hashed names are cacheable forever, and each client gets the smallest
+# variant its Accept-Encoding allows.
+
+import gzip
+import mimetypes
+import os
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone still covers every browser
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico')
+COMPRESS_MIN_SIZE = getattr(settings, 'STATIC_COMPRESS_MIN_SIZE', 256)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_MAX_AGE = getattr(settings, 'STATIC_MAX_AGE', 60)  # for names without a content hash
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]  # in order of preference
+
+_HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.')
+
+
+# ------------------------
+# collectstatic
+# ------------------------
+def compress_file(path):
+    """Write ``path.gz`` (and ``path.br``) if they come out smaller. Returns the names written."""
+    with open(path, 'rb') as source:
+        data = source.read()
+    written = []
+    variants = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', lambda: brotli.compress(data, quality=11)))
+    for suffix, compress in variants:
+        compressed = compress()
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+            written.append(path + suffix)
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also precompresses every hashed file it writes."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = []
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed.append(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in dict.fromkeys(hashed):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS) and self.size(hashed_name) >= COMPRESS_MIN_SIZE:
+                for path in compress_file(self.path(hashed_name)):
+                    yield hashed_name, os.path.relpath(path, self.location), True
+
+
+# ------------------------
+# Serving
+# ------------------------
+class StaticFile:
+    def __init__(self, path, name):
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'image/svg+xml'):
+            self.content_type += '; charset=utf-8'
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if _HASHED_NAME.search(name) else f'public, max-age={STATIC_MAX_AGE}'
+        self.variants = {None: self._stat(path)}
+        for encoding, suffix in ENCODINGS:
+            if os.path.exists(path + suffix):
+                self.variants[encoding] = self._stat(path + suffix)
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)
+        return {'path': path, 'size': stat.st_size, 'mtime': stat.st_mtime, 'etag': f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'}
+
+    def choose(self, accept_encoding):
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding, _ in ENCODINGS:
+            if encoding in self.variants and encoding in accepted:
+                return encoding, self.variants[encoding]
+        return None, self.variants[None]
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def index_static_root(root):
+    """``{relative url path: StaticFile}`` for every file under ``root`` except the compressed variants."""
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(('.gz', '.br')) and os.path.exists(os.path.join(directory, name[:-3])):
+                continue
+            path = os.path.join(directory, name)
+            url = os.path.relpath(path, root).replace(os.sep, '/')
+            files[url] = StaticFile(path, url)
+    return files
+
+
+class StaticFilesMiddleware:
+    """
+    Serve collected files under STATIC_URL from STATIC_ROOT. Off unless
+    STATIC_SERVE is on (default: when DEBUG is off) and collectstatic has
+    run; in development runserver keeps serving files straight from the
+    finders. Restart after collectstatic to pick up new files.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        root = getattr(settings, 'STATIC_ROOT', None)
+        if not getattr(settings, 'STATIC_SERVE', not settings.DEBUG) or not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else f'/{settings.STATIC_URL}'
+        self.files = index_static_root(root)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self._serve(request) or await self.get_response(request)
+
+    def _serve(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path_info.startswith(self.prefix):
+            return None
+        static_file = self.files.get(request.path_info[len(self.prefix):])
+        if static_file is None:
+            return None
+
+        encoding, variant = static_file.choose(request.headers.get('Accept-Encoding', ''))
+        if variant['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(open(variant['path'], 'rb'), content_type=static_file.content_type)
+            response['Content-Length'] = variant['size']
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = variant['etag']
+        response['Last-Modified'] = http_date(variant['mtime'])
+        response['Cache-Control'] = static_file.cache_control
+        if len(static_file.variants) > 1:
+            response['Vary'] = 'Accept-Encoding'
+        return response
@@ -0,0 +1,254 @@
+# courses/summaries.py
+#
+# Maintenance of the denormalized CourseProgress rows. Every write that can
+# change a student's progress goes through here so reads stay a single
+# indexed lookup on (student, course). Signals cover lessons added, removed
+# or moved between courses and completions deleted or undone one by one;
+# bulk QuerySet.update()/bulk_create writes to Lesson or UserProgress skip
+# them, so run rebuild_progress (rebuild_course_progress) afterwards.
+
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from courses.models import Course, CourseProgress, Enrollment, Lesson, UserProgress
+
+
+# ------------------------
+# Bitmap helpers
+# ------------------------
+def bitmap_from_indexes(indexes):
+    value = 0
+    for index in indexes:
+        value |= 1 << index
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+
+def set_bit(bitmap, index):
+    value = int.from_bytes(bytes(bitmap or b''), 'little') | (1 << index)
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+
+def lesson_slot(lesson):
+    """Position of the lesson inside its course's bitmap (lessons ordered by id)."""
+    return Lesson.objects.filter(course_id=lesson.course_id, id__lt=lesson.id).count()
+
+
+# ------------------------
+# Reads
+# ------------------------
+def get_course_progress(user, course):
+    if not user.is_authenticated:
+        return None
+    course_id = getattr(course, 'id', course)
+    return CourseProgress.objects.filter(student=user, course_id=course_id).first()
+
+
+async def aget_course_progress(user, course):
+    if not user.is_authenticated:
+        return None
+    course_id = getattr(course, 'id', course)
+    return await CourseProgress.objects.filter(student=user, course_id=course_id).afirst()
+
+
+def progress_by_course(user, course_ids=None):
+    """All of a user's summaries keyed by course id, in one query."""
+    if not user.is_authenticated:
+        return {}
+    return {summary.course_id: summary for summary in _summaries(user, course_ids)}
+
+
+async def aprogress_by_course(user, course_ids=None):
+    if not user.is_authenticated:
+        return {}
+    return {summary.course_id: summary async for summary in _summaries(user, course_ids)}
+
+
+def course_completers(course):
+    """
+    Students who have finished the course: enrolled, with every lesson done.
+    An enrolled student has finished a course without lessons outright.
+    """
+    course_id = getattr(course, 'id', course)
+    finished = CourseProgress.objects.filter(
+        student=OuterRef('pk'), course_id=course_id, total_lessons__gt=0, completed_count__gte=F('total_lessons')
+    )
+    return (
+        get_user_model().objects
+        .filter(enrollments__course_id=course_id)
+        .filter(Exists(finished) | ~Exists(Lesson.objects.filter(course_id=course_id)))
+        .order_by('pk')
+    )
+
+
+def _summaries(user, course_ids):
+    summaries = CourseProgress.objects.filter(student=user)
+    if course_ids is not None:
+        summaries = summaries.filter(course_id__in=course_ids)
+    return summaries
+
+
+# ------------------------
+# Writes
+# ------------------------
+def _build_summary(student_id, course_id, lesson_ids=None, completed=None):
+    """Compute an unsaved summary from the UserProgress rows."""
+    if lesson_ids is None:
+        lesson_ids = list(
+            Lesson.objects.filter(course_id=course_id).order_by('id').values_list('id', flat=True)
+        )
+    if completed is None:
+        completed = UserProgress.objects.filter(
+            user_id=student_id, lesson__course_id=course_id, completed=True
+        ).values_list('lesson_id', flat=True)
+    slots = {lesson_id: index for index, lesson_id in enumerate(lesson_ids)}
+    indexes = [slots[lesson_id] for lesson_id in completed if lesson_id in slots]
+    return CourseProgress(
+        student_id=student_id,
+        course_id=course_id,
+        completed_count=len(indexes),
+        total_lessons=len(lesson_ids),
+        completed_lessons=bitmap_from_indexes(indexes),
+    )
+
+
+def _locked_summary(student_id, course_id):
+    summary = (
+        CourseProgress.objects.select_for_update()
+        .filter(student_id=student_id, course_id=course_id)
+        .first()
+    )
+    if summary is None:
+        try:
+            with transaction.atomic():
+                summary = _build_summary(student_id, course_id)
+                summary.save()
+        except IntegrityError:
+            # A concurrent first completion created the row (select_for_update is a no-op on SQLite)
+            summary = CourseProgress.objects.select_for_update().get(student_id=student_id, course_id=course_id)
+    return summary
+
+
+def record_lesson_completion(user, lesson):
+    """Mark a lesson completed and update the course summary atomically."""
+    with transaction.atomic():
+        now = timezone.now()
+        user_progress, created = UserProgress.objects.get_or_create(
+            user=user, lesson=lesson, defaults={'completed': True, 'completed_on': now}
+        )
+        newly_completed = created
+        if not created and not user_progress.completed:
+            user_progress.completed = True
+            user_progress.completed_on = now
+            user_progress.save(update_fields=['completed', 'completed_on'])
+            newly_completed = True
+
+        summary = _locked_summary(user.id, lesson.course_id)
+        index = lesson_slot(lesson)
+        already_set = int.from_bytes(bytes(summary.completed_lessons or b''), 'little') >> index & 1
+        if newly_completed and not already_set:
+            summary.completed_lessons = set_bit(summary.completed_lessons, index)
+            summary.completed_count += 1
+        summary.last_activity = now
+        summary.save()
+    return summary
+
+
+def lesson_added(lesson):
+    """A new lesson takes the last slot, so only the totals move."""
+    CourseProgress.objects.filter(course_id=lesson.course_id).update(
+        total_lessons=F('total_lessons') + 1
+    )
+
+
+def lesson_removed(lesson):
+    """Deleting a lesson shifts the slots after it, so re-derive the course's rows."""
+    return _refresh_course(lesson.course_id, create_missing=False)
+
+
+def lesson_moved(lesson, previous_course_id):
+    """A lesson moved to another course changes the slots and totals of both."""
+    return (
+        _refresh_course(previous_course_id, create_missing=False)
+        + _refresh_course(lesson.course_id, create_missing=False)
+    )
+
+
+def completion_removed(student_id, lesson_id):
+    """Re-derive one student's summary after a completion was deleted or undone."""
+    course_id = Lesson.objects.filter(id=lesson_id).values_list('course_id', flat=True).first()
+    if course_id is None:
+        return None
+    with transaction.atomic():
+        summary = (
+            CourseProgress.objects.select_for_update()
+            .filter(student_id=student_id, course_id=course_id)
+            .first()
+        )
+        if summary is None:
+            return None
+        fresh = _build_summary(student_id, course_id)
+        summary.completed_count = fresh.completed_count
+        summary.total_lessons = fresh.total_lessons
+        summary.completed_lessons = fresh.completed_lessons
+        summary.save(update_fields=['completed_count', 'total_lessons', 'completed_lessons'])
+    return summary
+
+
+def rebuild_course_progress(course_ids=None):
+    """
+    Recompute summaries for the given courses (all courses when None) from
+    Enrollment and UserProgress. Returns the number of summaries written.
+    """
+    courses = Course.objects.order_by('id')
+    if course_ids is not None:
+        courses = courses.filter(id__in=course_ids)
+    return sum(_refresh_course(course_id) for course_id in list(courses.values_list('id', flat=True)))
+
+
+def _refresh_course(course_id, create_missing=True):
+    with transaction.atomic():
+        existing = {
+            summary.student_id: summary
+            for summary in CourseProgress.objects.select_for_update().filter(course_id=course_id)
+        }
+        if not existing and not create_missing:
+            return 0
+
+        lesson_ids = list(
+            Lesson.objects.filter(course_id=course_id).order_by('id').values_list('id', flat=True)
+        )
+        completed_by_student = defaultdict(list)
+        for user_id, lesson_id in UserProgress.objects.filter(
+            lesson__course_id=course_id, completed=True
+        ).values_list('user_id', 'lesson_id'):
+            completed_by_student[user_id].append(lesson_id)
+
+        student_ids = set(existing)
+        if create_missing:
+            student_ids.update(completed_by_student)
+            student_ids.update(
+                Enrollment.objects.filter(course_id=course_id).values_list('student_id', flat=True)
+            )
+
+        to_create, to_update = [], []
+        for student_id in student_ids:
+            fresh = _build_summary(
+                student_id, course_id, lesson_ids, completed_by_student.get(student_id, [])
+            )
+            summary = existing.get(student_id)
+            if summary is None:
+                to_create.append(fresh)
+                continue
+            summary.completed_count = fresh.completed_count
+            summary.total_lessons = fresh.total_lessons
+            summary.completed_lessons = fresh.completed_lessons
+            to_update.append(summary)
+        CourseProgress.objects.bulk_create(to_create, batch_size=500)
+        CourseProgress.objects.bulk_update(
+            to_update, ['completed_count', 'total_lessons', 'completed_lessons'], batch_size=500
+        )
+    return len(to_create) + len(to_update)
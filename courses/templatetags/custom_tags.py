@@ -1,20 +1,19 @@
 from django import template
-import re
 from collections.abc import Iterable  # Needed for safe iterable check
 
+from courses.video import parse_video_url
+
 register = template.Library()
 
 @register.filter
 def youtube_embed(value):
     """
-    Extract the YouTube video ID and convert to embed URL.
-    Example: https://www.youtube.com/watch?v=abc123 -> https://www.youtube.com/embed/abc123
+    Embed URL for a video URL, for templates without a saved Lesson.
+    Lessons store theirs at save time (lesson.video_embed_url); see courses.video.
+    Example: https://youtu.be/abc123 -> https://www.youtube.com/embed/abc123
     """
-    match = re.search(r'v=([a-zA-Z0-9_-]+)', value)
-    if match:
-        video_id = match.group(1)
-        return f"https://www.youtube.com/embed/{video_id}"
-    return value
+    info = parse_video_url(value)
+    return info.embed_url if info else ''
 
 @register.filter
 def id_in_list(id_value, id_list):
@@ -25,3 +24,17 @@ def id_in_list(id_value, id_list):
     if isinstance(id_list, Iterable) and not isinstance(id_list, (str, bytes)):
         return id_value in id_list
     return False
+
+@register.simple_tag(takes_context=True)
+def page_query(context, param, cursor):
+    """
+    Query string for a pager link: the current GET parameters with ``param``
+    set to ``cursor``, so other pagers on the page keep their place. The
+    same pager's opposite cursor is dropped.
+    """
+    query = context['request'].GET.copy()
+    prefix = param.removesuffix('after').removesuffix('before')
+    query.pop(f'{prefix}after', None)
+    query.pop(f'{prefix}before', None)
+    query[param] = cursor
+    return f'?{query.urlencode()}'
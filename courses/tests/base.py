@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from courses.events import event_log
+from courses.models import Course, Lesson, Quiz
+
+# The manifest storage needs collectstatic output that a test run does not have
+PLAIN_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(STORAGES=PLAIN_STORAGES, PASSWORD_HASHERS=FAST_HASHERS)
+class CoursesTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Events still queued at exit would be flushed after the test database is gone
+        self.enterContext(event_log.disabled())
+        User = get_user_model()
+        self.teacher = User.objects.create_user('teacher', password='pw', role='faculty')
+        self.student = User.objects.create_user('student', password='pw', role='student')
+        self.course = Course.objects.create(title='Algebra', description='Numbers', created_by=self.teacher)
+
+    def add_lessons(self, count, course=None):
+        return [
+            Lesson.objects.create(course=course or self.course, title=f'Lesson {n}', content=f'Body {n}')
+            for n in range(1, count + 1)
+        ]
+
+    def add_questions(self, lesson, count, correct='A'):
+        return Quiz.objects.bulk_create([
+            Quiz(lesson=lesson, question_text=f'Question {n}', option_a='a', option_b='b',
+                 option_c='c', option_d='d', correct_option=correct)
+            for n in range(count)
+        ])
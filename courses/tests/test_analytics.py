@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
+from django.utils import timezone
+
+from courses.analytics import COURSE_COUNTERS, afaculty_analytics, refresh_rollups, reset_rollups
+from courses.grading import record_attempt
+from courses.models import Course, CourseDailyStats, Enrollment, LessonDailyStats, QuizAttempt
+from courses.summaries import record_lesson_completion
+from courses.tests.base import CoursesTestCase
+
+
+class RollupTests(CoursesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lesson, = self.add_lessons(1)
+        self.course.enrollments.create(student=self.student)
+        record_lesson_completion(self.student, self.lesson)
+        record_attempt(self.student, self.lesson, 3, 4, [])
+
+    def refresh(self):
+        return refresh_rollups(now=timezone.now() + timedelta(minutes=5))
+
+    def course_row(self):
+        """The course's totals over every day (a run may straddle midnight)."""
+        return CourseDailyStats.objects.filter(course=self.course).aggregate(
+            **{counter: Sum(counter) for counter in COURSE_COUNTERS}
+        )
+
+    def test_refresh_folds_new_rows_into_the_day(self):
+        stats = self.refresh()
+        self.assertEqual((stats['enrollments'], stats['completions'], stats['attempts']), (1, 1, 1))
+        self.assertEqual(self.course_row(), {
+            'enrollments': 1, 'completions': 1, 'attempts': 1, 'passes': 1, 'score_sum': 3, 'question_sum': 4,
+        })
+        self.assertEqual(LessonDailyStats.objects.get(lesson=self.lesson).course_id, self.course.id)
+
+    def test_later_refreshes_only_add_what_is_new(self):
+        self.refresh()
+        self.assertEqual(self.refresh()['enrollments'], 0)
+        other = get_user_model().objects.create_user('other', password='pw', role='student')
+        self.course.enrollments.create(student=other)
+        record_attempt(other, self.lesson, 1, 4, [])
+        # Recorded after the first run's watermark
+        later = timezone.now() + timedelta(minutes=8)
+        Enrollment.objects.filter(student=other).update(enrolled_on=later)
+        QuizAttempt.objects.filter(user=other).update(submitted_at=later)
+        refresh_rollups(now=later + timedelta(minutes=2))
+        row = self.course_row()
+        self.assertEqual((row['enrollments'], row['attempts'], row['passes']), (2, 2, 1))
+
+    def test_rows_inside_the_lag_wait_for_the_next_run(self):
+        self.assertEqual(refresh_rollups()['enrollments'], 0)
+        self.assertEqual(self.refresh()['enrollments'], 1)
+
+    def test_reset_rebuilds_from_scratch(self):
+        self.refresh()
+        reset_rollups()
+        self.refresh()
+        self.assertEqual(self.course_row()['enrollments'], 1)
+
+    def test_dashboard_reads_the_teachers_courses(self):
+        other_teacher = get_user_model().objects.create_user('other-teacher', password='pw', role='faculty')
+        Course.objects.create(title='Geometry', description='', created_by=other_teacher).enrollments.create(
+            student=self.student
+        )
+        self.refresh()
+        analytics = async_to_sync(afaculty_analytics)(self.teacher, days=7)
+        self.assertEqual(len(analytics['series']), 7)
+        self.assertEqual((analytics['period_enrollments'], analytics['period_completions']), (1, 1))
+        (course,) = analytics['courses']
+        self.assertEqual(course['course__title'], 'Algebra')
+        self.assertEqual((course['average_score'], course['pass_rate']), (75, 100))
+        self.assertEqual([lesson['width'] for lesson in analytics['funnels'][0]['lessons']], [100])
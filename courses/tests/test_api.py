@@ -0,0 +1,55 @@
+import re
+
+from django.urls import reverse
+
+from courses.models import Lesson
+from courses.summaries import record_lesson_completion
+from courses.tests.base import CoursesTestCase
+
+
+class ApiTests(CoursesTestCase):
+    def test_catalog_is_public(self):
+        lesson, = self.add_lessons(1)
+        self.assertEqual(self.client.get('/api/v1/courses/').status_code, 200)
+        self.assertEqual(self.client.get(f'/api/v1/courses/{self.course.id}/lessons/').status_code, 200)
+        self.assertEqual(self.client.get(f'/api/v1/lessons/{lesson.id}/').status_code, 401)
+        self.assertEqual(self.client.get('/api/v1/me/progress/').status_code, 401)
+
+    def test_cursor_pages_and_etag(self):
+        self.add_lessons(3)
+        url = f'/api/v1/courses/{self.course.id}/lessons/'
+        first = self.client.get(url, {'limit': 2})
+        second = self.client.get(url, {'limit': 2, 'cursor': first.json()['next']})
+        titles = [row['title'] for row in first.json()['data'] + second.json()['data']]
+        self.assertEqual(titles, ['Lesson 1', 'Lesson 2', 'Lesson 3'])
+        self.assertIsNone(second.json()['next'])
+
+        repeat = self.client.get(url, {'limit': 2}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(self.client.get(url, {'cursor': '!!'}).status_code, 400)
+
+    def test_fields_select_the_columns(self):
+        response = self.client.get('/api/v1/courses/', {'fields': 'id,teacher,lesson_count'})
+        self.assertEqual(response.json()['data'], [{'id': self.course.id, 'teacher': 'teacher', 'lesson_count': 0}])
+        response = self.client.get('/api/v1/courses/', {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['error'])
+
+    def test_progress_percent_is_a_whole_number(self):
+        first, *_ = self.add_lessons(3)
+        self.course.enrollments.create(student=self.student)
+        record_lesson_completion(self.student, first)
+        self.client.force_login(self.student)
+        (row,) = self.client.get('/api/v1/me/progress/').json()['data']
+        self.assertEqual((row['completed_count'], row['total_lessons'], row['percent']), (1, 3, 33))
+
+    def test_questions_hide_the_answer_and_bank_questions_outside_the_draw(self):
+        lesson, = self.add_lessons(1)
+        self.add_questions(lesson, 20)
+        Lesson.objects.filter(id=lesson.id).update(quiz_sample_size=5)
+        self.client.force_login(self.student)
+        quiz = self.client.get(reverse('courses:quiz', args=[lesson.id])).content.decode()
+        shown = {int(question_id) for question_id in re.findall(r'name="q(\d+)" value="A"', quiz)}
+        data = self.client.get(f'/api/v1/lessons/{lesson.id}/questions/').json()['data']
+        self.assertEqual({row['id'] for row in data}, shown)
+        self.assertNotIn('correct_option', data[0])
@@ -0,0 +1,45 @@
+from django.template import Context, Template
+from django.test import RequestFactory
+
+from courses.catalog import keyset_paginate, unenrolled_courses
+from courses.models import Course, Enrollment
+from courses.tests.base import CoursesTestCase
+
+
+class KeysetPaginationTests(CoursesTestCase):
+    def test_pages_forward_and_back(self):
+        for n in range(4):
+            Course.objects.create(title=f'Course {n}', description='', created_by=self.teacher)
+        queryset = Course.objects.all()
+        first = keyset_paginate(queryset, {}, per_page=2)
+        self.assertTrue(first.has_next)
+        self.assertFalse(first.has_previous)
+        second = keyset_paginate(queryset, {'after': str(first.next_cursor)}, per_page=2)
+        third = keyset_paginate(queryset, {'after': str(second.next_cursor)}, per_page=2)
+        self.assertFalse(third.has_next)
+        ids = [course.id for page in (first, second, third) for course in page]
+        self.assertEqual(ids, sorted(queryset.values_list('id', flat=True)))
+        back = keyset_paginate(queryset, {'before': str(second.previous_cursor)}, per_page=2)
+        self.assertEqual([course.id for course in back], [course.id for course in first])
+
+    def test_bad_cursor_starts_over(self):
+        page = keyset_paginate(Course.objects.all(), {'after': 'junk'}, per_page=2)
+        self.assertEqual([course.id for course in page], [self.course.id])
+
+    def test_links_keep_the_other_pagers_place(self):
+        request = RequestFactory().get('/', {'available_after': '7', 'after': '3', 'q': 'alg'})
+        Course.objects.create(title='Geometry', description='', created_by=self.teacher)
+        page = keyset_paginate(Course.objects.all(), {}, per_page=1, prefix='available_')
+        html = Template('{% load custom_tags %}{% page_query page.next_param page.next_cursor %}').render(
+            Context({'request': request, 'page': page})
+        )
+        self.assertEqual(html, f'?after=3&amp;q=alg&amp;available_after={self.course.id}')
+
+
+class UnenrolledCoursesTests(CoursesTestCase):
+    def test_own_courses_are_left_out_only_when_asked(self):
+        other = Course.objects.create(title='Geometry', description='', created_by=self.teacher)
+        Enrollment.objects.create(student=self.student, course=other)
+        self.assertEqual(list(unenrolled_courses(self.student)), [self.course])
+        self.assertEqual(list(unenrolled_courses(self.teacher)), [self.course, other])
+        self.assertEqual(list(unenrolled_courses(self.teacher, exclude_own=True)), [])
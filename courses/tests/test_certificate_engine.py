@@ -0,0 +1,35 @@
+import re
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from courses.certificate_engine import CERTIFICATE_TEMPLATES, get_certificate_template, render_certificate
+
+
+class CertificateEngineTests(SimpleTestCase):
+    def render(self, template='classic', student_name='Ada Lovelace', course_name='Algebra'):
+        return render_certificate(student_name, course_name, date(2024, 5, 1), template)
+
+    def test_xref_offsets_point_at_their_objects(self):
+        for key in CERTIFICATE_TEMPLATES:
+            pdf = self.render(key)
+            xref_at = int(re.search(rb'startxref\n(\d+)\n%%EOF\n$', pdf).group(1))
+            self.assertTrue(pdf[xref_at:].startswith(b'xref\n'))
+            entries = re.findall(rb'(\d{10}) 00000 n ', pdf[xref_at:])
+            for number, offset in enumerate(entries, start=1):
+                self.assertTrue(pdf[int(offset):].startswith(f'{number} 0 obj\n'.encode()), (key, number))
+
+    def test_fields_are_stamped_and_escaped(self):
+        pdf = self.render(student_name='A (B) \\ C', course_name='Café')
+        self.assertIn(rb'(A \(B\) \\ C) Tj', pdf)
+        self.assertIn('("Café") Tj'.encode('cp1252'), pdf)
+        self.assertIn(b'(Issued on May 01, 2024) Tj', pdf)
+
+    def test_only_the_variable_stream_differs(self):
+        first, second = self.render(student_name='Ada'), self.render(student_name='Grace')
+        prefix = get_certificate_template('classic')._prefix[0]
+        self.assertTrue(first.startswith(prefix) and second.startswith(prefix))
+        self.assertNotEqual(first, second)
+
+    def test_unknown_template_falls_back_to_the_default(self):
+        self.assertEqual(self.render('missing'), self.render('classic'))
@@ -0,0 +1,141 @@
+import io
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from django.contrib.auth import get_user_model
+
+from courses.certificates import cached_certificate, certificate_path, issue_certificate, stream_cohort_zip
+from courses.models import Certificate
+from courses.summaries import course_completers, record_lesson_completion
+from courses.tests.base import CoursesTestCase
+from courses.utils import has_completed_course
+
+
+class CourseCompletionTests(CoursesTestCase):
+    def test_course_without_lessons_needs_an_enrollment(self):
+        self.assertFalse(has_completed_course(self.student, self.course))
+        self.assertFalse(has_completed_course(self.teacher, self.course))
+        self.course.enrollments.create(student=self.student)
+        self.assertTrue(has_completed_course(self.student, self.course))
+        self.assertEqual(list(course_completers(self.course)), [self.student])
+
+    def test_every_lesson_must_be_done(self):
+        self.course.enrollments.create(student=self.student)
+        first, second = self.add_lessons(2)
+        self.assertFalse(has_completed_course(self.student, self.course))
+        record_lesson_completion(self.student, first)
+        self.assertFalse(has_completed_course(self.student, self.course))
+        record_lesson_completion(self.student, second)
+        self.assertTrue(has_completed_course(self.student, self.course))
+        self.assertEqual(list(course_completers(self.course)), [self.student])
+
+
+class CertificateTestCase(CoursesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.enterContext(override_settings(CERTIFICATE_CACHE_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+        self.course.enrollments.create(student=self.student)
+        (self.lesson,) = self.add_lessons(1)
+        record_lesson_completion(self.student, self.lesson)
+
+
+class CachedCertificateTests(CertificateTestCase):
+    def cached(self, name='Student'):
+        certificate = Certificate.objects.get(pk=issue_certificate(self.student, self.course).pk)
+        certificate_file, cache_key = cached_certificate(
+            certificate, name, self.course.title, self.course.certificate_template
+        )
+        with certificate_file:
+            return certificate_file.read(), cache_key
+
+    def test_renders_once_and_reuses_the_file(self):
+        pdf, cache_key = self.cached()
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        self.assertTrue(certificate_path(cache_key).exists())
+        with mock.patch('courses.certificates.render_certificate') as render:
+            self.assertEqual(self.cached(), (pdf, cache_key))
+        render.assert_not_called()
+
+    def test_new_inputs_rekey_and_drop_the_stale_file(self):
+        _, old_key = self.cached()
+        _, new_key = self.cached(name='Someone Else')
+        self.assertNotEqual(old_key, new_key)
+        self.assertFalse(certificate_path(old_key).exists())
+        self.assertEqual(Certificate.objects.get(student=self.student).cache_key, new_key)
+
+    def test_missing_file_is_rendered_again(self):
+        pdf, cache_key = self.cached()
+        certificate_path(cache_key).unlink()
+        self.assertEqual(self.cached(), (pdf, cache_key))
+        self.assertTrue(certificate_path(cache_key).exists())
+
+
+class DownloadCertificateTests(CertificateTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('courses:download_certificate', args=[self.course.id])
+        self.client.force_login(self.student)
+
+    def test_download_sends_an_etag_and_honours_if_none_match(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_renamed_student_gets_a_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.student.first_name = 'Ada'
+        self.student.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response.close()
+
+    def test_unfinished_course_is_refused(self):
+        self.add_lessons(1)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class CohortZipTests(CertificateTestCase):
+    def setUp(self):
+        super().setUp()
+        # Enrolled but not finished, so left out of the archive
+        other = get_user_model().objects.create_user('other', password='pw', role='student')
+        self.course.enrollments.create(student=other)
+
+    def archive(self, stats=None):
+        data = b''.join(stream_cohort_zip(self.course, workers=1, stats=stats))
+        return zipfile.ZipFile(io.BytesIO(data))
+
+    def test_archive_holds_each_completers_certificate(self):
+        stats = {}
+        archive = self.archive(stats)
+        self.assertEqual((stats['count'], stats['rendered']), (1, 1))
+        self.assertEqual(archive.namelist(), ['student_certificate.pdf'])
+        self.assertTrue(archive.read('student_certificate.pdf').startswith(b'%PDF'))
+        cache_key = Certificate.objects.get(student=self.student, course=self.course).cache_key
+        self.assertTrue(certificate_path(cache_key).exists())
+
+    def test_cached_certificates_are_not_rendered_again(self):
+        self.archive()
+        stats = {}
+        with mock.patch('courses.certificates.render_certificate') as render:
+            self.archive(stats)
+        render.assert_not_called()
+        self.assertEqual((stats['count'], stats['rendered']), (1, 0))
+
+    def test_only_the_teacher_can_download_the_archive(self):
+        url = reverse('courses:course_certificates', args=[self.course.id])
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.teacher)
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), ['student_certificate.pdf'])
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.db import OperationalError, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from courses.db import is_lock_error, retry_on_lock
+
+
+def flaky(failures, message='database is locked'):
+    """A function failing with ``message`` ``failures`` times before it returns 'done'."""
+    calls = []
+
+    @retry_on_lock
+    def write():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise OperationalError(message)
+        return 'done'
+    return write, calls
+
+
+@override_settings(DB_LOCK_RETRIES=2, DB_LOCK_RETRY_DELAY=0.01)
+class RetryOnLockTests(SimpleTestCase):
+    def setUp(self):
+        self.sleep = self.enterContext(mock.patch('courses.db.time.sleep'))
+
+    def test_lock_errors_are_retried_with_growing_delays(self):
+        write, calls = flaky(2)
+        self.assertEqual(write(), 'done')
+        self.assertEqual(len(calls), 3)
+        first, second = (call.args[0] for call in self.sleep.call_args_list)
+        self.assertTrue(0.005 <= first <= 0.015 and 0.01 <= second <= 0.03)
+
+    def test_gives_up_after_the_configured_retries(self):
+        write, calls = flaky(3)
+        with self.assertRaisesMessage(OperationalError, 'database is locked'):
+            write()
+        self.assertEqual(len(calls), 3)
+
+    def test_other_errors_are_not_retried(self):
+        write, calls = flaky(1, message='no such table: courses_course')
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(is_lock_error(OperationalError('no such table: courses_course')))
+
+
+@override_settings(DB_LOCK_RETRIES=2, DB_LOCK_RETRY_DELAY=0)
+class RetryInsideTransactionTests(TestCase):
+    def test_calls_inside_an_outer_transaction_are_not_retried(self):
+        write, calls = flaky(1)
+        with transaction.atomic(), self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,72 @@
+import io
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+
+from courses.enrollment_import import import_enrollments
+from courses.models import Course, Enrollment
+from courses.tests.base import CoursesTestCase
+
+
+class EnrollmentImportTests(CoursesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = get_user_model().objects.create_user('other', password='pw', role='student')
+
+    def test_rows_are_counted_by_outcome(self):
+        lines = [
+            'username,course_id\n',
+            f'student,{self.course.id}\n',
+            f'student,{self.course.id}\n',
+            f'teacher,{self.course.id}\n',
+            'other,9999\n',
+            'broken\n',
+            '\n',
+            f'other,{self.course.id}\n',
+        ]
+        stats = import_enrollments(lines, chunk_size=2)
+        expected = {'rows': 6, 'enrolled': 2, 'duplicates': 1, 'unknown_students': 1, 'unknown_courses': 1, 'invalid': 1}
+        self.assertEqual({key: stats[key] for key in expected}, expected)
+        self.assertEqual(
+            set(Enrollment.objects.values_list('student__username', flat=True)), {'student', 'other'}
+        )
+
+    def test_already_enrolled_students_are_skipped(self):
+        self.course.enrollments.create(student=self.student)
+        stats = import_enrollments([f'student,{self.course.id}\n', f'other,{self.course.id}\n'])
+        self.assertEqual((stats['enrolled'], stats['duplicates']), (1, 1))
+
+    def test_other_teachers_courses_are_refused(self):
+        mine = Course.objects.create(title='Geometry', description='', created_by=self.teacher)
+        stats = import_enrollments(
+            [f'student,{self.course.id}\n', f'student,{mine.id}\n'], allowed_course_ids=[mine.id]
+        )
+        self.assertEqual((stats['enrolled'], stats['unknown_courses']), (1, 1))
+
+    def test_view_imports_into_the_teachers_courses(self):
+        self.client.force_login(self.teacher)
+        upload = SimpleUploadedFile('students.csv', f'\ufeffstudent,{self.course.id}\n'.encode('utf-8'))
+        response = self.client.post(reverse('courses:import_enrollments'), {'csv_file': upload})
+        self.assertEqual(response.context['stats']['enrolled'], 1)
+        self.assertTrue(Enrollment.objects.filter(student=self.student, course=self.course).exists())
+
+    def test_view_reports_a_file_that_is_not_utf8(self):
+        self.client.force_login(self.teacher)
+        upload = SimpleUploadedFile('students.csv', 'José,1\n'.encode('latin-1'))
+        response = self.client.post(reverse('courses:import_enrollments'), {'csv_file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('not UTF-8', response.context['form'].errors['csv_file'][0])
+
+    def test_students_cannot_import(self):
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(reverse('courses:import_enrollments')).status_code, 403)
+
+    def test_command_rejects_a_file_that_is_not_utf8(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'students.csv'
+        path.write_bytes('José,1\n'.encode('latin-1'))
+        with self.assertRaisesMessage(CommandError, 'Could not read'):
+            call_command('import_enrollments', str(path), stdout=io.StringIO())
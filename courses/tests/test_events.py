@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+
+from courses.events import EventLog, event_counts, events
+from courses.models import LearningEvent
+from courses.tests.base import CoursesTestCase
+
+
+class EventLogTests(CoursesTestCase):
+    def make_log(self, **options):
+        log = EventLog(**{'batch_size': 3, **options})
+        log.enabled = True
+        return log
+
+    def test_commands_and_tests_flush_inline_when_a_batch_fills(self):
+        log = self.make_log()
+        log.record(LearningEvent.ENROLLED, self.student, course=self.course)
+        log.record(LearningEvent.LESSON_VIEWED, self.student, course=self.course, lesson=7)
+        self.assertFalse(LearningEvent.objects.exists())
+        log.record(LearningEvent.QUIZ_SUBMITTED, self.student, course=self.course, lesson=7, score=2, total=3)
+        self.assertIsNone(log._thread)
+        self.assertEqual(LearningEvent.objects.count(), 3)
+        self.assertEqual(events(kind=LearningEvent.QUIZ_SUBMITTED).get().data, {'score': 2, 'total': 3})
+        self.assertEqual(event_counts(user=self.student, lesson=7),
+                         {LearningEvent.LESSON_VIEWED: 1, LearningEvent.QUIZ_SUBMITTED: 1})
+
+    def test_shutdown_flushes_what_is_left(self):
+        log = self.make_log()
+        log.record(LearningEvent.ENROLLED, self.student, course=self.course)
+        log.shutdown()
+        self.assertEqual(log.stats()['flushed'], 1)
+        self.assertEqual(LearningEvent.objects.get().user_id, self.student.id)
+
+    def test_full_queue_drops_events(self):
+        log = self.make_log(maxsize=1, batch_size=10)
+        self.assertTrue(log.record(LearningEvent.ENROLLED, self.student))
+        self.assertFalse(log.record(LearningEvent.ENROLLED, self.student))
+        self.assertEqual((log.stats()['recorded'], log.stats()['dropped']), (1, 1))
+
+    def test_disabled_log_records_nothing(self):
+        log = self.make_log()
+        with log.disabled():
+            self.assertFalse(log.record(LearningEvent.ENROLLED, self.student))
+        self.assertEqual(log.stats()['depth'], 0)
+
+
+class EventLogWriteTests(TransactionTestCase):
+    # Foreign keys are only checked on commit, which TestCase never reaches
+
+    def test_event_of_a_deleted_user_does_not_sink_its_batch(self):
+        log = EventLog(batch_size=10)
+        log.enabled = True
+        student, other = (get_user_model().objects.create(username=name) for name in ('student', 'other'))
+        log.record(LearningEvent.ENROLLED, student, course=1)
+        log.record(LearningEvent.ENROLLED, other, course=1)
+        other.delete()
+        self.assertEqual(log.flush(), 2)
+        self.assertEqual(set(LearningEvent.objects.values_list('user_id', flat=True)), {student.id, None})
+        self.assertEqual(log.stats()['failed'], 0)
@@ -0,0 +1,101 @@
+import re
+
+from django.urls import reverse
+
+from courses.grading import answer_key, draw_questions, grade_submission, pinned_draw
+from courses.models import Lesson, Quiz, QuizAnswer, QuizAttempt
+from courses.tests.base import CoursesTestCase
+
+
+class GradingTests(CoursesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lesson, = self.add_lessons(1)
+        self.questions = self.add_questions(self.lesson, 4)
+
+    def test_grades_every_question_by_default(self):
+        answers = {f'q{self.questions[0].id}': 'A', f'q{self.questions[1].id}': 'B'}
+        score, total, results = grade_submission(self.lesson, answers)
+        self.assertEqual((score, total), (1, 4))
+        self.assertEqual([row['question_id'] for row in results], [q.id for q in self.questions])
+
+    def test_answer_key_follows_question_edits(self):
+        self.assertEqual(answer_key(self.lesson)[1], 'AAAA')
+        question = self.questions[0]
+        question.correct_option = 'C'
+        question.save()
+        self.lesson.refresh_from_db()
+        self.assertEqual(answer_key(self.lesson)[1], 'CAAA')
+
+    def test_cached_key_grades_without_queries(self):
+        answer_key(self.lesson)
+        with self.assertNumQueries(0):
+            score, total, _ = grade_submission(self.lesson, {f'q{q.id}': 'A' for q in self.questions})
+        self.assertEqual((score, total), (4, 4))
+
+    def test_deleted_question_drops_out_of_the_key(self):
+        self.questions[1].delete()
+        self.lesson.refresh_from_db()
+        self.assertEqual(answer_key(self.lesson)[0], tuple(q.id for q in self.questions if q.pk))
+
+    def test_grades_only_the_drawn_questions(self):
+        drawn = [self.questions[2].id, self.questions[0].id]
+        answers = {f'q{q.id}': 'A' for q in self.questions}
+        score, total, results = grade_submission(self.lesson, answers, drawn)
+        self.assertEqual((score, total), (2, 2))
+        self.assertEqual([row['question_id'] for row in results], drawn)
+
+    def test_draws_are_distinct_and_bounded(self):
+        drawn = draw_questions(self.lesson, 3)
+        self.assertEqual(len(set(drawn)), 3)
+        self.assertTrue(set(drawn) <= {q.id for q in self.questions})
+        self.assertEqual(len(draw_questions(self.lesson, 10)), 4)
+
+    def test_cached_bank_draws_without_queries(self):
+        draw_questions(self.lesson, 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(draw_questions(self.lesson, 2)), 2)
+
+    def test_pinned_draw_is_kept_until_the_questions_change(self):
+        self.lesson.quiz_sample_size = 2
+        session = {}
+        drawn = pinned_draw(session, self.lesson)
+        self.assertEqual(pinned_draw(session, self.lesson), drawn)
+        self.lesson.quiz_version += 1
+        self.assertEqual(len(pinned_draw(session, self.lesson)), 2)
+        self.assertEqual(session[f'quiz-draw:{self.lesson.id}']['version'], self.lesson.quiz_version)
+
+
+class QuestionBankViewTests(CoursesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lesson, = self.add_lessons(1)
+        self.add_questions(self.lesson, 20)
+        Lesson.objects.filter(id=self.lesson.id).update(quiz_sample_size=5)
+        self.client.force_login(self.student)
+
+    def shown_questions(self):
+        response = self.client.get(reverse('courses:quiz', args=[self.lesson.id]))
+        return [int(i) for i in re.findall(r'name="q(\d+)" value="A"', response.content.decode())]
+
+    def test_submit_grades_exactly_the_draw(self):
+        shown = self.shown_questions()
+        self.assertEqual(len(shown), 5)
+        self.assertEqual(self.shown_questions(), shown)
+
+        other = Quiz.objects.filter(lesson=self.lesson).exclude(id__in=shown).first()
+        answers = {f'q{question_id}': 'A' for question_id in shown[:3]}
+        answers[f'q{other.id}'] = 'A'
+        self.client.post(reverse('courses:quiz-submit', args=[self.lesson.id]), answers)
+
+        attempt = QuizAttempt.objects.get(user=self.student, lesson=self.lesson)
+        self.assertEqual((attempt.score, attempt.total), (3, 5))
+        self.assertEqual(
+            sorted(QuizAnswer.objects.filter(attempt=attempt).values_list('question_id', flat=True)), sorted(shown)
+        )
+        self.assertNotIn(f'quiz-draw:{self.lesson.id}', self.client.session)
+
+    def test_submit_without_a_draw_goes_back_to_the_quiz(self):
+        response = self.client.post(reverse('courses:quiz-submit', args=[self.lesson.id]), {})
+        self.assertRedirects(response, reverse('courses:quiz', args=[self.lesson.id]))
+        self.assertFalse(QuizAttempt.objects.exists())
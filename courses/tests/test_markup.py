@@ -0,0 +1,75 @@
+import io
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from courses.markup import HTML, MARKDOWN, render_content, sanitize_html
+from courses.models import Lesson
+from courses.tests.base import CoursesTestCase
+
+
+class MarkupTests(SimpleTestCase):
+    def test_markdown(self):
+        html = render_content('# Title\n\nSome **bold** and `<code>`\n\n- one\n- two', MARKDOWN)
+        self.assertIn('<h1>Title</h1>', html)
+        self.assertIn('<strong>bold</strong>', html)
+        self.assertIn('<code>&lt;code&gt;</code>', html)
+        self.assertIn('<ul><li>one</li><li>two</li></ul>', html)
+
+    def test_sanitizer_drops_scripts_handlers_and_bad_urls(self):
+        html = sanitize_html(
+            '<p onclick="x()">hi<script>alert(1)</script></p>'
+            '<a href="java\nscript:alert(1)">a</a><img src="https://x/y.png" onerror="z">'
+        )
+        self.assertEqual(html, '<p>hi</p><a rel="nofollow noopener">a</a><img src="https://x/y.png">')
+
+    def test_markdown_links_are_sanitized(self):
+        html = render_content('[bad](javascript:alert(1)) [ok](https://en.wikipedia.org/wiki/A_(b))')
+        self.assertNotIn('javascript', html)
+        self.assertIn('href="https://en.wikipedia.org/wiki/A_(b)"', html)
+
+    def test_unclosed_tags_are_closed(self):
+        self.assertEqual(render_content('<div><em>open', HTML), '<div><em>open</em></div>')
+
+
+class LessonContentTests(CoursesTestCase):
+    def test_content_html_follows_saves(self):
+        lesson, = self.add_lessons(1)
+        lesson.content = 'Now *emphasised*'
+        lesson.save(update_fields=['content'])
+        self.assertEqual(Lesson.objects.get(id=lesson.id).content_html, '<p>Now <em>emphasised</em></p>')
+
+    def test_lesson_page_shows_fresh_content(self):
+        lesson, = self.add_lessons(1)
+        self.client.force_login(self.student)
+        url = reverse('courses:lesson-detail', args=[lesson.id])
+        self.assertContains(self.client.get(url), '<p>Body 1</p>')
+        lesson.content = 'Edited'
+        lesson.save()
+        self.assertContains(self.client.get(url), '<p>Edited</p>')
+
+    def test_compile_command_fills_stale_content(self):
+        lesson, = self.add_lessons(1)
+        Lesson.objects.filter(id=lesson.id).update(content_html='')
+        out = io.StringIO()
+        call_command('compile_lesson_content', stdout=out)
+        self.assertIn('Checked 1 lessons, recompiled 1', out.getvalue())
+        self.assertEqual(Lesson.objects.get(id=lesson.id).content_html, '<p>Body 1</p>')
+        call_command('compile_lesson_content', stdout=out)
+        self.assertIn('Checked 1 lessons, recompiled 0', out.getvalue())
+
+
+class CourseOutlineTests(CoursesTestCase):
+    def test_course_outline_shows_new_lessons(self):
+        url = reverse('courses:course-detail', args=[self.course.id])
+        self.assertContains(self.client.get(url), 'No lessons available yet.')
+        self.add_lessons(1)
+        self.assertContains(self.client.get(url), 'Lesson 1')
+
+    def test_owner_outline_has_move_controls(self):
+        self.add_lessons(2)
+        url = reverse('courses:course-detail', args=[self.course.id])
+        self.assertNotContains(self.client.get(url), 'Move up')
+        self.client.force_login(self.teacher)
+        self.assertContains(self.client.get(url), 'Move up')
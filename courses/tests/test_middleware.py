@@ -0,0 +1,61 @@
+import json
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from courses.middleware import QueryInstrumentationMiddleware, fingerprint
+from courses.models import Course
+from courses.tests.base import CoursesTestCase
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_literals_and_in_lists_collapse(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE name = 'O''Brien' AND id IN (%s, %s,  %s)  LIMIT 21"),
+            'SELECT * FROM t WHERE name = ? AND id IN (...) LIMIT ?',
+        )
+        self.assertEqual(fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s)'),
+                         fingerprint('SELECT 2 FROM t WHERE id IN (%s, %s, %s, %s)'))
+
+    @override_settings(SQL_INSTRUMENTATION=False)
+    def test_disabled_middleware_removes_itself(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryInstrumentationMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(SQL_INSTRUMENTATION=True, SQL_QUERY_BUDGET=10, SQL_REPEATED_QUERY_LIMIT=2)
+class QueryInstrumentationTests(CoursesTestCase):
+    def call(self, queries):
+        def view(request):
+            for course_id in range(queries):
+                Course.objects.filter(id=course_id).exists()
+            return HttpResponse()
+        return QueryInstrumentationMiddleware(view)(RequestFactory().get('/courses/'))
+
+    def test_server_timing_counts_the_requests_queries(self):
+        response = self.call(2)
+        self.assertRegex(response['Server-Timing'], r'^sql;dur=[\d.]+;desc="2 queries", app;dur=[\d.]+$')
+
+    def test_repeated_statement_shapes_are_logged(self):
+        with self.assertLogs('courses.sql', 'WARNING') as logs:
+            self.call(3)
+        report = json.loads(logs.records[0].getMessage())
+        self.assertEqual(report['event'], 'sql.repeated_queries')
+        self.assertEqual((report['queries'], report['path']), (3, '/courses/'))
+        self.assertEqual(report['repeated'][0]['count'], 3)
+
+    @override_settings(SQL_QUERY_BUDGET=1, SQL_REPEATED_QUERY_LIMIT=5)
+    def test_requests_over_budget_are_logged(self):
+        with self.assertLogs('courses.sql') as logs:
+            self.call(2)
+        self.assertEqual(json.loads(logs.records[0].getMessage())['event'], 'sql.query_budget')
+
+    def test_quiet_requests_are_not_logged(self):
+        with self.assertNoLogs('courses.sql'):
+            self.call(1)
+
+    def test_client_requests_pass_through_the_middleware(self):
+        response = self.client.get(reverse('courses:course_list'))
+        self.assertIn('queries', response['Server-Timing'])
@@ -0,0 +1,45 @@
+from courses import navigation
+from courses.models import Course, Lesson
+from courses.tests.base import CoursesTestCase
+
+
+class LessonPositionTests(CoursesTestCase):
+    def test_new_lessons_take_the_next_slot(self):
+        self.assertEqual([lesson.position for lesson in self.add_lessons(3)], [1, 2, 3])
+
+    def test_stale_save_keeps_moved_position(self):
+        first, second = self.add_lessons(2)
+        navigation.move_lesson(second, -1)
+        first.title = 'Renamed'
+        first.save()
+        self.assertEqual(
+            list(self.course.lessons.values_list('title', 'position')),
+            [('Lesson 2', 1), ('Renamed', 2)],
+        )
+
+    def test_outline_version_moves_with_the_outline(self):
+        first, second = self.add_lessons(2)
+        version = Course.objects.get(id=self.course.id).outline_version
+        navigation.move_lesson(second, -1)
+        self.assertGreater(Course.objects.get(id=self.course.id).outline_version, version)
+
+    def test_neighbours_take_one_query(self):
+        first, second, third = self.add_lessons(3)
+        with self.assertNumQueries(1):
+            self.assertEqual(navigation.lesson_neighbours(second), (first, third))
+        self.assertEqual(navigation.lesson_neighbours(first), (None, second))
+
+    def test_delete_closes_the_gap(self):
+        first, second, third = self.add_lessons(3)
+        second.delete()
+        self.assertEqual(list(self.course.lessons.order_by('position').values_list('id', 'position')),
+                         [(first.id, 1), (third.id, 2)])
+        self.assertEqual(Lesson.objects.create(course=self.course, title='New', content='').position, 3)
+
+    def test_reorder_needs_every_lesson_once(self):
+        first, second, third = self.add_lessons(3)
+        with self.assertRaises(ValueError):
+            navigation.reorder_lessons(self.course, [first.id, second.id])
+        navigation.reorder_lessons(self.course, [third.id, first.id, second.id])
+        self.assertEqual(list(self.course.lessons.order_by('position').values_list('id', flat=True)),
+                         [third.id, first.id, second.id])
@@ -0,0 +1,53 @@
+import io
+import json
+
+from courses.grading import answer_key
+from courses.markup import HTML
+from courses.models import Course, Lesson
+from courses.packages import PackageError, export_package, import_package
+from courses.page_cache import catalog_version
+from courses.tests.base import CoursesTestCase
+
+
+class PackageTests(CoursesTestCase):
+    def test_round_trip_keeps_lessons_and_questions(self):
+        lesson = Lesson.objects.create(
+            course=self.course, title='Raw', content='<p>kept <b>as HTML</b></p>', content_format=HTML,
+            quiz_sample_size=2,
+        )
+        self.add_questions(lesson, 3, correct='B')
+        out = io.StringIO()
+        self.assertEqual(export_package(out, [self.course.id]), {'course': 1, 'lesson': 1, 'quiz': 3})
+
+        version = catalog_version()
+        counts = import_package(out.getvalue().splitlines())
+        self.assertEqual(counts, {'course': 1, 'lesson': 1, 'quiz': 3, 'skipped': 0})
+        self.assertNotEqual(catalog_version(), version)
+
+        copy = Lesson.objects.exclude(id=lesson.id).get()
+        self.assertNotEqual(copy.course_id, self.course.id)
+        self.assertEqual(copy.content_format, HTML)
+        self.assertEqual(copy.content_html, '<p>kept <b>as HTML</b></p>')
+        self.assertEqual(copy.quiz_sample_size, 2)
+        self.assertEqual(answer_key(copy)[1], 'BBB')
+
+    def test_rows_from_unknown_lessons_are_skipped(self):
+        lines = [
+            json.dumps({'type': 'package', 'version': 1}),
+            json.dumps({'type': 'quiz', 'id': 1, 'lesson_id': 99, 'question_text': 'Q', 'option_a': 'a',
+                        'option_b': 'b', 'option_c': 'c', 'option_d': 'd', 'correct_option': 'A'}),
+        ]
+        self.assertEqual(import_package(lines)['skipped'], 1)
+
+    def test_malformed_rows_name_their_line(self):
+        header = json.dumps({'type': 'package', 'version': 1})
+        course = {'type': 'course', 'id': 1, 'title': 'Copy', 'description': '', 'created_by': 'teacher'}
+        for row, message in (
+            ({**course, 'title': None}, 'Line 3: course row is missing title.'),
+            ({'type': 'lesson', 'id': 2, 'course_id': 1}, 'Line 3: lesson row is missing title, content.'),
+            ({'type': 'section'}, "Line 3: unknown row type 'section'."),
+            ([1, 2], 'Line 3: expected a JSON object.'),
+        ):
+            with self.subTest(row=row), self.assertRaisesMessage(PackageError, message):
+                import_package([header, json.dumps(course), json.dumps(row)])
+        self.assertEqual(Course.objects.count(), 1)  # nothing from the failed imports is kept
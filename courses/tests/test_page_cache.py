@@ -0,0 +1,32 @@
+from django.urls import reverse
+
+from courses.models import Course
+from courses.page_cache import page_cache_stats
+from courses.tests.base import CoursesTestCase
+
+
+class PageCacheTests(CoursesTestCase):
+    def test_anonymous_catalog_is_cached_until_the_catalog_changes(self):
+        url = reverse('courses:course_list')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'HIT')
+
+        Course.objects.create(title='Geometry', description='Shapes', created_by=self.teacher)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Geometry')
+
+    def test_logged_in_users_skip_the_cache(self):
+        self.client.force_login(self.student)
+        self.assertNotIn('X-Page-Cache', self.client.get(reverse('courses:course_list')))
+
+    def test_each_query_string_is_cached_apart(self):
+        url = reverse('courses:available_courses')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url, {'after': self.course.id})['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'HIT')
+        self.assertEqual(page_cache_stats(['available_courses']), {'available_courses': {'hits': 1, 'misses': 2}})
+
+    def test_posts_are_not_cached(self):
+        response = self.client.post(reverse('courses:available_courses'))
+        self.assertNotIn('X-Page-Cache', response)
@@ -0,0 +1,25 @@
+from courses import navigation
+from courses.models import Course
+from courses.reports import build_progress_report
+from courses.summaries import record_lesson_completion
+from courses.tests.base import CoursesTestCase
+
+
+class ReportTests(CoursesTestCase):
+    def test_lessons_follow_course_order(self):
+        first, second = self.add_lessons(2)
+        self.course.enrollments.create(student=self.student)
+        navigation.move_lesson(second, -1)
+        report = build_progress_report(self.student)
+        self.assertEqual([row['lesson'].id for row in report[0]['lesson_progress_list']], [second.id, first.id])
+
+    def test_report_takes_three_queries_however_many_courses(self):
+        for n in range(3):
+            course = Course.objects.create(title=f'Course {n}', description='', created_by=self.teacher)
+            course.enrollments.create(student=self.student)
+            lessons = self.add_lessons(2, course=course)
+            record_lesson_completion(self.student, lessons[0])
+        with self.assertNumQueries(3):
+            report = build_progress_report(self.student)
+        self.assertEqual([row['completed_lessons'] for row in report], [1, 1, 1])
+        self.assertEqual([row['progress_percent'] for row in report], [50, 50, 50])
@@ -0,0 +1,36 @@
+from courses.models import Lesson
+from courses.search import fts_query, rebuild_search_index, search
+from courses.tests.base import CoursesTestCase
+
+
+class SearchTests(CoursesTestCase):
+    def test_fts_query_quotes_every_term(self):
+        self.assertEqual(fts_query('alg'), '"alg"*')
+        self.assertEqual(fts_query('say "hi" OR'), '"say" """hi""" "OR"*')
+        self.assertEqual(fts_query('   '), '')
+
+    def test_search_survives_fts_syntax(self):
+        self.add_lessons(1)
+        self.assertEqual([row['object_id'] for row in search('Algeb')], [self.course.id])
+        search('NEAR( "unbalanced')  # must not raise an FTS5 syntax error
+
+    def test_matches_are_escaped_around_the_marks(self):
+        Lesson.objects.create(course=self.course, title='<b>Vectors</b>', content='Arrows & spaces')
+        (row,) = search('vectors')
+        self.assertEqual(row['kind'], 'lesson')
+        self.assertEqual(row['title'], '&lt;b&gt;<mark>Vectors</mark>&lt;/b&gt;')
+
+    def test_edits_and_deletes_update_the_index(self):
+        (lesson,) = self.add_lessons(1)
+        lesson.title = 'Matrices'
+        lesson.save()
+        self.assertEqual([row['object_id'] for row in search('matrices')], [lesson.id])
+        lesson.delete()
+        self.assertEqual(search('matrices'), [])
+
+    def test_rebuild_restores_a_bulk_update(self):
+        (lesson,) = self.add_lessons(1)
+        Lesson.objects.filter(id=lesson.id).update(title='Calculus')  # skips the signals
+        self.assertEqual(search('calculus'), [])
+        rebuild_search_index()
+        self.assertEqual([row['object_id'] for row in search('calculus')], [lesson.id])
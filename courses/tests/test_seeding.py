@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+
+from courses.models import Course, CourseProgress, Enrollment, QuizAttempt, UserProgress
+from courses.seeding import SEED_PREFIX, clear_seeded_data, seed_dataset
+from courses.summaries import rebuild_course_progress
+from courses.tests.base import CoursesTestCase
+
+
+class SeedingTests(CoursesTestCase):
+    def seed(self):
+        return seed_dataset(faculty=2, courses=4, lessons=3, quizzes=2, students=20, batch_size=25)
+
+    def test_counts_match_the_rows_written(self):
+        counts = self.seed()
+        seeded_courses = Course.objects.filter(created_by__username__startswith=SEED_PREFIX)
+        self.assertEqual(counts['courses'], seeded_courses.count())
+        self.assertEqual(counts['lessons'], 12)
+        self.assertEqual(counts['enrollments'], Enrollment.objects.count())
+        self.assertEqual(counts['completions'], UserProgress.objects.count())
+        self.assertEqual(counts['attempts'], QuizAttempt.objects.count())
+
+    def test_summaries_agree_with_a_rebuild(self):
+        self.seed()
+        rows = CourseProgress.objects.order_by('student_id', 'course_id').values_list(
+            'student_id', 'course_id', 'completed_count', 'total_lessons'
+        )
+        seeded = list(rows)
+        rebuild_course_progress()
+        self.assertEqual(list(rows.all()), seeded)
+
+    def test_history_is_backdated(self):
+        self.seed()
+        dates = {enrollment.enrolled_on.date() for enrollment in Enrollment.objects.all()}
+        self.assertGreater(len(dates), 1)
+
+    def test_clear_leaves_other_data_alone(self):
+        self.seed()
+        clear_seeded_data()
+        self.assertFalse(get_user_model().objects.filter(username__startswith=SEED_PREFIX).exists())
+        self.assertEqual(list(Course.objects.all()), [self.course])
@@ -0,0 +1,87 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from courses.staticfiles import (
+    IMMUTABLE_CACHE_CONTROL, STATIC_MAX_AGE, StaticFilesMiddleware, _accepted_encodings, compress_file,
+)
+
+CSS = 'body { color: #123456; }\n' * 40
+
+
+class CompressionTests(SimpleTestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def test_only_smaller_variants_are_kept(self):
+        big, tiny = self.root / 'big.css', self.root / 'tiny.css'
+        big.write_text(CSS)
+        tiny.write_text('a{}')
+        self.assertIn(f'{big}.gz', compress_file(str(big)))
+        self.assertEqual(gzip.decompress(Path(f'{big}.gz').read_bytes()).decode(), CSS)
+        self.assertEqual(compress_file(str(tiny)), [])
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        source, target = self.root / 'source', self.root / 'collected'
+        (source / 'css').mkdir(parents=True)
+        (source / 'css' / 'site.css').write_text(CSS)
+        with override_settings(
+            STATICFILES_DIRS=[source], STATIC_ROOT=target,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={'staticfiles': {'BACKEND': 'courses.staticfiles.CompressedManifestStaticFilesStorage'}},
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        hashed = json.loads((target / 'staticfiles.json').read_text())['paths']['css/site.css']
+        self.assertRegex(hashed, r'^css/site\.[0-9a-f]{12}\.css$')
+        self.assertTrue((target / f'{hashed}.gz').exists())
+
+    def test_accept_encoding_honours_q_zero(self):
+        self.assertEqual(_accepted_encodings('gzip;q=0.5, br;q=0, Deflate'), {'gzip', 'deflate'})
+
+
+class StaticFilesMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (self.root / 'css').mkdir()
+        self.hashed = self.root / 'css' / 'site.0123456789ab.css'
+        self.hashed.write_text(CSS)
+        compress_file(str(self.hashed))
+        (self.root / 'robots.txt').write_text('User-agent: *\n')
+        self.enterContext(override_settings(STATIC_ROOT=str(self.root), STATIC_SERVE=True))
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse('from the view'))
+
+    def get(self, path, **headers):
+        return self.middleware(RequestFactory().get(path, headers=headers))
+
+    def test_hashed_files_are_immutable_and_compressed_on_request(self):
+        response = self.get('/static/css/site.0123456789ab.css', accept_encoding='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Content-Type'], 'text/css; charset=utf-8')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)).decode(), CSS)
+
+        plain = self.get('/static/css/site.0123456789ab.css')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(int(plain['Content-Length']), len(CSS))
+        plain.close()
+
+    def test_etag_answers_not_modified(self):
+        response = self.get('/static/robots.txt')
+        response.close()
+        self.assertEqual(response['Cache-Control'], f'public, max-age={STATIC_MAX_AGE}')
+        self.assertEqual(self.get('/static/robots.txt', if_none_match=response['ETag']).status_code, 304)
+
+    def test_other_requests_reach_the_view(self):
+        self.assertEqual(self.get('/static/missing.css').content, b'from the view')
+        self.assertEqual(self.get('/courses/').content, b'from the view')
+
+    def test_middleware_is_off_without_static_serve(self):
+        with override_settings(STATIC_SERVE=False), self.assertRaises(MiddlewareNotUsed):
+            StaticFilesMiddleware(lambda request: HttpResponse())
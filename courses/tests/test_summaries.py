@@ -0,0 +1,77 @@
+from unittest import mock
+
+from courses.models import Course, CourseProgress, Lesson, UserProgress
+from courses.summaries import (
+    _locked_summary, bitmap_from_indexes, rebuild_course_progress, record_lesson_completion, set_bit,
+)
+from courses.tests.base import CoursesTestCase
+
+
+class SummaryTests(CoursesTestCase):
+    def summary(self, course=None):
+        return CourseProgress.objects.get(student=self.student, course=course or self.course)
+
+    def test_bitmap_helpers(self):
+        self.assertEqual(bitmap_from_indexes([]), b'')
+        self.assertEqual(bitmap_from_indexes([0, 9]), b'\x01\x02')
+        self.assertEqual(set_bit(b'\x01', 9), b'\x01\x02')
+
+    def test_completion_counts_each_lesson_once(self):
+        first, second, third = self.add_lessons(3)
+        record_lesson_completion(self.student, second)
+        record_lesson_completion(self.student, second)
+        summary = self.summary()
+        self.assertEqual((summary.completed_count, summary.total_lessons), (1, 3))
+        self.assertEqual(summary.completed_lesson_ids([first.id, second.id, third.id]), [second.id])
+
+    def test_lesson_changes_keep_totals_and_slots(self):
+        first, second, third = self.add_lessons(3)
+        record_lesson_completion(self.student, third)
+        self.add_lessons(1)
+        first.delete()
+        summary = self.summary()
+        self.assertEqual((summary.completed_count, summary.total_lessons), (1, 3))
+        lesson_ids = list(self.course.lessons.values_list('id', flat=True))
+        self.assertEqual(summary.completed_lesson_ids(lesson_ids), [third.id])
+
+    def test_concurrent_first_completion_reuses_the_row(self):
+        self.add_lessons(1)
+        existing = CourseProgress.objects.create(student=self.student, course=self.course, total_lessons=1)
+        # The other request's row is not visible to the lookup, so the insert hits the unique constraint
+        with mock.patch('django.db.models.query.QuerySet.first', side_effect=[None]):
+            summary = _locked_summary(self.student.id, self.course.id)
+        self.assertEqual(summary.id, existing.id)
+
+    def test_lesson_moved_to_another_course(self):
+        other = Course.objects.create(title='Geometry', description='', created_by=self.teacher)
+        self.add_lessons(1, course=other)
+        first, second = self.add_lessons(2)
+        record_lesson_completion(self.student, first)
+        record_lesson_completion(self.student, other.lessons.get())
+
+        moved = Lesson.objects.get(id=first.id)
+        moved.course = other
+        moved.save()
+
+        self.assertEqual((self.summary().completed_count, self.summary().total_lessons), (0, 1))
+        self.assertEqual((self.summary(other).completed_count, self.summary(other).total_lessons), (2, 2))
+        self.assertEqual(Lesson.objects.get(id=first.id).position, 2)  # appended to the new course
+        self.assertEqual(Lesson.objects.get(id=second.id).position, 1)
+
+    def test_deleted_or_undone_completions_clear_their_bit(self):
+        first, second = self.add_lessons(2)
+        record_lesson_completion(self.student, first)
+        record_lesson_completion(self.student, second)
+        UserProgress.objects.get(lesson=first).delete()
+        self.assertEqual(self.summary().completed_lesson_ids([first.id, second.id]), [second.id])
+        progress = UserProgress.objects.get(lesson=second)
+        progress.completed = False
+        progress.save()
+        self.assertEqual(self.summary().completed_count, 0)
+
+    def test_rebuild_recovers_bulk_changes(self):
+        first, second = self.add_lessons(2)
+        record_lesson_completion(self.student, first)
+        UserProgress.objects.filter(lesson=first).update(completed=False)  # skips the signals
+        rebuild_course_progress([self.course.id])
+        self.assertEqual(self.summary().completed_count, 0)
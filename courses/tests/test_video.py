@@ -0,0 +1,61 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from courses.models import Lesson
+from courses.tests.base import CoursesTestCase
+from courses.video import FILE, OTHER, VIMEO, YOUTUBE, VideoInfo, parse_video_url
+
+
+class ParseVideoUrlTests(SimpleTestCase):
+    def test_youtube_forms_share_one_embed(self):
+        for url in (
+            'https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42',
+            'https://youtu.be/dQw4w9WgXcQ?si=abc',
+            'https://m.youtube.com/shorts/dQw4w9WgXcQ',
+            'https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ',
+            '  https://youtube.com/live/dQw4w9WgXcQ  ',
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(parse_video_url(url), VideoInfo(
+                    YOUTUBE, 'dQw4w9WgXcQ', 'https://www.youtube.com/embed/dQw4w9WgXcQ',
+                    'https://i.ytimg.com/vi/dQw4w9WgXcQ/hqdefault.jpg',
+                ))
+
+    def test_vimeo_keeps_the_unlisted_hash(self):
+        self.assertEqual(parse_video_url('https://vimeo.com/76979871'),
+                         VideoInfo(VIMEO, '76979871', 'https://player.vimeo.com/video/76979871', ''))
+        self.assertEqual(parse_video_url('https://vimeo.com/76979871?h=8272103f6e').embed_url,
+                         'https://player.vimeo.com/video/76979871?h=8272103f6e')
+
+    def test_files_and_other_pages(self):
+        self.assertEqual(parse_video_url('https://cdn.example.com/intro.MP4').provider, FILE)
+        self.assertEqual(parse_video_url('https://www.youtube.com/feed/trending').provider, OTHER)
+        self.assertEqual(parse_video_url('http://example.com/player?id=1'),
+                         VideoInfo(OTHER, '', 'http://example.com/player?id=1', ''))
+
+    def test_only_http_urls_are_embedded(self):
+        for url in ('javascript:alert(1)', 'javascript:alert(1)//x.mp4', 'data:text/html,hi', 'ftp://host/a.mp4'):
+            with self.subTest(url=url):
+                self.assertIsNone(parse_video_url(url))
+        self.assertIsNone(parse_video_url('   '))
+
+
+class LessonVideoTests(CoursesTestCase):
+    def test_save_stores_the_parsed_video(self):
+        lesson = Lesson.objects.create(
+            course=self.course, title='Intro', content='', video_url='https://youtu.be/abcdef1'
+        )
+        self.assertEqual((lesson.video_provider, lesson.video_id), (YOUTUBE, 'abcdef1'))
+        lesson.video_url = 'javascript:alert(1)'
+        lesson.save()
+        self.assertEqual((lesson.video_provider, lesson.video_embed_url), ('', ''))
+
+    def test_vimeo_lessons_load_the_player_api(self):
+        lesson = Lesson.objects.create(
+            course=self.course, title='Intro', content='', video_url='https://vimeo.com/1234'
+        )
+        self.course.enrollments.create(student=self.student)
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('courses:lesson-detail', args=[lesson.id]))
+        self.assertContains(response, 'data-provider="vimeo"')
+        self.assertContains(response, 'https://player.vimeo.com/api/player.js')
@@ -7,6 +7,7 @@ urlpatterns = [
     # Public Course Views
     path('', views.course_list, name='course_list'),  # Courses home/list page
     path('available-courses/', views.available_courses, name='available_courses'),  # Other courses
+    path('search/', views.search_view, name='search'),
 
     # Course Specific
     path('course/<int:course_id>/', views.course_detail, name='course-detail'),
@@ -16,6 +17,8 @@ urlpatterns = [
     # Lessons
     path('lesson/<int:lesson_id>/', views.lesson_detail, name='lesson-detail'),
     path('lesson/<int:lesson_id>/delete/', views.delete_lesson, name='delete_lesson'),
+    path('lesson/<int:lesson_id>/move/<str:direction>/', views.move_lesson, name='move_lesson'),
+    path('course/<int:course_id>/reorder-lessons/', views.reorder_lessons, name='reorder_lessons'),
     path('upload/', views.upload_lesson, name='upload_lesson'),
 
     # Quiz Related
@@ -26,11 +29,14 @@ urlpatterns = [
 
     # User Progress and Dashboard
     path('progress/', views.progress, name='progress'),
+    path('progress/json/', views.progress_json, name='progress_json'),
     path('my-courses/', views.my_courses, name='my_courses'),
 
     # Course creation
     path('create-course/', views.create_course, name='create_course'),
     path('enroll/<int:course_id>/', views.enroll_course, name='enroll_course'),
+    path('enroll/import/', views.import_enrollments_view, name='import_enrollments'),
     path('course/<int:course_id>/certificate/', views.download_certificate, name='download_certificate'),
+    path('course/<int:course_id>/certificates/', views.course_certificates, name='course_certificates'),
 
 ]
@@ -1,25 +1,28 @@
 # courses/utils.py
 
-from courses.models import Lesson
-from courses.models import UserProgress
+from courses.summaries import course_completers
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from io import BytesIO
 from datetime import date
 
 def has_completed_course(user, course):
-    lessons = Lesson.objects.filter(course=course)
-    completed_count = UserProgress.objects.filter(
-        user=user,
-        lesson__in=lessons,
-        completed=True
-    ).count()
-    return completed_count == lessons.count()
+    return course_completers(course).filter(pk=user.pk).exists()
+
+
+async def arequest_user(request):
+    """
+    Load the user with the async ORM and pin it on the request, so templates
+    reading ``request.user`` do not trigger a sync query inside an async view.
+    """
+    user = await request.auser()
+    request.user = user
+    return user
 
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 
-def generate_certificate(student_name, course_name):
+def generate_certificate(student_name, course_name, issued_on=None):
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
@@ -69,7 +72,7 @@ def generate_certificate(student_name, course_name):
     c.drawCentredString(width / 2, sig_y - 20, "Instructor Signature")
 
     # Date
-    today = date.today().strftime("%B %d, %Y")
+    today = (issued_on or date.today()).strftime("%B %d, %Y")
     c.setFont("Helvetica-Oblique", 14)
     c.setFillColor(colors.gray)
     c.drawString(border_margin + 20, border_margin + 30, f"Issued on {today}")
@@ -0,0 +1,76 @@
+# courses/video.py
+#
+# Lesson video URLs are parsed once, when the lesson is saved, into a
+# provider, video id, embed URL and thumbnail URL stored on the Lesson, so
+# rendering a lesson never has to look at the raw URL again. Understands
+# YouTube (watch?v=, youtu.be, /embed/, /shorts/, /live/, youtube-nocookie),
+# Vimeo and direct video files; any other http(s) URL is kept as an "other"
+# embed, and URLs with any other scheme are not embedded at all.
+
+import re
+from collections import namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+VideoInfo = namedtuple('VideoInfo', ['provider', 'video_id', 'embed_url', 'thumbnail_url'])
+
+YOUTUBE = 'youtube'
+VIMEO = 'vimeo'
+FILE = 'file'
+OTHER = 'other'
+
+YOUTUBE_HOSTS = {'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com',
+                 'youtube-nocookie.com', 'www.youtube-nocookie.com'}
+YOUTUBE_PATH = re.compile(r'^/(?:embed|shorts|live|v)/([A-Za-z0-9_-]{6,})')
+YOUTUBE_ID = re.compile(r'^[A-Za-z0-9_-]{6,}$')
+VIMEO_HOSTS = {'vimeo.com', 'www.vimeo.com', 'player.vimeo.com'}
+VIMEO_PATH = re.compile(r'^/(?:video/|channels/[^/]+/|groups/[^/]+/videos/)?(\d+)(?:/|$)')
+FILE_EXTENSIONS = ('.mp4', '.webm', '.ogv', '.ogg', '.mov', '.m4v')
+EMBED_SCHEMES = ('http', 'https')
+
+
+def _youtube_id(parts):
+    host = parts.netloc.lower()
+    if host in ('youtu.be', 'www.youtu.be'):
+        candidate = parts.path.strip('/').split('/')[0]
+        return candidate if YOUTUBE_ID.match(candidate) else None
+    if host not in YOUTUBE_HOSTS:
+        return None
+    match = YOUTUBE_PATH.match(parts.path)
+    if match:
+        return match.group(1)
+    candidate = parse_qs(parts.query).get('v', [''])[0]
+    return candidate if YOUTUBE_ID.match(candidate) else None
+
+
+def parse_video_url(url):
+    """A ``VideoInfo`` for ``url``, or None when there is nothing safe to embed."""
+    url = (url or '').strip()
+    if not url:
+        return None
+    parts = urlsplit(url)
+
+    video_id = _youtube_id(parts)
+    if video_id:
+        return VideoInfo(
+            YOUTUBE, video_id,
+            f'https://www.youtube.com/embed/{video_id}',
+            f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg',
+        )
+
+    if parts.netloc.lower() in VIMEO_HOSTS:
+        match = VIMEO_PATH.match(parts.path)
+        if match:
+            embed_url = f'https://player.vimeo.com/video/{match.group(1)}'
+            unlisted_hash = parse_qs(parts.query).get('h', [''])[0]  # required to embed unlisted videos
+            if unlisted_hash:
+                embed_url += f'?h={unlisted_hash}'
+            # Vimeo thumbnails need an API call, so the facade shows a plain poster
+            return VideoInfo(VIMEO, match.group(1), embed_url, '')
+
+    if parts.scheme.lower() not in EMBED_SCHEMES:
+        return None
+
+    if parts.path.lower().endswith(FILE_EXTENSIONS):
+        return VideoInfo(FILE, '', url, '')
+
+    return VideoInfo(OTHER, '', url, '')
@@ -1,31 +1,47 @@
-from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse, HttpResponseForbidden
+import io
+
+from django.shortcuts import render, aget_object_or_404, get_object_or_404, redirect
+from django.template.loader import render_to_string
+from django.http import FileResponse, HttpResponse, HttpResponseForbidden, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
+from django.conf import settings
 from django.contrib import messages
-from .models import Course, Lesson, Enrollment, UserProgress, Quiz
-from .forms import LessonUploadForm, CourseForm, QuizForm
-from .utils import has_completed_course, generate_certificate
+from django.db import transaction
+from .models import Course, Lesson, Enrollment, LearningEvent, Quiz
+from .forms import LessonUploadForm, CourseForm, QuizForm, EnrollmentImportForm
+from .utils import arequest_user, has_completed_course
+from .certificates import cached_certificate, certificate_student_name, issue_certificate, stream_cohort_zip
+from .summaries import aget_course_progress, record_lesson_completion
+from .reports import abuild_progress_report, build_progress_report, serialize_progress_report
+from . import navigation
+from .db import retry_on_lock
+from .events import record_event_nowait, record_event
+from .page_cache import FRAGMENT_CACHE_TIMEOUT, acached_fragment, cache_anonymous_page
+from .search import search
+from .enrollment_import import format_import_stats, import_enrollments
+from .grading import clear_draw, grade_submission, pinned_draw, record_attempt, submitted_draw
+from .catalog import akeyset_paginate, catalog_queryset, keyset_paginate, progress_percent, unenrolled_courses
 from django.contrib.auth.decorators import login_required
 
 # ------------------------
 # Helpers
 # ------------------------
 def is_student(user):
-    return user.groups.filter(name="Students").exists()
+    # group_names comes with the cached request.user (users/backends.py)
+    return "Students" in getattr(user, "group_names", ())
 
 
 # ------------------------
 # Student: Available + Enroll + My Courses
 # ------------------------
+@cache_anonymous_page("available_courses")
 def available_courses(request):
     """Show courses student has not enrolled in yet."""
-    if request.user.is_authenticated:
-        enrolled_courses = Enrollment.objects.filter(student=request.user).values_list("course_id", flat=True)
-        courses = Course.objects.exclude(id__in=enrolled_courses).exclude(created_by=request.user)
-    else:
-        courses = Course.objects.all()
-    return render(request, "courses/available_courses.html", {"all_courses": courses})
+    page = keyset_paginate(unenrolled_courses(request.user, exclude_own=True), request.GET)
+    return render(request, "courses/available_courses.html", {"all_courses": page, "page": page})
 
 
+@retry_on_lock
 def enroll_course(request, course_id):
     if not request.user.is_authenticated:
         messages.error(request, "You must be logged in to enroll.")
@@ -36,6 +52,7 @@ def enroll_course(request, course_id):
     enrollment, created = Enrollment.objects.get_or_create(student=request.user, course=course)
 
     if created:
+        record_event(LearningEvent.ENROLLED, request.user, course=course)
         messages.success(request, f"✅ You are enrolled in {course.title}!")
     else:
         messages.info(request, f"ℹ You are already enrolled in {course.title}.")
@@ -60,127 +77,137 @@ def my_courses(request):
 # ------------------------
 # Course Views
 # ------------------------
-def course_list(request):
-    all_courses = Course.objects.all().prefetch_related("lesson_set")
+@cache_anonymous_page("course_list")
+async def course_list(request):
+    user = await arequest_user(request)
+    page = await akeyset_paginate(catalog_queryset(user), request.GET)
     course_data = []
 
-    for course in all_courses:
-        lessons = course.lesson_set.all()
-        total = lessons.count()
-        if request.user.is_authenticated:
-            completed_count = UserProgress.objects.filter(user=request.user, lesson__in=lessons, completed=True).count()
-        else:
-            completed_count = 0
-        progress_percent = round((completed_count / total) * 100) if total else 0
-
+    for course in page:
         course_data.append({
             "course": course,
-            "total": total,
-            "completed": completed_count,
-            "progress_percent": progress_percent
+            "total": course.total_lessons,
+            "completed": course.completed_count or 0,
+            "progress_percent": progress_percent(course),
         })
 
-    return render(request, "courses/course_list.html", {"course_data": course_data})
+    return render(request, "courses/course_list.html", {"course_data": course_data, "page": page})
 
 
 
-def course_detail(request, course_id):
-    course = get_object_or_404(Course, id=course_id)
-    lessons = Lesson.objects.filter(course=course)
+async def course_detail(request, course_id):
+    user = await arequest_user(request)
+    course = await aget_object_or_404(Course.objects.select_related('created_by'), id=course_id)
+    is_owner = user.is_authenticated and course.created_by_id == user.id
 
     is_enrolled = False
-    completed_lessons = []
+    summary = None
     progress = 0
 
-    if request.user.is_authenticated and getattr(request.user, "is_student", False):
+    if user.is_authenticated and getattr(user, "is_student", False):
         # Check if enrolled
-        is_enrolled = Enrollment.objects.filter(student=request.user, course=course).exists()
+        is_enrolled = await Enrollment.objects.filter(student=user, course=course).aexists()
 
         if is_enrolled:
-            completed_lessons = UserProgress.objects.filter(
-                user=request.user, lesson__course=course, completed=True
-            ).values_list("lesson_id", flat=True)
-
-            total_lessons = lessons.count()
-            completed_count = len(completed_lessons)
-
-            if total_lessons > 0:
-                progress = int((completed_count / total_lessons) * 100)
+            summary = await aget_course_progress(user, course)
+            if summary:
+                progress = summary.progress_percent
 
     context = {
         "course": course,
-        "lessons": lessons,
+        "is_owner": is_owner,
         "is_enrolled": is_enrolled,
-        "completed_lessons": completed_lessons,
         "progress": progress,   # use this in template
     }
+    if is_owner:
+        # The owner's outline carries move buttons with per-session CSRF tokens
+        context["lessons"] = [lesson async for lesson in Lesson.objects.filter(course=course)]
+    else:
+        context["outline"] = await _course_outline(course, user, summary)
     return render(request, "courses/course_detail.html", context)
 
+
+async def _course_outline(course, user, summary):
+    """
+    The lesson list, cached per outline version. Students' badges come from
+    their progress bitmap, so students with the same completed lessons share
+    one copy and nobody else sees badges at all.
+    """
+    show_badges = user.is_authenticated and getattr(user, "is_student", False)
+    if not show_badges:
+        variant = "guest"
+    else:
+        variant = "s" + bytes(summary.completed_lessons or b"").hex() if summary else "s"
+
+    async def render_outline():
+        lessons = [lesson async for lesson in Lesson.objects.filter(course=course).only('id', 'title', 'position')]
+        completed = summary.completed_lesson_ids([l.id for l in lessons]) if summary else []
+        return render_to_string("courses/course_outline.html", {
+            "lessons": lessons,
+            "completed_lessons": completed,
+            "show_badges": show_badges,
+        })
+
+    return await acached_fragment("course_outline", [course.id, course.outline_version, variant], render_outline)
+
 # ------------------------
 # Lesson + Quiz
 # ------------------------
-def lesson_detail(request, lesson_id):
-    lesson = get_object_or_404(Lesson, id=lesson_id)
-    lessons = Lesson.objects.filter(course=lesson.course).order_by("id")
-    lesson_ids = list(lessons.values_list("id", flat=True))
-    current_index = lesson_ids.index(lesson.id)
-    next_lesson = lessons[current_index + 1] if current_index + 1 < len(lesson_ids) else None
+async def lesson_detail(request, lesson_id):
+    user = await arequest_user(request)
+    lesson = await aget_object_or_404(Lesson, id=lesson_id)
+    previous_lesson, next_lesson = await navigation.alesson_neighbours(lesson)
 
-    if request.user.is_authenticated:
-        total = lessons.count()
-        completed = UserProgress.objects.filter(user=request.user, lesson__in=lessons, completed=True).count()
-        progress_percent = int((completed / total) * 100) if total else 0
-    else:
-        progress_percent = 0
+    summary = await aget_course_progress(user, lesson.course_id)
+    progress_percent = summary.progress_percent if summary else 0
+    record_event_nowait(LearningEvent.LESSON_VIEWED, user, course=lesson.course_id, lesson=lesson)
 
     return render(request, "courses/lesson_detail.html", {
         "lesson": lesson,
         "progress_percent": progress_percent,
-        "next_lesson": next_lesson
+        "previous_lesson": previous_lesson,
+        "next_lesson": next_lesson,
+        "fragment_timeout": FRAGMENT_CACHE_TIMEOUT,
     })
 
 
 def quiz_view(request, lesson_id):
     lesson = get_object_or_404(Lesson, id=lesson_id)
-    questions = Quiz.objects.filter(lesson=lesson)
+    if lesson.quiz_sample_size:
+        drawn = pinned_draw(request.session, lesson)
+        by_id = Quiz.objects.in_bulk(drawn)
+        questions = [by_id[question_id] for question_id in drawn if question_id in by_id]
+    else:
+        questions = Quiz.objects.filter(lesson=lesson)
     return render(request, "courses/quiz.html", {"lesson": lesson, "questions": questions})
 
 
+@retry_on_lock
 def quiz_submit(request, lesson_id):
     lesson = get_object_or_404(Lesson, id=lesson_id)
-    questions = Quiz.objects.filter(lesson=lesson)
 
     if request.method == "POST" and request.user.is_authenticated:
-        score = 0
-        results = []
-
-        for question in questions:
-            selected = request.POST.get(f"q{question.id}")
-            is_correct = (selected == question.correct_option)
-            if is_correct:
-                score += 1
-            results.append({
-                "question": question.question_text,
-                "selected": selected,
-                "correct": question.correct_option,
-                "is_correct": is_correct,
-            })
-
-        UserProgress.objects.update_or_create(
-            user=request.user,
-            lesson=lesson,
-            defaults={"completed": True}
-        )
-
-        lessons = Lesson.objects.filter(course=lesson.course).order_by("id")
-        lesson_ids = list(lessons.values_list("id", flat=True))
-        current_index = lesson_ids.index(lesson.id)
-        next_lesson = lessons[current_index + 1] if current_index + 1 < len(lesson_ids) else None
+        drawn = None
+        if lesson.quiz_sample_size:
+            # Grade exactly the questions this attempt was dealt
+            drawn = submitted_draw(request.session, lesson)
+            if drawn is None:
+                messages.warning(request, "Your quiz session expired. Please answer the questions again.")
+                return redirect('courses:quiz', lesson.id)
+        score, total, results = grade_submission(lesson, request.POST, drawn)
+
+        with transaction.atomic():
+            record_attempt(request.user, lesson, score, total, results)
+            record_lesson_completion(request.user, lesson)
+        clear_draw(request.session, lesson)
+        record_event(LearningEvent.QUIZ_SUBMITTED, request.user, course=lesson.course_id, lesson=lesson, score=score, total=total)
+
+        _, next_lesson = navigation.lesson_neighbours(lesson)
 
         return render(request, "courses/quiz_result.html", {
             "lesson": lesson,
             "score": score,
-            "total": questions.count(),
+            "total": total,
             "results": results,
             "next_lesson": next_lesson
         })
@@ -191,53 +218,22 @@ def quiz_submit(request, lesson_id):
 # ------------------------
 # Progress
 # ------------------------
-def progress(request):
-    user = request.user
-
-    # Get all enrollments for the user
-    enrollments = Enrollment.objects.filter(student=user)
-
-    progress_data = []
-
-    for enrollment in enrollments:
-        course = enrollment.course
-        lessons = course.lessons.all()
-        total_lessons = lessons.count()
-        completed_lessons = 0
+@login_required
+async def progress(request):
+    user = await arequest_user(request)
+    context = {
+        'progress_data': await abuild_progress_report(user),
+    }
+    return render(request, 'courses/progress.html', context)
 
-        lesson_progress_list = []
 
-        for lesson in lessons:
-            try:
-                user_progress = UserProgress.objects.get(user=user, lesson=lesson)
-                completed = user_progress.completed
-            except UserProgress.DoesNotExist:
-                completed = False
-
-            if completed:
-                completed_lessons += 1
-
-            # Map 'completed' to both watched and completed in template
-            lesson_progress_list.append({
-                'lesson': lesson,
-                'watched': completed,    # we don’t have a separate watched field
-                'completed': completed,
-            })
-
-        course_progress = {
-            'course': course,
-            'total_lessons': total_lessons,
-            'completed_lessons': completed_lessons,
-            'lesson_progress_list': lesson_progress_list,
-        }
-
-        progress_data.append(course_progress)
+@login_required
+def progress_json(request):
+    report = build_progress_report(request.user)
+    return JsonResponse({'progress': serialize_progress_report(report)})
 
-    context = {
-        'progress_data': progress_data,
-    }
 
-    return render(request, 'courses/progress.html', context)
+# ------------------------
 # Faculty: Create/Edit/Delete Course
 # ------------------------
 def my_uploaded_courses(request):
@@ -344,6 +340,59 @@ def delete_lesson(request, lesson_id):
     return render(request, "courses/confirm_delete_lesson.html", {"lesson": lesson})
 
 
+def move_lesson(request, lesson_id, direction):
+    lesson = get_object_or_404(Lesson.objects.select_related("course"), id=lesson_id)
+    if request.user != lesson.course.created_by:
+        return HttpResponseForbidden("❌ You are not allowed to reorder these lessons.")
+
+    if request.method == "POST" and direction in ("up", "down"):
+        navigation.move_lesson(lesson, -1 if direction == "up" else 1)
+    return redirect("courses:course-detail", course_id=lesson.course_id)
+
+
+def reorder_lessons(request, course_id):
+    """Faculty: set the whole lesson order at once (POST ``order=3,1,2``)."""
+    course = get_object_or_404(Course, id=course_id)
+    if request.user != course.created_by:
+        return HttpResponseForbidden("❌ You are not allowed to reorder these lessons.")
+    if request.method != "POST":
+        return HttpResponse("Invalid request method", status=400)
+
+    try:
+        lesson_ids = [int(value) for value in request.POST.get("order", "").split(",") if value.strip()]
+        navigation.reorder_lessons(course, lesson_ids)
+    except ValueError as exc:
+        messages.error(request, f"❌ Could not reorder lessons: {exc}")
+    else:
+        messages.success(request, "✅ Lesson order saved.")
+    return redirect("courses:course-detail", course_id=course.id)
+
+
+@login_required
+def import_enrollments_view(request):
+    """Faculty: enroll students into their own courses from a CSV upload."""
+    if not getattr(request.user, "is_faculty", False):
+        return HttpResponseForbidden("❌ Only faculty can import enrollments.")
+
+    stats = None
+    if request.method == "POST":
+        form = EnrollmentImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = io.TextIOWrapper(form.cleaned_data["csv_file"].file, encoding="utf-8-sig", newline="")
+            try:
+                stats = import_enrollments(
+                    lines, allowed_course_ids=Course.objects.filter(created_by=request.user).values("id")
+                )
+            except UnicodeDecodeError:
+                # Chunks read before the bad bytes are already in; a re-upload skips them as duplicates
+                form.add_error("csv_file", "The file is not UTF-8 text. Save it as UTF-8 CSV and upload it again.")
+            else:
+                messages.success(request, f"✅ {format_import_stats(stats)}")
+    else:
+        form = EnrollmentImportForm()
+    return render(request, "courses/import_enrollments.html", {"form": form, "stats": stats})
+
+
 def delete_quiz(request, quiz_id):
     quiz = get_object_or_404(Quiz, id=quiz_id)
     if request.user != quiz.lesson.course.created_by:
@@ -366,16 +415,51 @@ def download_certificate(request, course_id):
     if not request.user.is_authenticated or not has_completed_course(request.user, course):
         return HttpResponse("You have not completed this course yet or are not logged in.", status=403)
 
-    buffer = generate_certificate(
-        student_name=request.user.get_full_name() or request.user.username,
-        course_name=course.title
+    certificate = issue_certificate(request.user, course)
+    certificate_file, cache_key = cached_certificate(
+        certificate, certificate_student_name(request.user), course.title, course.certificate_template
     )
+    etag = f'"{cache_key}"'
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        certificate_file.close()
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            certificate_file,
+            as_attachment=True,
+            filename=f"{course.title}_certificate.pdf",
+            content_type="application/pdf",
+        )
+        record_event(LearningEvent.CERTIFICATE_DOWNLOADED, request.user, course=course)
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@login_required
+def course_certificates(request, course_id):
+    course = get_object_or_404(Course, id=course_id)
+    if request.user != course.created_by:
+        return HttpResponseForbidden("❌ You are not allowed to download certificates for this course.")
 
-    response = HttpResponse(buffer, content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{course.title}_certificate.pdf"'
+    response = StreamingHttpResponse(
+        stream_cohort_zip(course, workers=getattr(settings, "CERTIFICATE_REQUEST_WORKERS", 1)),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{course.title}_certificates.zip"'
     return response
 
 
+# ------------------------
+# Search
+# ------------------------
+def search_view(request):
+    query = request.GET.get("q", "").strip()
+    results = search(query) if query else []
+    return render(request, "courses/search.html", {"query": query, "results": results})
+
+
 # ------------------------
 # Public Home
 # ------------------------
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'online_learning.settings')
 
 application = get_asgi_application()
+
+# Only server processes flush the learning event log from a background thread
+from courses.events import event_log  # noqa: E402
+
+event_log.use_flush_thread()
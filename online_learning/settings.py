@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,7 +45,9 @@ AUTH_USER_MODEL = 'users.CustomUser'
 
 
 MIDDLEWARE = [
+    'courses.middleware.QueryInstrumentationMiddleware',  # inactive unless SQL_INSTRUMENTATION
     'django.middleware.security.SecurityMiddleware',
+    'courses.staticfiles.StaticFilesMiddleware',  # inactive unless STATIC_SERVE and collectstatic has run
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -83,6 +86,71 @@ DATABASES = {
     }
 }
 
+# Production SQLite profile, enabled with DJANGO_DB_PROFILE=production:
+# WAL journaling so readers never block the writer, BEGIN IMMEDIATE for every
+# atomic block so writers queue on the busy timeout instead of failing on a
+# lock upgrade, and persistent connections.
+SQLITE_PRODUCTION_PROFILE = {
+    'CONN_MAX_AGE': 600,
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA cache_size=-20000;'      # 20 MB page cache
+            'PRAGMA mmap_size=134217728;'    # 128 MB memory-mapped I/O
+            'PRAGMA temp_store=MEMORY;'
+        ),
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+    },
+}
+
+DB_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'development')
+if DB_PROFILE == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION_PROFILE)
+
+# Attempts and first backoff delay (seconds) for write views that hit a lock
+DB_LOCK_RETRIES = 3
+DB_LOCK_RETRY_DELAY = 0.05
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process; switch to the file-based backend to share the
+# page cache between worker processes:
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#   'LOCATION': BASE_DIR / 'cache' / 'django',
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'online-learning',
+    }
+}
+
+# Seconds an anonymous catalog page stays cached (edits invalidate it sooner)
+PAGE_CACHE_TIMEOUT = 300
+# Seconds a lesson-body / course-outline fragment stays cached (keyed on the
+# lesson's updated_at and the course's outline_version, so edits show at once)
+FRAGMENT_CACHE_TIMEOUT = 3600
+
+# With a shared cache, request.user comes from the cache (users/backends.py)
+# and sessions from the cache with write-through to the database, so
+# authenticated requests make no session or user queries on a warm cache.
+# A per-process cache cannot be invalidated across workers (a password change
+# or logout seen by one worker would leave the others serving the old user and
+# session), so with LocMemCache both fall back to the database.
+SHARED_CACHE = CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache'
+if SHARED_CACHE:
+    AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+else:
+    AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Seconds a user stays cached (saves and group changes invalidate it sooner)
+USER_CACHE_TIMEOUT = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -129,6 +197,20 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
+# `manage.py collectstatic` writes content-hashed copies, a manifest and
+# .gz/.br variants (brotli only if the package is installed) to STATIC_ROOT;
+# courses.staticfiles.StaticFilesMiddleware then serves them from the app
+# with immutable cache headers, so no separate static file server is needed.
+# With DEBUG off the manifest is required: run collectstatic on every deploy.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'courses.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+STATIC_SERVE = not DEBUG  # in development runserver serves files from the finders
+STATIC_COMPRESS_MIN_SIZE = 256
+STATIC_MAX_AGE = 60  # seconds, for the unhashed names
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -138,3 +220,42 @@ LOGIN_REDIRECT_URL = '/users/dashboard/'
 LOGOUT_REDIRECT_URL = '/users/login/'
 LOGIN_URL = '/login/'  # instead of '/users/login/'
 
+
+# Courses per page in the catalog and dashboards (keyset pagination by id)
+CATALOG_PAGE_SIZE = 24
+
+# JSON API (/api/v1/): default and maximum rows per page (?limit=)
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+# Rendered certificate PDFs, keyed by a hash of their inputs.
+# Bump the version whenever the certificate layout changes.
+CERTIFICATE_CACHE_DIR = BASE_DIR / 'cache' / 'certificates'
+CERTIFICATE_TEMPLATE_VERSION = 1
+# Processes used to render a cohort's certificates during a web request. Keep
+# this at 1 (render in-process): forking a threaded web worker is unsafe. The
+# generate_course_certificates command uses a process pool instead.
+CERTIFICATE_REQUEST_WORKERS = 1
+
+# Per-request SQL instrumentation: Server-Timing header plus a warning on the
+# courses.sql logger when a request exceeds the query budget or repeats one
+# statement shape too often. Enable with DJANGO_SQL_INSTRUMENTATION=1.
+SQL_INSTRUMENTATION = os.environ.get('DJANGO_SQL_INSTRUMENTATION') == '1'
+SQL_QUERY_BUDGET = 25
+SQL_REPEATED_QUERY_LIMIT = 5
+
+# Faculty analytics rollups (manage.py refresh_analytics). The lag keeps the
+# watermark behind rows that commit slightly after their timestamp.
+ANALYTICS_ROLLUP_LAG = 60
+ANALYTICS_DAYS = 30
+QUIZ_PASS_PERCENT = 60
+
+# Learning event log: events are queued in process and written in batches
+# by a background thread. When the queue is full, 'drop' discards the event
+# and 'block' waits up to EVENT_LOG_BLOCK_TIMEOUT seconds for room first.
+EVENT_LOG_ENABLED = os.environ.get('DJANGO_EVENT_LOG', '1') == '1'
+EVENT_LOG_QUEUE_SIZE = 10000
+EVENT_LOG_BATCH_SIZE = 500
+EVENT_LOG_FLUSH_INTERVAL = 2.0
+EVENT_LOG_FULL_POLICY = 'drop'
+EVENT_LOG_BLOCK_TIMEOUT = 0.05
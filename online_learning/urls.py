@@ -13,6 +13,9 @@ urlpatterns = [
     # Courses app routes
     path('courses/', include('courses.urls')),
 
+    # Read-only JSON API for the mobile app, versioned in the path
+    path('api/v1/', include('courses.api_urls', namespace='api-v1')),
+
     # Authentication routes
     path('login/', auth_views.LoginView.as_view(template_name='users/login.html'), name='login'),
     path('logout/', CustomLogoutView.as_view(), name='logout'),
@@ -0,0 +1,52 @@
+# users/backends.py
+#
+# request.user without a query. The authenticated user, together with the
+# names of their groups, is kept in the cache under their id and dropped
+# whenever the user row or their group memberships change (users/signals.py).
+# With cached_db sessions a logged-in request then needs no auth queries at
+# all: the session comes from the cache, the user from here, and role checks
+# only read attributes. QuerySet.update() skips the signals, so call
+# forget_user() after bulk updates to users. The invalidation only reaches
+# other workers through a shared cache, so settings.py enables this backend
+# only when the default cache is not LocMemCache.
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_TIMEOUT = getattr(settings, 'USER_CACHE_TIMEOUT', 300)
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def forget_user(*user_ids):
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user() is served from the cache."""
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = get_user_model()._default_manager.filter(pk=user_id).first()
+            if user is None:
+                return None
+            user._group_names = frozenset(user.groups.values_list('name', flat=True))
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await get_user_model()._default_manager.filter(pk=user_id).afirst()
+            if user is None:
+                return None
+            user._group_names = frozenset([name async for name in user.groups.values_list('name', flat=True)])
+            await cache.aset(key, user, USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
@@ -27,5 +27,12 @@ class CustomUser(AbstractUser):
     def is_faculty(self):
         return self.role == 'faculty'
 
+    @property
+    def group_names(self):
+        # Preloaded by users.backends.CachedModelBackend for request.user
+        if not hasattr(self, '_group_names'):
+            self._group_names = frozenset(self.groups.values_list('name', flat=True))
+        return self._group_names
+
     def __str__(self):
         return self.username
@@ -0,0 +1,37 @@
+# users/signals.py
+
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from users.backends import forget_user
+from users.models import CustomUser
+
+
+# ------------------------
+# Cached request.user
+# ------------------------
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            forget_user(instance.pk)
+    elif action == 'pre_clear':
+        # Members of the group being cleared; pk_set is None for clear()
+        forget_user(*instance.user_set.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        forget_user(*pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    # A renamed or deleted group changes its members' cached group names
+    if instance.pk:
+        forget_user(*instance.user_set.values_list('pk', flat=True))
@@ -1,3 +1,75 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from courses.views import is_student
+from users.backends import CachedModelBackend, user_cache_key
+from users.models import CustomUser
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class CacheSettingsTests(SimpleTestCase):
+    def test_per_process_cache_keeps_auth_in_the_database(self):
+        # The project default is LocMemCache, which workers cannot share
+        self.assertFalse(settings.SHARED_CACHE)
+        self.assertEqual(settings.AUTHENTICATION_BACKENDS, ['django.contrib.auth.backends.ModelBackend'])
+        self.assertEqual(settings.SESSION_ENGINE, 'django.contrib.sessions.backends.db')
+
+
+@override_settings(
+    PASSWORD_HASHERS=FAST_HASHERS,
+    AUTHENTICATION_BACKENDS=['users.backends.CachedModelBackend'],
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+)
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user('learner', password='pw', role='student')
+        self.backend = CachedModelBackend()
+
+    def test_cached_user_needs_no_queries(self):
+        self.backend.get_user(self.user.id)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.id)))
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.id)
+            self.assertTrue(user.is_student)
+            self.assertFalse(is_student(user))
+
+    def test_save_and_delete_drop_the_cached_user(self):
+        self.backend.get_user(self.user.id)
+        self.user.first_name = 'Ada'
+        self.user.save()
+        self.assertEqual(self.backend.get_user(self.user.id).first_name, 'Ada')
+        self.user.delete()
+        self.assertIsNone(self.backend.get_user(self.user.id))
+
+    def test_group_changes_drop_the_cached_user(self):
+        group = Group.objects.create(name='Students')
+        self.backend.get_user(self.user.id)
+        self.user.groups.add(group)
+        self.assertTrue(is_student(self.backend.get_user(self.user.id)))
+        group.user_set.clear()
+        self.assertFalse(is_student(self.backend.get_user(self.user.id)))
+        group.user_set.add(self.user)
+        self.assertTrue(is_student(self.backend.get_user(self.user.id)))
+        group.name = 'Learners'
+        group.save()
+        self.assertEqual(self.backend.get_user(self.user.id).group_names, {'Learners'})
+
+    def test_inactive_users_are_not_returned(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.id))
+
+    def test_password_change_ends_other_sessions(self):
+        self.client.force_login(self.user)
+        self.assertRedirects(
+            self.client.get(reverse('users:dashboard')), reverse('users:student_dashboard'), fetch_redirect_response=False
+        )
+        self.user.set_password('changed')
+        self.user.save()
+        response = self.client.get(reverse('users:dashboard'))
+        self.assertTrue(response['Location'].startswith(reverse('login')))
@@ -7,6 +7,9 @@ from django.contrib.auth import logout
 
 from .forms import UserRegisterForm
 from courses.models import Course, Enrollment
+from courses.analytics import afaculty_analytics
+from courses.catalog import akeyset_paginate, enrolled_courses, unenrolled_courses
+from courses.utils import arequest_user
 
 
 # ---------- Role Check Helpers ----------
@@ -51,30 +54,36 @@ def dashboard(request):
 # ---------- Student Dashboard ----------
 @login_required
 @user_passes_test(is_student)
-def student_dashboard(request):
+async def student_dashboard(request):
+    user = await arequest_user(request)
+
     # Already enrolled courses
-    enrolled_courses = Course.objects.filter(enrollments__student=request.user)
+    enrolled_page = await akeyset_paginate(enrolled_courses(user), request.GET, prefix='enrolled_')
 
     # Courses student has NOT enrolled in yet
-    enrolled_ids = enrolled_courses.values_list('id', flat=True)
-    available_courses = Course.objects.exclude(id__in=enrolled_ids)
+    available_page = await akeyset_paginate(unenrolled_courses(user), request.GET, prefix='available_')
 
     return render(request, 'users/student_dashboard.html', {
-        'enrolled_courses': enrolled_courses,
-        'available_courses': available_courses,
+        'enrolled_courses': enrolled_page,
+        'available_courses': available_page,
     })
 
 
 # ---------- Faculty Dashboard ----------
 @login_required
 @user_passes_test(is_faculty)
-def faculty_dashboard(request):
-    my_courses = (
+async def faculty_dashboard(request):
+    user = await arequest_user(request)
+    my_courses = [
+        course async for course in
         Course.objects
-        .filter(created_by=request.user)
+        .filter(created_by=user)
         .prefetch_related('lessons')  # Use related_name='lessons' from Lesson model
-    )
-    return render(request, 'users/faculty_dashboard.html', {'my_courses': my_courses})
+    ]
+    return render(request, 'users/faculty_dashboard.html', {
+        'my_courses': my_courses,
+        'analytics': await afaculty_analytics(user),
+    })
 
 
 # ---------- Logout ----------